@@ -1,12 +1,15 @@
 import asyncio
 from logging.config import fileConfig
+from typing import Any
 
 from alembic import context
-from sqlalchemy import pool
+from sqlalchemy import ForeignKeyConstraint, pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from backend.config.settings import settings
+from backend.libs.db.migrations import BACKFILL_CHECKPOINT_TABLE
+from backend.libs.db.partitioning import get_hash_partition_names
 from backend.models import Base
 
 
@@ -31,6 +34,35 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# The partitions are created along with their tables, so the autogenerate must not
+# try to drop them, nor their indexes and the foreign keys referencing them
+partition_names = get_hash_partition_names(target_metadata)
+# Neither the checkpoints of the batched backfills, which have no model
+excluded_table_names = {*partition_names, BACKFILL_CHECKPOINT_TABLE}
+
+
+def include_name(
+    name: str | None,
+    type_: str,
+    parent_names: Any,  # noqa: ARG001
+) -> bool:
+    return type_ != "table" or name not in excluded_table_names
+
+
+def include_object(
+    object_: Any,
+    name: str | None,  # noqa: ARG001
+    type_: str,  # noqa: ARG001
+    reflected: bool,
+    compare_to: Any,  # noqa: ARG001
+) -> bool:
+    return not (
+        reflected
+        and isinstance(object_, ForeignKeyConstraint)
+        and object_.referred_table.name in partition_names
+    )
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -56,6 +88,9 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
+        include_name=include_name,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -63,7 +98,15 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    # The batched backfills and concurrent index builds commit on their own, so
+    # they must not commit the preceding migrations along the way
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        transaction_per_migration=True,
+        include_name=include_name,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,60 @@
+"""
+Generate time-ordered user ids.
+
+Revision ID: 4c58e6450e3c
+Revises: 70354f8a2bd9
+Create Date: 2026-10-19 16:20:45.686581
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4c58e6450e3c"
+down_revision = "70354f8a2bd9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing UUIDv4 ids stay valid, only the newly inserted rows get UUIDv7 ids
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+        SELECT encode(
+            set_bit(
+                set_bit(
+                    overlay(
+                        uuid_send(gen_random_uuid())
+                        PLACING substring(
+                            int8send(
+                                floor(
+                                    extract(epoch FROM clock_timestamp()) * 1000
+                                )::bigint
+                            )
+                            FROM 3
+                        )
+                        FROM 1 FOR 6
+                    ),
+                    52,
+                    1
+                ),
+                53,
+                1
+            ),
+            'hex'
+        )::uuid
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+    op.alter_column(
+        "user",
+        "id",
+        server_default=sa.text("uuid_generate_v7()"),
+        existing_type=sa.Uuid(),
+    )
+
+
+def downgrade() -> None:
+    op.alter_column("user", "id", server_default=None, existing_type=sa.Uuid())
+    op.execute("DROP FUNCTION uuid_generate_v7()")
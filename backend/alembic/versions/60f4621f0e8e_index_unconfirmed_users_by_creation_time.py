@@ -0,0 +1,31 @@
+"""
+Index unconfirmed users by creation time.
+
+Revision ID: 60f4621f0e8e
+Revises: e7a2d9c41b08
+Create Date: 2026-10-19 18:40:02.871463
+
+"""
+from backend.libs.db.migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision = "60f4621f0e8e"
+down_revision = "e7a2d9c41b08"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create_index_concurrently(
+        "ix_user_unconfirmed_created_at",
+        "user",
+        ["created_at"],
+        where="NOT confirmed_email",
+    )
+
+
+def downgrade() -> None:
+    drop_index_concurrently("ix_user_unconfirmed_created_at", "user")
@@ -0,0 +1,26 @@
+"""
+Index users by update time.
+
+Revision ID: 6e53db326603
+Revises: 60f4621f0e8e
+Create Date: 2026-10-19 19:12:40.184520
+
+"""
+from backend.libs.db.migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision = "6e53db326603"
+down_revision = "60f4621f0e8e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create_index_concurrently("ix_user_updated_at_id", "user", ["updated_at", "id"])
+
+
+def downgrade() -> None:
+    drop_index_concurrently("ix_user_updated_at_id", "user")
@@ -0,0 +1,110 @@
+"""
+Partition user table by hash.
+
+Revision ID: b1e0c3d4a5f6
+Revises: 4c58e6450e3c
+Create Date: 2026-10-19 17:02:11.184302
+
+"""
+from typing import Any
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b1e0c3d4a5f6"
+down_revision = "4c58e6450e3c"
+branch_labels = None
+depends_on = None
+
+PARTITIONS = 16
+
+
+def upgrade() -> None:
+    # PostgreSQL can't partition an existing table, so the rows are copied over
+    # into a new partitioned one
+    op.rename_table("user", "user_unpartitioned")
+    op.execute("ALTER INDEX user_pkey RENAME TO user_unpartitioned_pkey")
+    op.drop_index("ix_user_email", table_name="user_unpartitioned")
+    _create_user_table(postgresql_partition_by="HASH (id)")
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f'CREATE TABLE "user_p{remainder}" PARTITION OF "user" '
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+    op.execute('INSERT INTO "user" SELECT * FROM user_unpartitioned')
+    op.drop_table("user_unpartitioned")
+    op.create_index(op.f("ix_user_email"), "user", ["email"], unique=False)
+
+    op.create_table(
+        "user_email",
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("email"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.execute('INSERT INTO user_email (email, user_id) SELECT email, id FROM "user"')
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_user_email() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO user_email (email, user_id) VALUES (NEW.email, NEW.id);
+            ELSIF NEW.email IS DISTINCT FROM OLD.email THEN
+                UPDATE user_email SET email = NEW.email WHERE user_id = NEW.id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        'CREATE TRIGGER sync_user_email AFTER INSERT OR UPDATE OF email ON "user" '
+        "FOR EACH ROW EXECUTE FUNCTION sync_user_email()"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_email")
+    op.execute('DROP TRIGGER sync_user_email ON "user"')
+    op.execute("DROP FUNCTION sync_user_email()")
+
+    op.rename_table("user", "user_partitioned")
+    op.execute("ALTER INDEX user_pkey RENAME TO user_partitioned_pkey")
+    op.drop_index("ix_user_email", table_name="user_partitioned")
+    _create_user_table()
+    op.execute('INSERT INTO "user" SELECT * FROM user_partitioned')
+    op.drop_table("user_partitioned")
+    op.create_index(op.f("ix_user_email"), "user", ["email"], unique=True)
+
+
+def _create_user_table(**kwargs: Any) -> None:
+    op.create_table(
+        "user",
+        sa.Column(
+            "id",
+            sa.Uuid(),
+            server_default=sa.text("uuid_generate_v7()"),
+            nullable=False,
+        ),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(length=128), nullable=False),
+        sa.Column("full_name", sa.String(length=128), nullable=False),
+        sa.Column("confirmed_email", sa.Boolean(), nullable=False),
+        sa.Column("last_login", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        **kwargs,
+    )
@@ -0,0 +1,39 @@
+"""
+Let user imports claim emails up front.
+
+Revision ID: cbcee8e0acc5
+Revises: 6e53db326603
+Create Date: 2026-10-19 20:31:15.402817
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "cbcee8e0acc5"
+down_revision = "6e53db326603"
+branch_labels = None
+depends_on = None
+
+_SYNC_USER_EMAIL_FUNCTION = """
+    CREATE OR REPLACE FUNCTION sync_user_email() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO user_email (email, user_id)
+            VALUES (lower(NEW.email), NEW.id){on_conflict};
+        ELSIF NEW.email IS DISTINCT FROM OLD.email THEN
+            UPDATE user_email SET email = lower(NEW.email) WHERE user_id = NEW.id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    # The bulk imports insert the emails of the users before the users themselves
+    on_conflict = " ON CONFLICT (user_id) DO NOTHING"
+    op.execute(_SYNC_USER_EMAIL_FUNCTION.format(on_conflict=on_conflict))
+
+
+def downgrade() -> None:
+    op.execute(_SYNC_USER_EMAIL_FUNCTION.format(on_conflict=""))
@@ -0,0 +1,69 @@
+"""
+Compare user emails case-insensitively.
+
+Revision ID: e7a2d9c41b08
+Revises: b1e0c3d4a5f6
+Create Date: 2026-10-19 17:48:37.520914
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from backend.libs.db.migrations import backfill_in_batches
+
+# revision identifiers, used by Alembic.
+revision = "e7a2d9c41b08"
+down_revision = "b1e0c3d4a5f6"
+branch_labels = None
+depends_on = None
+
+_SYNC_USER_EMAIL_FUNCTION = """
+    CREATE OR REPLACE FUNCTION sync_user_email() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO user_email (email, user_id) VALUES ({email}, NEW.id);
+        ELSIF NEW.email IS DISTINCT FROM OLD.email THEN
+            UPDATE user_email SET email = {email} WHERE user_id = NEW.id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    conflicts = op.get_bind().scalar(
+        sa.text(
+            "SELECT count(*) FROM "
+            "(SELECT 1 FROM user_email GROUP BY lower(email) HAVING count(*) > 1) c"
+        )
+    )
+    if conflicts:
+        msg = (
+            f"Found {conflicts} emails registered more than once with different "
+            "letter cases, merge the duplicated users before upgrading"
+        )
+        raise RuntimeError(msg)
+    op.execute("UPDATE user_email SET email = lower(email) WHERE email <> lower(email)")
+    op.execute(_SYNC_USER_EMAIL_FUNCTION.format(email="lower(NEW.email)"))
+    op.drop_index("ix_user_email", table_name="user")
+    op.create_index(
+        "ix_user_email_lower", "user", [sa.text("lower(email)")], unique=False
+    )
+    # The users are updated, so that the change feed delivers the new emails too
+    backfill_in_batches(
+        "lowercase_user_emails",
+        "user",
+        "email = lower(email), updated_at = TIMEZONE('utc', CURRENT_TIMESTAMP)",
+        where="email <> lower(email)",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_email_lower", table_name="user")
+    op.create_index(op.f("ix_user_email"), "user", ["email"], unique=False)
+    op.execute(_SYNC_USER_EMAIL_FUNCTION.format(email="NEW.email"))
+    op.execute(
+        'UPDATE user_email SET email = "user".email FROM "user" '
+        'WHERE user_email.user_id = "user".id AND user_email.email <> "user".email'
+    )
@@ -1,4 +1,4 @@
-from collections.abc import Mapping
+from collections.abc import Collection, Mapping
 from typing import Any, Protocol
 
 from backend.services.user.exceptions import (
@@ -8,8 +8,15 @@ from backend.services.user.exceptions import (
     UserNotFoundError,
 )
 from backend.services.user.models import User
-from backend.services.user.operations.auth import get_confirmed_user_from_headers
-from backend.services.user.operations.types import AsyncTokenReader, UserCRUDProtocol
+from backend.services.user.operations.auth import (
+    get_confirmed_user_columns_from_headers,
+    get_confirmed_user_from_headers,
+)
+from backend.services.user.operations.types import (
+    AsyncTokenReader,
+    UserColumnsReader,
+    UserCRUDProtocol,
+)
 
 
 class _Request(Protocol):
@@ -37,3 +44,23 @@ async def get_confirmed_user(
     except (InvalidAccessTokenError, UserNotFoundError, UserEmailNotConfirmedError):
         msg = "Invalid token"
     raise UnauthorizedError(msg)
+
+
+async def get_confirmed_user_columns(
+    request: _Request | None,
+    columns: Collection[str],
+    token_reader: AsyncTokenReader,
+    columns_reader: UserColumnsReader,
+) -> dict[str, Any]:
+    if not request:
+        msg = "Authentication token required"
+        raise UnauthorizedError(msg)
+    try:
+        return await get_confirmed_user_columns_from_headers(
+            request.headers, token_reader, columns_reader, columns
+        )
+    except MissingAccessTokenError:
+        msg = "Authentication token required"
+    except (InvalidAccessTokenError, UserNotFoundError, UserEmailNotConfirmedError):
+        msg = "Invalid token"
+    raise UnauthorizedError(msg)
@@ -1,30 +1,87 @@
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Collection
 from functools import partial
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Depends, Request, WebSocket
+from strawberry.dataloader import DataLoader
 
-from backend.api.deps import get_confirmed_user
-from backend.db import get_db
-from backend.libs.api.context import Context
-from backend.libs.db.session import AsyncSession
+from backend.api.deps import get_confirmed_user, get_confirmed_user_columns
+from backend.db import get_db, get_session_factory
+from backend.libs.api.context import Context, Loaders, RequestWithHeaders
+from backend.libs.api.loaders import create_cached_loader, create_loader
+from backend.libs.db.session import AsyncSession, AsyncSessionMaker
 from backend.services.user.context import async_token_reader
-from backend.services.user.crud import UserCRUD
+from backend.services.user.crud import (
+    UserCRUD,
+    read_user_columns,
+    read_user_records,
+)
 from backend.services.user.models import User
+from backend.services.user.operations.types import AsyncTokenReader
 
 _UserFetcher = Callable[[Request | WebSocket | None], Awaitable[User]]
+_UserColumnsFetcher = Callable[
+    [RequestWithHeaders | None, Collection[str]], Awaitable[dict[str, Any]]
+]
 
 
-async def _get_user(db: Annotated[AsyncSession, Depends(get_db)]) -> _UserFetcher:
+def _create_user_fetcher(
+    db: AsyncSession, token_reader: AsyncTokenReader
+) -> _UserFetcher:
     return partial(
         get_confirmed_user,
-        token_reader=async_token_reader,
+        token_reader=token_reader,
         crud=UserCRUD(db=db),
     )
 
 
+def _create_user_columns_fetcher(
+    db: AsyncSession, token_reader: AsyncTokenReader
+) -> _UserColumnsFetcher:
+    return partial(
+        get_confirmed_user_columns,
+        token_reader=token_reader,
+        columns_reader=partial(read_user_columns, db),
+    )
+
+
+def create_loaders(
+    db: AsyncSession, access_token: DataLoader[str, dict[str, Any]] | None = None
+) -> Loaders:
+    return Loaders(
+        user_by_id=create_loader(
+            partial(read_user_records, db), key_getter=lambda user: user.id
+        ),
+        access_token=access_token or create_cached_loader(async_token_reader),
+    )
+
+
+def _create_context(
+    db: AsyncSession, session_factory: AsyncSessionMaker, loaders: Loaders
+) -> Context:
+    token_reader = loaders.access_token.load
+    return Context(
+        db,
+        _create_user_fetcher(db, token_reader),
+        _create_user_columns_fetcher(db, token_reader),
+        loaders,
+        session_factory,
+    )
+
+
 async def get_context(
     db: Annotated[AsyncSession, Depends(get_db)],
-    user_fetcher: Annotated[_UserFetcher, Depends(_get_user)],
+    session_factory: Annotated[AsyncSessionMaker, Depends(get_session_factory)],
 ) -> Context:
-    return Context(db, user_fetcher)
+    return _create_context(db, session_factory, create_loaders(db))
+
+
+def create_operation_context(context: Context, db: AsyncSession) -> Context:
+    # Shares the request and its authentication, but neither the session nor the
+    # values read with it, with the other operations of a batch
+    loaders = create_loaders(db, context.loaders.access_token)
+    operation_context = _create_context(db, context.session_factory, loaders)
+    operation_context.request = context.request
+    operation_context.background_tasks = context.background_tasks
+    operation_context.response = context.response
+    return operation_context
@@ -0,0 +1,293 @@
+import hashlib
+import random
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import contextmanager, suppress
+from functools import lru_cache
+from inspect import isawaitable
+from typing import Any
+
+import orjson
+from graphql import (
+    ASTValidationRule,
+    DocumentNode,
+    FieldNode,
+    GraphQLError,
+    GraphQLResolveInfo,
+    GraphQLSchema,
+    get_operation_ast,
+)
+from graphql import ExecutionResult as GraphQLExecutionResult
+from starlette import status
+from starlette.responses import Response
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.execute import parse_document, validate_document
+from strawberry.types import ExecutionContext
+from strawberry.types.graphql import OperationType
+from strawberry.utils.await_maybe import AwaitableOrValue
+
+from backend.api.deps import UnauthorizedError
+from backend.config.settings import settings
+from backend.libs.api.context import Context
+from backend.libs.api.headers import matches_etag
+from backend.libs.api.tracing import Histograms
+from backend.libs.db.engine import track_queries
+from backend.services.user.types.user import USER_TYPE_COLUMNS
+
+_db_settings = settings.db
+
+_ParseOptions = tuple[tuple[str, Any], ...]
+
+# The root fields whose results depend only on the authenticated user's row
+_USER_FIELDS = frozenset({"me", "__typename"})
+
+_READ_ONLY_EXECUTION_OPTIONS: dict[str, Any] = {"postgresql_readonly": True}
+if _db_settings.deferrable_read_only:
+    _READ_ONLY_EXECUTION_OPTIONS |= {
+        "isolation_level": "SERIALIZABLE",
+        "postgresql_deferrable": True,
+    }
+
+
+class ReadOnlyQueriesExtension(SchemaExtension):
+    async def on_execute(self) -> AsyncIterator[None]:
+        execution_context = self.execution_context
+        db = execution_context.context.db
+        if (
+            execution_context.operation_type == OperationType.QUERY
+            and not db.in_transaction()
+        ):
+            # Execution options only apply to the connection when it's procured,
+            # so it must happen before any resolver touches the database
+            await db.connection(execution_options=_READ_ONLY_EXECUTION_OPTIONS)
+        yield
+
+
+class UserETagExtension(SchemaExtension):
+    async def on_execute(self) -> AsyncIterator[None]:
+        context = self.execution_context.context
+        etag = None
+        if self._is_conditional_request(context):
+            with suppress(UnauthorizedError):
+                etag = await self._get_etag(context)
+        if etag:
+            self._set_cache_headers(context.response, etag)
+            if matches_etag(context.request.headers, etag):
+                # The client already has the result, so the execution is skipped
+                context.response.status_code = status.HTTP_304_NOT_MODIFIED
+                self.execution_context.result = GraphQLExecutionResult(data=None)
+        yield
+        result = self.execution_context.result
+        if etag and result and result.errors:
+            # Errors are never cached, so that the clients retry
+            del context.response.headers["ETag"]
+
+    def _is_conditional_request(self, context: Any) -> bool:
+        # The conditional POST requests should be answered with 412 instead
+        request = getattr(context, "request", None)
+        if getattr(request, "method", None) != "GET" or not context.response:
+            return False
+        execution_context = self.execution_context
+        if execution_context.operation_type != OperationType.QUERY:
+            return False
+        if not execution_context.graphql_document:
+            return False
+        operation = get_operation_ast(
+            execution_context.graphql_document, execution_context.operation_name
+        )
+        return bool(operation) and all(
+            isinstance(selection, FieldNode) and selection.name.value in _USER_FIELDS
+            for selection in operation.selection_set.selections  # type: ignore[union-attr]
+        )
+
+    async def _get_etag(self, context: Context) -> str:
+        # The columns of the whole user are read along, so that the resolvers find
+        # them already read
+        user = await context.get_user_columns(["updated_at", *USER_TYPE_COLUMNS])
+        execution_context = self.execution_context
+        key = orjson.dumps(
+            [
+                execution_context.query,
+                execution_context.variables,
+                execution_context.operation_name,
+                user["id"],
+                user["updated_at"],
+            ],
+            default=str,
+        )
+        return f'"{hashlib.sha256(key).hexdigest()[:32]}"'
+
+    def _set_cache_headers(self, response: Response, etag: str) -> None:
+        headers = response.headers
+        headers["ETag"] = etag
+        # Must be revalidated on every request and never stored by shared caches
+        headers["Cache-Control"] = "private, no-cache"
+        headers["Vary"] = "Authorization"
+
+
+def create_document_cache_extension(
+    parser_cache_size: int, validation_cache_size: int
+) -> type[SchemaExtension]:
+    # Extension instances are shared by the concurrent operations, so the caches
+    # are kept in a class instantiated for every operation instead
+    @lru_cache(maxsize=parser_cache_size)
+    def cached_parse(query: str, options: _ParseOptions) -> DocumentNode:
+        return parse_document(query, **dict(options))
+
+    @lru_cache(maxsize=validation_cache_size)
+    def cached_validate(
+        schema: GraphQLSchema,
+        query: str,
+        options: _ParseOptions,
+        rules: tuple[type[ASTValidationRule], ...],
+    ) -> tuple[GraphQLError, ...]:
+        return tuple(validate_document(schema, cached_parse(query, options), rules))
+
+    class DocumentCacheExtension(SchemaExtension):
+        def on_parse(self) -> Iterator[None]:
+            execution_context = self.execution_context
+            if execution_context.query:
+                # Invalid queries are left to the regular parsing to report errors
+                with suppress(GraphQLError):
+                    execution_context.graphql_document = cached_parse(
+                        execution_context.query, self._get_parse_options()
+                    )
+            yield
+
+        def on_validate(self) -> Iterator[None]:
+            execution_context = self.execution_context
+            if execution_context.query and execution_context.errors is None:
+                execution_context.errors = list(
+                    cached_validate(
+                        execution_context.schema._schema,
+                        execution_context.query,
+                        self._get_parse_options(),
+                        tuple(execution_context.validation_rules),
+                    )
+                )
+            yield
+
+        def _get_parse_options(self) -> _ParseOptions:
+            return tuple(sorted(self.execution_context.parse_options.items()))
+
+    return DocumentCacheExtension
+
+
+class _TracingExtension(SchemaExtension):
+    durations: Histograms
+    statements: Histograms
+    sample_rate: float
+    trace_header: str | None
+
+    def __init__(self, *, execution_context: ExecutionContext):
+        super().__init__(execution_context=execution_context)
+        self._is_trace_requested = False
+        self._is_traced = False
+        self._phases: dict[str, float] = {}
+        self._resolvers: dict[str, float] = defaultdict(float)
+        self._statements = 0
+
+    def on_operation(self) -> Iterator[None]:
+        self._is_trace_requested = self._has_trace_header()
+        self._is_traced = (
+            self._is_trace_requested or random.random() < self.sample_rate  # nosec B311
+        )
+        if not self._is_traced:
+            yield
+            return
+        # Tracked on their own, as the operations of a batch run concurrently
+        with self._measure("operation"), track_queries() as query_stats:
+            yield
+        self._statements = query_stats.count
+        self.statements.observe("operation", self._statements)
+        for phase, duration in self._phases.items():
+            self.durations.observe(phase, duration)
+        for field, duration in self._resolvers.items():
+            self.durations.observe(f"resolver:{field}", duration)
+
+    def on_parse(self) -> Iterator[None]:
+        with self._measure("parse"):
+            yield
+
+    def on_validate(self) -> Iterator[None]:
+        with self._measure("validate"):
+            yield
+
+    def on_execute(self) -> Iterator[None]:
+        with self._measure("execute"):
+            yield
+
+    def resolve(
+        self,
+        _next: Callable[..., Any],
+        root: Any,
+        info: GraphQLResolveInfo,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AwaitableOrValue[object]:
+        result: object = _next(root, info, *args, **kwargs)
+        # The synchronous resolvers only read the attributes, so they're skipped
+        if self._is_traced and isawaitable(result):
+            field = f"{info.parent_type.name}.{info.field_name}"
+            return self._measure_resolver(result, field)
+        return result
+
+    def get_results(self) -> dict[str, Any]:
+        if not self._is_trace_requested:
+            return {}
+        return {
+            "tracing": {
+                "phases": _to_milliseconds(self._phases),
+                "resolvers": _to_milliseconds(self._resolvers),
+                "statements": self._statements,
+            }
+        }
+
+    @contextmanager
+    def _measure(self, phase: str) -> Iterator[None]:
+        if not self._is_traced:
+            yield
+            return
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases[phase] = time.perf_counter() - start_time
+
+    async def _measure_resolver(self, result: Awaitable[object], field: str) -> object:
+        start_time = time.perf_counter()
+        try:
+            return await result
+        finally:
+            self._resolvers[field] += time.perf_counter() - start_time
+
+    def _has_trace_header(self) -> bool:
+        request = getattr(self.execution_context.context, "request", None)
+        return bool(
+            self.trace_header and request and self.trace_header in request.headers
+        )
+
+
+def create_tracing_extension(
+    durations: Histograms,
+    statements: Histograms,
+    sample_rate: float,
+    trace_header: str | None = None,
+) -> type[SchemaExtension]:
+    # The traces are returned only to the requests with the trace header, the
+    # sampled ones are just recorded in the histograms
+    return type(
+        "TracingExtension",
+        (_TracingExtension,),
+        {
+            "durations": durations,
+            "statements": statements,
+            "sample_rate": sample_rate,
+            "trace_header": trace_header,
+        },
+    )
+
+
+def _to_milliseconds(durations: dict[str, float]) -> dict[str, float]:
+    return {name: round(duration * 1000, 3) for name, duration in durations.items()}
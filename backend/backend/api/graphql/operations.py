@@ -0,0 +1,32 @@
+# The hottest operations sent by the frontend, used to warm up the schema
+KNOWN_OPERATIONS = (
+    """
+    query GetMe {
+      me {
+        fullName
+      }
+    }
+    """,
+    """
+    mutation Login($input: LoginInput!) {
+      login(input: $input) {
+        ... on LoginSuccess {
+          accessToken
+          refreshToken
+        }
+        ... on LoginFailure {
+          problems {
+            __typename
+          }
+        }
+      }
+    }
+    """,
+    """
+    mutation RefreshToken($token: String!) {
+      refreshToken(token: $token) {
+        accessToken
+      }
+    }
+    """,
+)
@@ -1,35 +1,459 @@
-from typing import Any
+import asyncio
+import time
+from collections.abc import Awaitable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, cast
 
 import orjson
+from fastapi import Response, status
+from graphql import DocumentNode, GraphQLError, ValidationRule, parse
 from graphql.validation import NoSchemaIntrospectionCustomRule
+from redis.asyncio import Redis
 from strawberry import Schema
-from strawberry.extensions import AddValidationRules, SchemaExtension
+from strawberry.exceptions import MissingQueryError
+from strawberry.extensions import (
+    AddValidationRules,
+    MaskErrors,
+    MaxAliasesLimiter,
+    MaxTokensLimiter,
+    QueryDepthLimiter,
+    SchemaExtension,
+)
 from strawberry.fastapi import GraphQLRouter
+from strawberry.fastapi.handlers import GraphQLTransportWSHandler
 from strawberry.http import GraphQLHTTPResponse
+from strawberry.http.async_base_view import AsyncHTTPRequestAdapter
+from strawberry.http.base import BaseRequestProtocol
+from strawberry.http.exceptions import HTTPException
+from strawberry.http.types import HTTPMethod
+from strawberry.schema.exceptions import InvalidOperationTypeError
+from strawberry.subscriptions import GRAPHQL_TRANSPORT_WS_PROTOCOL
+from strawberry.types import ExecutionResult
+from strawberry.types.graphql import OperationType
+from strawberry.utils.operation import get_operation_type
 
-from backend.api.graphql.context import get_context
+from backend.api.graphql.context import create_operation_context, get_context
+from backend.api.graphql.extensions import (
+    ReadOnlyQueriesExtension,
+    UserETagExtension,
+    create_document_cache_extension,
+    create_tracing_extension,
+)
 from backend.api.graphql.mutation import Mutation
 from backend.api.graphql.query import Query
+from backend.api.graphql.subscription import Subscription
+from backend.api.graphql.websocket import create_subscription_handler
+from backend.config.settings import settings
+from backend.libs.api.context import Context
+from backend.libs.api.limits import (
+    ConnectionLimiter,
+    CostLimit,
+    create_cost_limit_rule,
+)
+from backend.libs.api.persisted_queries import (
+    ALLOWED_QUERY_KEY_PREFIX,
+    PERSISTED_QUERY_KEY_PREFIX,
+    PersistedQueryError,
+    PersistedQueryStore,
+    resolve_persisted_query,
+)
+from backend.libs.db.session import is_timeout_error
+from backend.metrics import graphql_durations, graphql_statements
+
+_graphql_settings = settings.graphql
+
+_TRACE_HEADER = "X-GraphQL-Trace"
+
+# The data, the resolved query and its document of an operation of a batch
+_BatchOperation = tuple[
+    Mapping[str, Any], str | ExecutionResult | None, DocumentNode | None
+]
+
+
+@dataclass
+class _BatchExecutionResult(ExecutionResult):
+    results: list[ExecutionResult] = field(default_factory=list)
 
 
 class _Router(GraphQLRouter[Any, None]):
-    def encode_json(self, response_data: GraphQLHTTPResponse) -> str:
-        return orjson.dumps(response_data).decode()
+    schema: Schema
+
+    def __init__(  # noqa: PLR0913
+        self,
+        schema: Schema,
+        persisted_query_store: PersistedQueryStore,
+        allow_list_only: bool = False,
+        max_query_length: int | None = None,
+        max_batch_size: int = 1,
+        max_batch_concurrency: int = 1,
+        batch_cost_limit: CostLimit | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(
+            schema, subscription_protocols=(GRAPHQL_TRANSPORT_WS_PROTOCOL,), **kwargs
+        )
+        self.persisted_query_store = persisted_query_store
+        self._allow_list_only = allow_list_only
+        self._max_query_length = max_query_length
+        self._max_batch_size = max_batch_size
+        self._max_batch_concurrency = max_batch_concurrency
+        self._batch_cost_limit = batch_cost_limit
+
+    def parse_json(self, data: str | bytes) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as exc:
+            raise HTTPException(400, "Unable to parse request body as JSON") from exc
+
+    def create_response(
+        self, response_data: GraphQLHTTPResponse, sub_response: Response
+    ) -> Response:
+        if sub_response.status_code == status.HTTP_304_NOT_MODIFIED:
+            # The client already has the body, so it's neither encoded nor sent
+            response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        else:
+            # The bytes from orjson are sent as they are, as decoding them to
+            # a str would only have them encoded again
+            response = Response(
+                self._encode_json(response_data),
+                media_type="application/json",
+                status_code=sub_response.status_code or status.HTTP_200_OK,
+            )
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    def _encode_json(self, response_data: GraphQLHTTPResponse) -> bytes:
+        # Cheap enough to be measured for every response, regardless of sampling
+        start_time = time.perf_counter()
+        encoded_data = orjson.dumps(response_data)
+        graphql_durations.observe("encode", time.perf_counter() - start_time)
+        return encoded_data
+
+    def should_render_graphql_ide(self, request: BaseRequestProtocol) -> bool:
+        # Persisted queries are sent without the query text
+        return super().should_render_graphql_ide(request) and (
+            request.query_params.get("extensions") is None
+        )
+
+    async def execute_operation(
+        self,
+        request: Any,
+        context: Context,
+        # The router has no root value
+        root_value: None,  # noqa: ARG002
+    ) -> ExecutionResult:
+        request_adapter = self.request_adapter_class(request)
+        try:
+            data = await self._parse_http_data(request_adapter)
+        except KeyError as exc:
+            raise HTTPException(400, "File(s) missing in form data") from exc
+        if isinstance(data, list):
+            return await self._execute_batch(data, request_adapter.method, context)
+        return await self._execute(data, request_adapter.method, context)
+
+    async def process_result(
+        self, request: Any, result: ExecutionResult
+    ) -> GraphQLHTTPResponse:
+        if isinstance(result, _BatchExecutionResult):
+            responses = [
+                await self._process_batch_result(request, batch_result)
+                for batch_result in result.results
+            ]
+            # The responses of a batch are encoded as a list in the same order
+            return cast(GraphQLHTTPResponse, responses)
+        return await super().process_result(request, result)
+
+    async def _process_batch_result(
+        self, request: Any, result: ExecutionResult
+    ) -> GraphQLHTTPResponse:
+        response_data = await super().process_result(request, result)
+        if result.errors:
+            self._handle_errors(result.errors, response_data)
+        return response_data
+
+    async def _parse_http_data(self, request: AsyncHTTPRequestAdapter) -> Any:
+        content_type = request.content_type or ""
+        if "application/json" in content_type:
+            return self.parse_json(await request.get_body())
+        if content_type.startswith("multipart/form-data"):
+            return await self.parse_multipart(request)
+        if request.method == "GET":
+            return self.parse_query_params(request.query_params)
+        raise HTTPException(400, "Unsupported content type")
+
+    async def _execute_batch(
+        self, batch: list[Any], method: HTTPMethod, context: Context
+    ) -> _BatchExecutionResult:
+        if not 0 < len(batch) <= self._max_batch_size or not all(
+            isinstance(data, dict) for data in batch
+        ):
+            msg = f"Batch must contain from 1 to {self._max_batch_size} operations"
+            raise HTTPException(400, msg)
+        # The queries in a row are executed concurrently, while the mutations are
+        # executed one by one, so that they stay in order. Every operation has its
+        # own session, which holds a connection of the pool, so only a few of them
+        # are open at once.
+        operations: list[_BatchOperation] = []
+        for data in batch:
+            query = await self._resolve_query(data)
+            operations.append((data, query, _parse_query(query)))
+        self._validate_batch_cost(operations)
+        semaphore = asyncio.Semaphore(self._max_batch_concurrency)
+        results: list[ExecutionResult] = []
+        queries: list[Awaitable[ExecutionResult]] = []
+        for data, query, document in operations:
+            if not _is_mutation(document, data.get("operationName")):
+                queries.append(
+                    _run_limited(
+                        semaphore,
+                        self._execute_in_session(data, query, method, context),
+                    )
+                )
+                continue
+            results.extend(await asyncio.gather(*queries))
+            queries = []
+            # Neither the transaction nor the timeouts set by a mutation leak into
+            # the next one, as every one of them has a session of its own
+            results.append(await self._execute_in_session(data, query, method, context))
+        results.extend(await asyncio.gather(*queries))
+        return _BatchExecutionResult(data=None, errors=None, results=results)
+
+    def _validate_batch_cost(self, operations: list[_BatchOperation]) -> None:
+        # The cost of every operation is limited on its own too, but a batch of
+        # them must not add up to more than a single one may cost
+        if self._batch_cost_limit is None:
+            return
+        cost = sum(
+            self._batch_cost_limit.get_cost(
+                self.schema._schema, document, data.get("operationName")
+            )
+            for data, _, document in operations
+            if document is not None
+        )
+        if cost > self._batch_cost_limit.max_cost:
+            msg = (
+                f"Batch has a cost of {cost}, which exceeds the maximum cost of "
+                f"{self._batch_cost_limit.max_cost}"
+            )
+            raise HTTPException(400, msg)
+
+    async def _execute_in_session(
+        self,
+        data: Mapping[str, Any],
+        query: str | ExecutionResult | None,
+        method: HTTPMethod,
+        context: Context,
+    ) -> ExecutionResult:
+        async with context.session_factory() as db:
+            return await self._execute_batch_operation(
+                data, query, method, create_operation_context(context, db)
+            )
+
+    async def _execute_batch_operation(
+        self,
+        data: Mapping[str, Any],
+        query: str | ExecutionResult | None,
+        method: HTTPMethod,
+        context: Context,
+    ) -> ExecutionResult:
+        if isinstance(query, ExecutionResult):
+            return query
+        # Unlike a single operation's, these errors are reported in the place of
+        # the operation, as the other ones are executed anyway
+        try:
+            return await self._execute_query(query, data, method, context)
+        except InvalidOperationTypeError as exc:
+            message = exc.as_http_error_reason(method)
+        except MissingQueryError:
+            message = "No GraphQL query found in the request"
+        return ExecutionResult(data=None, errors=[GraphQLError(message)])
+
+    async def _execute(
+        self,
+        data: Mapping[str, Any],
+        method: HTTPMethod,
+        context: Context,
+    ) -> ExecutionResult:
+        query = await self._resolve_query(data)
+        if isinstance(query, ExecutionResult):
+            return query
+        return await self._execute_query(query, data, method, context)
+
+    async def _resolve_query(
+        self, data: Mapping[str, Any]
+    ) -> str | ExecutionResult | None:
+        query = data.get("query")
+        if (
+            self._max_query_length is not None
+            and isinstance(query, str)
+            and len(query.encode()) > self._max_query_length
+        ):
+            # Rejected before the query is hashed, stored, parsed or cached
+            msg = f"Query must not be longer than {self._max_query_length} bytes"
+            raise HTTPException(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, msg)
+        try:
+            return await resolve_persisted_query(
+                query,
+                data.get("extensions"),
+                self.persisted_query_store,
+                self._allow_list_only,
+            )
+        except PersistedQueryError as exc:
+            # Report it as a GraphQL error, so that the clients know to send the
+            # full query
+            error = GraphQLError(exc.message, extensions={"code": exc.code})
+            return ExecutionResult(data=None, errors=[error])
+
+    async def _execute_query(
+        self,
+        query: str | None,
+        data: Mapping[str, Any],
+        method: HTTPMethod,
+        context: Context,
+    ) -> ExecutionResult:
+        allowed_operation_types = OperationType.from_http(method)
+        if not self.allow_queries_via_get and method == "GET":
+            allowed_operation_types -= {OperationType.QUERY}
+        return await self.schema.execute(
+            query,
+            variable_values=data.get("variables"),
+            context_value=context,
+            operation_name=data.get("operationName"),
+            allowed_operation_types=allowed_operation_types,
+        )
+
+    def parse_query_params(self, params: Mapping[str, Any]) -> dict[str, Any]:
+        data = super().parse_query_params(params)
+        if extensions := data.get("extensions"):
+            data["extensions"] = self.parse_json(extensions)
+        return data
+
+
+async def _run_limited(
+    semaphore: asyncio.Semaphore, operation: Awaitable[ExecutionResult]
+) -> ExecutionResult:
+    async with semaphore:
+        return await operation
+
+
+def _parse_query(query: str | ExecutionResult | None) -> DocumentNode | None:
+    if not isinstance(query, str):
+        return None
+    try:
+        return parse(query)
+    except GraphQLError:
+        # Left for the execution to report
+        return None
+
+
+def _is_mutation(document: DocumentNode | None, operation_name: str | None) -> bool:
+    if document is None:
+        return False
+    try:
+        operation_type = get_operation_type(document, operation_name)
+    except RuntimeError:
+        # Left for the execution to report
+        return False
+    return operation_type == OperationType.MUTATION
 
 
 def get_router(debug: bool = False) -> _Router:
     schema = _get_schema(debug)
     graphql_ide = "graphiql" if debug else None
-    return _Router(
+    router = _Router(
         schema,
-        graphql_ide=graphql_ide,  # type: ignore[arg-type]
+        persisted_query_store=_get_persisted_query_store(),
+        allow_list_only=_graphql_settings.persisted_queries_allow_list_only,
+        max_query_length=_graphql_settings.max_query_length,
+        max_batch_size=_graphql_settings.max_batch_size,
+        max_batch_concurrency=_graphql_settings.max_batch_concurrency,
+        batch_cost_limit=_get_cost_limit(),
+        graphql_ide=graphql_ide,
         context_getter=get_context,
+        connection_init_wait_timeout=_graphql_settings.subscription_init_timeout,
+    )
+    router.graphql_transport_ws_handler_class = _get_subscription_handler(debug)
+    return router
+
+
+def _get_persisted_query_store() -> PersistedQueryStore:
+    redis_url = _graphql_settings.persisted_queries_redis_url
+    key_prefix = (
+        ALLOWED_QUERY_KEY_PREFIX
+        if _graphql_settings.persisted_queries_allow_list_only
+        else PERSISTED_QUERY_KEY_PREFIX
+    )
+    return PersistedQueryStore(
+        redis=Redis.from_url(redis_url) if redis_url else None,
+        cache_size=_graphql_settings.persisted_queries_cache_size,
+        ttl=_graphql_settings.persisted_queries_ttl,
+        key_prefix=key_prefix,
+    )
+
+
+def _get_subscription_handler(debug: bool = False) -> type[GraphQLTransportWSHandler]:
+    validation_rules = [_get_cost_limit_rule()]
+    if not debug:
+        validation_rules.append(NoSchemaIntrospectionCustomRule)
+    return create_subscription_handler(
+        ConnectionLimiter(_graphql_settings.max_subscription_connections),
+        _graphql_settings.max_query_length,
+        _graphql_settings.max_tokens,
+        validation_rules,
+    )
+
+
+def _get_cost_limit() -> CostLimit:
+    return CostLimit(
+        _graphql_settings.max_cost,
+        _graphql_settings.field_costs,
+        _graphql_settings.default_field_cost,
+    )
+
+
+def _get_cost_limit_rule() -> type[ValidationRule]:
+    cost_limit = _get_cost_limit()
+    return create_cost_limit_rule(
+        cost_limit.max_cost, cost_limit.field_costs, cost_limit.default_cost
     )
 
 
 def _get_schema(debug: bool = False) -> Schema:
-    schema_extensions: list[SchemaExtension] = []
+    schema_extensions: list[type[SchemaExtension] | SchemaExtension] = [
+        # Goes first, so that the phases include the work of the other extensions
+        create_tracing_extension(
+            graphql_durations,
+            graphql_statements,
+            _graphql_settings.tracing_sample_rate,
+            # The traces reveal the internals, so they're returned only in debug
+            trace_header=_TRACE_HEADER if debug else None,
+        ),
+        create_document_cache_extension(
+            _graphql_settings.parser_cache_size,
+            _graphql_settings.validation_cache_size,
+        ),
+        MaxTokensLimiter(max_token_count=_graphql_settings.max_tokens),
+        QueryDepthLimiter(max_depth=_graphql_settings.max_depth),
+        MaxAliasesLimiter(max_alias_count=_graphql_settings.max_aliases),
+        AddValidationRules([_get_cost_limit_rule()]),
+        ReadOnlyQueriesExtension,
+        # Goes after the read-only queries, so that the user is read in them
+        UserETagExtension,
+        MaskErrors(
+            should_mask_error=_is_db_timeout_error,
+            error_message="Service temporarily unavailable",
+        ),
+    ]
     if not debug:
         schema_extensions.append(AddValidationRules([NoSchemaIntrospectionCustomRule]))
 
-    return Schema(query=Query, mutation=Mutation, extensions=schema_extensions)
+    return Schema(
+        query=Query,
+        mutation=Mutation,
+        subscription=Subscription,
+        extensions=schema_extensions,
+    )
+
+
+def _is_db_timeout_error(error: GraphQLError) -> bool:
+    return error.original_error is not None and is_timeout_error(error.original_error)
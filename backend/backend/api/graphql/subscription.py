@@ -0,0 +1,13 @@
+from collections.abc import AsyncGenerator
+
+import strawberry
+
+from backend.services.user.resolvers.user import subscribe_me_resolver
+from backend.services.user.types.user import User
+
+
+@strawberry.type
+class Subscription:
+    me: AsyncGenerator[User, None] = strawberry.subscription(
+        resolver=subscribe_me_resolver
+    )
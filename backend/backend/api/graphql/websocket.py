@@ -0,0 +1,117 @@
+from collections.abc import Collection
+from typing import cast
+
+from graphql import (
+    GraphQLError,
+    GraphQLSyntaxError,
+    ValidationRule,
+    parse,
+    specified_rules,
+    validate,
+)
+from strawberry import Schema
+from strawberry.fastapi.handlers import GraphQLTransportWSHandler
+from strawberry.subscriptions.protocols.graphql_transport_ws.types import (
+    ConnectionInitMessage,
+    ErrorMessage,
+    SubscribeMessage,
+    SubscribeMessagePayload,
+)
+from strawberry.types.graphql import OperationType
+from strawberry.utils.operation import get_operation_type
+
+from backend.api.deps import UnauthorizedError
+from backend.libs.api.context import Context
+from backend.libs.api.limits import ConnectionLimiter
+
+_TRY_AGAIN_LATER_CODE = 1013
+_FORBIDDEN_CODE = 4403
+
+
+class _SubscriptionHandler(GraphQLTransportWSHandler):
+    connection_limiter: ConnectionLimiter
+    max_query_length: int
+    max_tokens: int
+    validation_rules: Collection[type[ValidationRule]]
+
+    async def handle_request(self) -> None:
+        if not self.connection_limiter.acquire():
+            # Rejected before the handshake, so that the clients back off before
+            # the connection costs anything
+            await self._ws.close(code=_TRY_AGAIN_LATER_CODE)
+            return
+        try:
+            await super().handle_request()
+        finally:
+            self.connection_limiter.release()
+
+    async def handle_connection_init(self, message: ConnectionInitMessage) -> None:
+        # Every acknowledged connection is authenticated, also the ones which
+        # send no payload, so the subscriptions never fall back to the database
+        payload = message.payload or {}
+        if not self.connection_init_received and isinstance(payload, dict):
+            context: Context = await self.get_context()
+            try:
+                await context.authenticate_connection(payload)
+            except UnauthorizedError:
+                await self.close(code=_FORBIDDEN_CODE, reason="Forbidden")
+                return
+            finally:
+                # The connection may stay open for hours, so it mustn't keep
+                # a database connection checked out
+                await context.db.close()
+        await super().handle_connection_init(message)
+
+    async def handle_subscribe(self, message: SubscribeMessage) -> None:
+        if self.connection_acknowledged and (
+            errors := self._validate_subscription(message.payload)
+        ):
+            payload = [error.formatted for error in errors]
+            await self.send_message(ErrorMessage(id=message.id, payload=payload))
+            return
+        await super().handle_subscribe(message)
+
+    def _validate_subscription(
+        self, payload: SubscribeMessagePayload
+    ) -> list[GraphQLError]:
+        # The subscriptions skip the schema extensions, so the limits are applied
+        # here instead
+        if len(payload.query.encode()) > self.max_query_length:
+            msg = f"Query must not be longer than {self.max_query_length} bytes"
+            return [GraphQLError(msg)]
+        try:
+            document = parse(payload.query, max_tokens=self.max_tokens)
+        except GraphQLSyntaxError as exc:
+            return [exc]
+        try:
+            operation_type = get_operation_type(document, payload.operationName)
+        except RuntimeError:
+            # Rejected by the protocol handler
+            return []
+        if operation_type != OperationType.SUBSCRIPTION:
+            # The operations of a connection share its context and database
+            # session, so they could run concurrently on the same session
+            return [GraphQLError("Only subscriptions are supported over WebSocket")]
+        return validate(
+            cast(Schema, self.schema)._schema,
+            document,
+            [*specified_rules, *self.validation_rules],
+        )
+
+
+def create_subscription_handler(
+    connection_limiter: ConnectionLimiter,
+    max_query_length: int,
+    max_tokens: int,
+    validation_rules: Collection[type[ValidationRule]] = (),
+) -> type[GraphQLTransportWSHandler]:
+    return type(
+        "SubscriptionHandler",
+        (_SubscriptionHandler,),
+        {
+            "connection_limiter": connection_limiter,
+            "max_query_length": max_query_length,
+            "max_tokens": max_tokens,
+            "validation_rules": validation_rules,
+        },
+    )
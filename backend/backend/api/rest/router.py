@@ -1,9 +1,11 @@
 from fastapi import APIRouter
 
 from backend.services.monitoring.routers.router import router as monitoring_router
+from backend.services.user.routers.router import router as user_router
 
 _router = APIRouter()
 _router.include_router(monitoring_router, prefix="/monitoring", tags=["monitoring"])
+_router.include_router(user_router, prefix="/users", tags=["users"])
 
 
 def get_router() -> APIRouter:
@@ -0,0 +1,14 @@
+from redis.asyncio import Redis
+
+from backend.config.settings import settings
+from backend.libs.api.broadcast import Broadcaster
+
+_graphql_settings = settings.graphql
+
+_redis_url = _graphql_settings.subscriptions_redis_url
+
+# Shared by all the connections handled by the process
+broadcaster = Broadcaster(
+    redis=Redis.from_url(_redis_url) if _redis_url else None,
+    queue_size=_graphql_settings.subscription_queue_size,
+)
@@ -0,0 +1,157 @@
+import argparse
+import asyncio
+import csv
+import logging
+import os
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+import orjson
+from redis.asyncio import Redis
+
+from backend.config.settings import settings
+from backend.db import engine, get_background_session_factory
+from backend.libs.api.persisted_queries import (
+    ALLOWED_QUERY_KEY_PREFIX,
+    PersistedQueryStore,
+    hash_query,
+)
+from backend.libs.db.engine import dispose_async_engine
+from backend.libs.security.password import async_hash_passwords
+from backend.libs.types.asynchronous import AsyncExecutor
+from backend.services.user.crud import UserRecord, insert_new_users
+from backend.services.user.operations.imports import import_users
+from backend.services.user.tasks import send_confirmation_email_task
+
+_logger = logging.getLogger(__name__)
+
+_graphql_settings = settings.graphql
+
+_T = TypeVar("_T")
+_P = ParamSpec("_P")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend.cli")
+    subparsers = parser.add_subparsers(required=True)
+
+    import_users_parser = subparsers.add_parser(
+        "import-users", help="Import users from a NDJSON or CSV file"
+    )
+    import_users_parser.add_argument("path", type=Path)
+    import_users_parser.add_argument(
+        "--format", choices=["ndjson", "csv"], default=None
+    )
+    import_users_parser.add_argument("--batch-size", type=int, default=1000)
+    import_users_parser.add_argument("--workers", type=int, default=os.cpu_count())
+    import_users_parser.add_argument("--emails-batch-size", type=int, default=100)
+    import_users_parser.add_argument("--no-confirmation-emails", action="store_true")
+    import_users_parser.set_defaults(command=_import_users_command)
+
+    register_queries_parser = subparsers.add_parser(
+        "register-persisted-queries",
+        help="Register the GraphQL queries from a JSON manifest of hashes to queries",
+    )
+    register_queries_parser.add_argument("path", type=Path)
+    register_queries_parser.set_defaults(command=_register_persisted_queries_command)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    args.command(args)
+
+
+def _import_users_command(args: argparse.Namespace) -> None:
+    file_format = args.format or args.path.suffix.removeprefix(".")
+    if file_format not in _READERS:
+        msg = f"Unknown file format {file_format!r}, pass it with --format"
+        raise SystemExit(msg)
+    # bcrypt is CPU-bound, so the passwords are hashed in parallel processes
+    with (
+        ProcessPoolExecutor(max_workers=args.workers) as pool,
+        # The csv module handles the newlines itself, also the quoted ones
+        args.path.open(newline="") as f,
+    ):
+        asyncio.run(_import_users(_READERS[file_format](f), pool, args))
+
+
+async def _import_users(
+    rows: Iterator[Mapping[str, Any]], pool: Executor, args: argparse.Namespace
+) -> None:
+    def queue_confirmation_emails(users: Sequence[UserRecord]) -> None:
+        if args.no_confirmation_emails or not users:
+            return
+        # Send a single message per chunk of emails instead of one per user
+        send_confirmation_email_task.chunks(
+            [(user.id, user.email) for user in users], args.emails_batch_size
+        ).apply_async()
+
+    try:
+        async with get_background_session_factory()() as db:
+            report = await import_users(
+                rows,
+                partial(async_hash_passwords, executor=_create_pool_executor(pool)),
+                partial(insert_new_users, db),
+                args.batch_size,
+                queue_confirmation_emails,
+            )
+    finally:
+        await dispose_async_engine(engine)
+    for line, error in report.invalid.items():
+        _logger.warning("Invalid user in line %d: %s", line, error)
+
+
+def _create_pool_executor(pool: Executor) -> AsyncExecutor:
+    async def executor(
+        func: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs
+    ) -> _T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, partial(func, *args, **kwargs))
+
+    return executor
+
+
+def _register_persisted_queries_command(args: argparse.Namespace) -> None:
+    redis_url = _graphql_settings.persisted_queries_redis_url
+    if not redis_url:
+        msg = "The persisted queries can be registered only in Redis"
+        raise SystemExit(msg)
+    manifest: dict[str, str] = orjson.loads(args.path.read_bytes())
+    for query_hash, query in manifest.items():
+        if hash_query(query) != query_hash:
+            msg = f"The hash {query_hash!r} doesn't match its query"
+            raise SystemExit(msg)
+    asyncio.run(_register_persisted_queries(Redis.from_url(redis_url), manifest))
+
+
+async def _register_persisted_queries(redis: Redis, manifest: dict[str, str]) -> None:
+    store = PersistedQueryStore(redis, key_prefix=ALLOWED_QUERY_KEY_PREFIX)
+    try:
+        for query_hash, query in manifest.items():
+            # The allow-listed queries must not expire
+            await store.add(query_hash, query, expire=False)
+    finally:
+        await store.close()
+    _logger.info("Registered %d persisted queries", len(manifest))
+
+
+def _read_ndjson(f: Any) -> Iterator[Mapping[str, Any]]:
+    for line in f:
+        if line.strip():
+            yield orjson.loads(line)
+
+
+def _read_csv(f: Any) -> Iterator[Mapping[str, Any]]:
+    yield from csv.DictReader(f)
+
+
+_READERS: dict[str, Callable[[Any], Iterator[Mapping[str, Any]]]] = {
+    "ndjson": _read_ndjson,
+    "csv": _read_csv,
+}
+
+
+if __name__ == "__main__":
+    main()
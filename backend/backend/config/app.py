@@ -1,6 +1,11 @@
+from datetime import timedelta
+
 from pydantic import BaseModel
 
 
 class APPSettings(BaseModel):
     dev_mode: bool = False
     logging_level: str = "INFO"
+    warm_up: bool = True
+    warm_up_timeout: timedelta = timedelta(seconds=10)
+    warm_up_db_connections: int = 5
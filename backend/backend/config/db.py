@@ -1,7 +1,15 @@
+from datetime import timedelta
+
 from pydantic import BaseModel
 from sqlalchemy.engine import URL
 
 
+class DBTimeoutsSettings(BaseModel):
+    statement_timeout: timedelta | None = timedelta(seconds=5)
+    lock_timeout: timedelta | None = timedelta(seconds=2)
+    idle_in_transaction_session_timeout: timedelta | None = timedelta(seconds=30)
+
+
 class DBSettings(BaseModel):
     password: str
     username: str
@@ -9,6 +17,30 @@ class DBSettings(BaseModel):
     host: str
     port: int
     driver: str = "postgresql+asyncpg"
+    # Each process opens at most pool_size + max_overflow connections
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: timedelta = timedelta(seconds=30)
+    pool_pre_ping: bool = True
+    pool_recycle: timedelta | None = timedelta(minutes=30)
+    statement_cache_size: int = 100
+    server_settings: dict[str, str] = {"jit": "off"}
+    # Disables prepared statements for PgBouncer in the transaction mode
+    pgbouncer: bool = False
+    slow_query_threshold: timedelta = timedelta(milliseconds=200)
+    explain_slow_queries: bool = False
+    query_budget: int = 20
+    # Run GraphQL queries in SERIALIZABLE READ ONLY DEFERRABLE transactions
+    deferrable_read_only: bool = False
+    timeouts: DBTimeoutsSettings = DBTimeoutsSettings()
+    login_timeouts: DBTimeoutsSettings = DBTimeoutsSettings(
+        statement_timeout=timedelta(seconds=2), lock_timeout=timedelta(seconds=1)
+    )
+    background_timeouts: DBTimeoutsSettings = DBTimeoutsSettings(
+        statement_timeout=timedelta(minutes=5),
+        lock_timeout=timedelta(seconds=10),
+        idle_in_transaction_session_timeout=timedelta(minutes=5),
+    )
 
     @property
     def url(self) -> URL:
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from pydantic import BaseModel
+
+
+class GraphQLSettings(BaseModel):
+    max_tokens: int = 2000
+    # Bytes of a query, as a string literal of any length is a single token
+    max_query_length: int = 50_000
+    max_depth: int = 10
+    max_aliases: int = 15
+    max_cost: int = 1000
+    # The mutations hashing or validating the passwords are the most expensive ones
+    field_costs: dict[str, int] = {
+        "Mutation.createUser": 250,
+        "Mutation.login": 250,
+        "Mutation.resetPassword": 250,
+        "Mutation.changeMyPassword": 500,
+        "Mutation.recoverPassword": 50,
+    }
+    default_field_cost: int = 1
+    max_batch_size: int = 10
+    # Queries of a batch executed at once, each holding a database connection
+    max_batch_concurrency: int = 3
+    # Share of the operations whose phases and resolvers are recorded
+    tracing_sample_rate: float = 0.0
+    parser_cache_size: int = 256
+    validation_cache_size: int = 256
+    # Without Redis, every process keeps its own persisted queries
+    persisted_queries_redis_url: str | None = None
+    persisted_queries_cache_size: int = 1000
+    persisted_queries_ttl: timedelta | None = timedelta(days=30)
+    # Reject all the queries not registered up front with the CLI
+    persisted_queries_allow_list_only: bool = False
+    # Without Redis, the subscriptions receive only the events of their own process
+    subscriptions_redis_url: str | None = None
+    max_subscription_connections: int = 1000
+    subscription_init_timeout: timedelta = timedelta(seconds=10)
+    # Messages a slow subscriber may fall behind before the oldest ones are dropped
+    subscription_queue_size: int = 16
@@ -3,6 +3,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from backend.config.app import APPSettings
 from backend.config.db import DBSettings
 from backend.config.email import EmailSettings
+from backend.config.graphql import GraphQLSettings
 from backend.config.monitoring import MonitoringSettings
 from backend.config.user import UserSettings
 from backend.config.worker import WorkerSettings
@@ -13,6 +14,7 @@ class Settings(BaseSettings):
     db: DBSettings
     worker: WorkerSettings
     email: EmailSettings
+    graphql: GraphQLSettings = GraphQLSettings()
 
     user: UserSettings
     monitoring: MonitoringSettings = MonitoringSettings()
@@ -13,6 +13,20 @@ class UserSettings(BaseModel):
     reset_password_token_lifetime: timedelta = timedelta(days=3)
     access_token_lifetime: timedelta = timedelta(minutes=30)
     refresh_token_lifetime: timedelta = timedelta(days=7)
+    last_login_flush_interval: timedelta = timedelta(seconds=5)
+    unconfirmed_users_purge_interval: timedelta = timedelta(hours=1)
+    unconfirmed_users_purge_batch_size: int = 1000
+    # The change feed is disabled until the consumers are given an API key
+    change_feed_api_key: str | None = None
+    change_feed_page_size: int = 100
+    change_feed_max_page_size: int = 1000
+    # The changes of the transactions in progress are held back until they end,
+    # but the ones of the other database roles can't be seen. Changes younger than
+    # this are held back too, so it must exceed the longest of their transactions.
+    change_feed_delay: timedelta = timedelta(seconds=5)
+    # The export is disabled until the administrators are given an API key
+    export_api_key: str | None = None
+    export_chunk_size: int = 1000
 
     auth_private_key: Base64Bytes
     auth_public_key: Base64Bytes
@@ -1,14 +1,59 @@
 from collections.abc import AsyncGenerator
 
 from backend.config.settings import settings
-from backend.libs.db.engine import create_async_engine
-from backend.libs.db.session import AsyncSession, create_async_session_factory
+from backend.libs.db.engine import (
+    EngineProfile,
+    QueryInstrumentation,
+    create_async_engine,
+)
+from backend.libs.db.session import (
+    AsyncSession,
+    AsyncSessionMaker,
+    SessionTimeouts,
+    create_async_session_factory,
+)
 
-engine = create_async_engine(settings.db.url)
+_app_settings = settings.app
+_db_settings = settings.db
 
-_session_factory = create_async_session_factory(engine)
+engine = create_async_engine(
+    _db_settings.url,
+    EngineProfile(
+        pool_size=_db_settings.pool_size,
+        max_overflow=_db_settings.max_overflow,
+        pool_timeout=_db_settings.pool_timeout,
+        pool_pre_ping=_db_settings.pool_pre_ping,
+        pool_recycle=_db_settings.pool_recycle,
+        statement_cache_size=_db_settings.statement_cache_size,
+        server_settings=_db_settings.server_settings,
+        pgbouncer=_db_settings.pgbouncer,
+    ),
+    QueryInstrumentation(
+        slow_query_threshold=_db_settings.slow_query_threshold,
+        # EXPLAIN ANALYZE re-runs the query, so keep it out of production
+        explain_slow_queries=_app_settings.dev_mode
+        and _db_settings.explain_slow_queries,
+    ),
+)
+
+_session_factory = create_async_session_factory(
+    engine, SessionTimeouts(**_db_settings.timeouts.model_dump())
+)
+
+# For the long-running work, which may outlive the request handlers
+_background_session_factory = create_async_session_factory(
+    engine, SessionTimeouts(**_db_settings.background_timeouts.model_dump())
+)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with _session_factory() as session:
         yield session
+
+
+def get_session_factory() -> AsyncSessionMaker:
+    return _session_factory
+
+
+def get_background_session_factory() -> AsyncSessionMaker:
+    return _background_session_factory
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+
+_logger = logging.getLogger(__name__)
+
+_RETRY_DELAY = 1
+
+
+class Broadcaster:
+    def __init__(self, redis: Redis | None = None, queue_size: int = 16):
+        self._redis = redis
+        self._pubsub = redis.pubsub() if redis else None
+        self._queue_size = queue_size
+        self._queues: dict[str, set[asyncio.Queue[bytes]]] = {}
+        self._listener: asyncio.Task[None] | None = None
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        if not self._redis:
+            self._dispatch(channel, message)
+            return
+        # The messages are published after the changes have been committed, so
+        # losing one mustn't fail the request which made them
+        try:
+            await self._redis.publish(channel, message)
+        except RedisError:
+            _logger.exception("Failed to publish a message to the channel %r", channel)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[AsyncIterator[bytes]]:
+        queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=self._queue_size)
+        queues = self._queues.setdefault(channel, set())
+        queues.add(queue)
+        try:
+            # The process subscribes to every channel in Redis only once, however
+            # many local subscribers it has
+            if len(queues) == 1:
+                await self._subscribe(channel)
+            yield _read_messages(queue)
+        finally:
+            queues.discard(queue)
+            if not queues:
+                del self._queues[channel]
+                await self._unsubscribe(channel)
+
+    async def close(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+        if self._pubsub:
+            await self._pubsub.aclose()  # type: ignore[no-untyped-call]
+        if self._redis:
+            await self._redis.aclose()
+
+    async def _subscribe(self, channel: str) -> None:
+        if not self._pubsub:
+            return
+        await self._pubsub.subscribe(channel)
+        if not self._listener:
+            self._listener = asyncio.create_task(self._listen(self._pubsub))
+
+    async def _unsubscribe(self, channel: str) -> None:
+        if not self._pubsub:
+            return
+        await self._pubsub.unsubscribe(channel)
+        # Someone may have subscribed again while the channel was being unsubscribed
+        if channel in self._queues:
+            await self._pubsub.subscribe(channel)
+
+    async def _listen(self, pubsub: PubSub) -> None:
+        while True:
+            try:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=None
+                )
+            except RedisError:
+                # The client reconnects and restores the subscriptions on its own
+                _logger.exception("Failed to receive a message from Redis")
+                await asyncio.sleep(_RETRY_DELAY)
+                continue
+            if message:
+                self._dispatch(message["channel"].decode(), message["data"])
+
+    def _dispatch(self, channel: str, message: bytes) -> None:
+        for queue in self._queues.get(channel, ()):
+            if queue.full():
+                # A slow subscriber loses its oldest messages rather than holding
+                # up the others
+                queue.get_nowait()
+                _logger.warning("Dropped a message from the channel %r", channel)
+            queue.put_nowait(message)
+
+
+async def _read_messages(queue: asyncio.Queue[bytes]) -> AsyncIterator[bytes]:
+    while True:
+        yield await queue.get()
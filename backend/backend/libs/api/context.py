@@ -1,24 +1,95 @@
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
+from collections.abc import Awaitable, Callable, Collection, Mapping
+from dataclasses import dataclass, field
 from functools import cached_property
-from typing import Any
+from typing import Any, Protocol
+from uuid import UUID
 
 from fastapi import Request, WebSocket
+from starlette.datastructures import Headers
+from strawberry.dataloader import DataLoader
 from strawberry.fastapi import BaseContext
 from strawberry.types import Info as BaseInfo
 
-from backend.libs.db.session import AsyncSession
+from backend.libs.db.session import AsyncSession, AsyncSessionMaker
+from backend.services.user.crud import UserRecord
 from backend.services.user.models import User
 
 
+class RequestWithHeaders(Protocol):
+    @property
+    def headers(self) -> Mapping[Any, str]:
+        ...
+
+
+@dataclass(frozen=True)
+class _ConnectionInitRequest:
+    # Browsers can't set the headers of a WebSocket, so the clients send them in
+    # the connection_init payload instead
+    headers: Mapping[Any, str]
+
+
+class ConnectionNotAuthenticatedError(Exception):
+    pass
+
+
+@dataclass
+class Loaders:
+    user_by_id: DataLoader[UUID, UserRecord | None]
+    # Shared by the operations of a batch, so that the token is verified only once
+    # per request
+    access_token: DataLoader[str, dict[str, Any]]
+
+
 @dataclass
 class Context(BaseContext):
     db: AsyncSession
     _user_fetcher: Callable[[Request | WebSocket | None], Awaitable[User]]
+    _user_columns_fetcher: Callable[
+        [RequestWithHeaders | None, Collection[str]], Awaitable[dict[str, Any]]
+    ]
+    # Created for every request, so that the cached values are never shared
+    loaders: Loaders
+    # For the operations which run next to each other, as a session can't run
+    # statements concurrently
+    session_factory: AsyncSessionMaker
+    _connection_user_id: UUID | None = None
+    _user_columns: dict[str, Any] = field(default_factory=dict)
 
     @cached_property
     async def user(self) -> User:
         return await self._user_fetcher(self.request)
 
+    # Read-only alternative to the user which skips the ORM on the hot path and
+    # reads only the requested columns
+    async def get_user_columns(self, columns: Collection[str]) -> dict[str, Any]:
+        # The columns already read by the operation, e.g. along with its ETag, are
+        # reused instead of reading the row again
+        missing_columns = [
+            column for column in columns if column not in self._user_columns
+        ]
+        if missing_columns or not self._user_columns:
+            self._user_columns |= await self._user_columns_fetcher(
+                self.request, missing_columns
+            )
+        return {column: self._user_columns[column] for column in ("id", *columns)}
+
+    async def authenticate_connection(self, params: Mapping[str, Any]) -> None:
+        headers = Headers(
+            {key: value for key, value in params.items() if isinstance(value, str)}
+        )
+        user_columns = await self._user_columns_fetcher(
+            _ConnectionInitRequest(headers), ["id"]
+        )
+        self._connection_user_id = user_columns["id"]
+
+    # The WebSocket connections are authenticated once, when they're initialised,
+    # so that the subscriptions never read the user, nor hold a database
+    # connection, themselves
+    def get_connection_user_id(self) -> UUID:
+        if self._connection_user_id is None:
+            msg = "The connection hasn't been authenticated"
+            raise ConnectionNotAuthenticatedError(msg)
+        return self._connection_user_id
+
 
 Info = BaseInfo[Context, Any]
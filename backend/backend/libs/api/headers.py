@@ -14,3 +14,16 @@ def read_bearer_token(headers: Mapping[Any, str]) -> str:
     if scheme.lower() != "bearer":
         raise BearerTokenNotFoundError
     return param
+
+
+def matches_etag(headers: Mapping[Any, str], etag: str) -> bool:
+    if_none_match = headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so the weakness indicators are ignored
+    return any(
+        tag.strip().removeprefix("W/") == etag.removeprefix("W/")
+        for tag in if_none_match.split(",")
+    )
@@ -0,0 +1,19 @@
+import secrets
+from collections.abc import Mapping
+from typing import Any
+
+from backend.libs.api.headers import BearerTokenNotFoundError, read_bearer_token
+
+
+class InvalidAPIKeyError(Exception):
+    pass
+
+
+def validate_api_key(headers: Mapping[Any, str], api_key: str | None) -> None:
+    try:
+        token = read_bearer_token(headers)
+    except BearerTokenNotFoundError as exc:
+        raise InvalidAPIKeyError from exc
+    # An unset key disables the access completely
+    if not api_key or not secrets.compare_digest(token, api_key):
+        raise InvalidAPIKeyError
@@ -0,0 +1,149 @@
+from collections import defaultdict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLSchema,
+    OperationDefinitionNode,
+    ValidationContext,
+    ValidationRule,
+    validate,
+)
+
+_Definition = OperationDefinitionNode | FragmentDefinitionNode
+
+
+class _CostRule(ValidationRule):
+    field_costs: Mapping[str, int]
+    default_cost: int
+
+    def __init__(self, context: ValidationContext):
+        super().__init__(context)
+        self._definition: _Definition | None = None
+        self._costs: dict[str, int] = defaultdict(int)
+        self._spreads: dict[str, list[str]] = defaultdict(list)
+
+    def enter_operation_definition(
+        self, node: OperationDefinitionNode, *_: Any
+    ) -> None:
+        self._definition = node
+
+    def enter_fragment_definition(self, node: FragmentDefinitionNode, *_: Any) -> None:
+        self._definition = node
+
+    def enter_field(self, node: FieldNode, *_: Any) -> None:
+        # Every alias of a field is resolved separately, so it's counted as well
+        parent_type = self.context.get_parent_type()
+        name = f"{parent_type.name if parent_type else ''}.{node.name.value}"
+        self._costs[self._get_key()] += self.field_costs.get(name, self.default_cost)
+
+    def enter_fragment_spread(self, node: FragmentSpreadNode, *_: Any) -> None:
+        self._spreads[self._get_key()].append(node.name.value)
+
+    def leave_document(self, node: DocumentNode, *_: Any) -> None:
+        for definition in node.definitions:
+            if isinstance(definition, OperationDefinitionNode):
+                cost = self._get_cost(self._get_key(definition), set())
+                self.check_cost(definition, cost)
+
+    def check_cost(self, definition: OperationDefinitionNode, cost: int) -> None:
+        raise NotImplementedError
+
+    def _get_cost(self, key: str, visited: set[str]) -> int:
+        # The cycles of fragments are reported by another rule
+        if key in visited:
+            return 0
+        visited = visited | {key}
+        return self._costs[key] + sum(
+            self._get_cost(f"fragment:{name}", visited) for name in self._spreads[key]
+        )
+
+    def _get_key(self, definition: _Definition | None = None) -> str:
+        definition = definition or self._definition
+        if isinstance(definition, FragmentDefinitionNode):
+            return f"fragment:{definition.name.value}"
+        return f"operation:{id(definition)}"
+
+
+class _CostLimitRule(_CostRule):
+    max_cost: int
+
+    def check_cost(self, definition: OperationDefinitionNode, cost: int) -> None:
+        if cost > self.max_cost:
+            name = definition.name.value if definition.name else "anonymous"
+            msg = (
+                f"Operation {name!r} has a cost of {cost}, "
+                f"which exceeds the maximum cost of {self.max_cost}"
+            )
+            self.report_error(GraphQLError(msg, definition))
+
+
+class _CostCollector(_CostRule):
+    costs: dict[str | None, int]
+
+    def check_cost(self, definition: OperationDefinitionNode, cost: int) -> None:
+        self.costs[definition.name.value if definition.name else None] = cost
+
+
+@dataclass
+class CostLimit:
+    max_cost: int
+    field_costs: Mapping[str, int]
+    default_cost: int = 1
+
+    def get_cost(
+        self, schema: GraphQLSchema, document: DocumentNode, operation_name: str | None
+    ) -> int:
+        costs: dict[str | None, int] = {}
+        collector = type(
+            "CostCollector",
+            (_CostCollector,),
+            {
+                "field_costs": self.field_costs,
+                "default_cost": self.default_cost,
+                "costs": costs,
+            },
+        )
+        validate(schema, document, [collector])
+        # Only the selected operation is executed, which may be the only one
+        if operation_name is None:
+            return sum(costs.values())
+        return costs.get(operation_name, 0)
+
+
+def create_cost_limit_rule(
+    max_cost: int, field_costs: Mapping[str, int], default_cost: int = 1
+) -> type[ValidationRule]:
+    return type(
+        "CostLimitRule",
+        (_CostLimitRule,),
+        {
+            "max_cost": max_cost,
+            "field_costs": field_costs,
+            "default_cost": default_cost,
+        },
+    )
+
+
+class ConnectionLimiter:
+    def __init__(self, max_connections: int):
+        self._max_connections = max_connections
+        self._connections = 0
+
+    def __len__(self) -> int:
+        return self._connections
+
+    def acquire(self) -> bool:
+        if self._connections >= self._max_connections:
+            return False
+        self._connections += 1
+        return True
+
+    def release(self) -> None:
+        self._connections -= 1
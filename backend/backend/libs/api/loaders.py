@@ -0,0 +1,31 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import TypeVar
+
+from strawberry.dataloader import DataLoader
+
+_Key = TypeVar("_Key", bound=Hashable)
+_Value = TypeVar("_Value")
+
+
+def create_loader(
+    values_reader: Callable[[Sequence[_Key]], Awaitable[Sequence[_Value]]],
+    key_getter: Callable[[_Value], _Key],
+) -> DataLoader[_Key, _Value | None]:
+    async def load(keys: list[_Key]) -> list[_Value | None]:
+        # The values are returned in any order and without the missing keys, while
+        # the loader expects a value for every key in the order of the keys
+        values = {key_getter(value): value for value in await values_reader(keys)}
+        return [values.get(key) for key in keys]
+
+    return DataLoader(load_fn=load)
+
+
+def create_cached_loader(
+    value_reader: Callable[[_Key], Awaitable[_Value]],
+) -> DataLoader[_Key, _Value]:
+    async def load(keys: list[_Key]) -> list[_Value | BaseException]:
+        # The failures are cached too, so that they're raised for every load
+        return await asyncio.gather(*map(value_reader, keys), return_exceptions=True)
+
+    return DataLoader(load_fn=load)
@@ -0,0 +1,16 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.libs.db.engine import track_queries
+
+
+class QueryTrackingMiddleware:
+    def __init__(self, app: ASGIApp, query_budget: int | None = None):
+        self._app = app
+        self._query_budget = query_budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+        with track_queries(self._query_budget):
+            await self._app(scope, receive, send)
@@ -0,0 +1,131 @@
+import hashlib
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import timedelta
+from typing import Any
+
+from redis.asyncio import Redis
+
+_SUPPORTED_VERSION = 1
+
+PERSISTED_QUERY_KEY_PREFIX = "persisted-query:"
+# The allow-list is kept apart, so that the queries sent by the clients before it
+# was enabled are never allowed
+ALLOWED_QUERY_KEY_PREFIX = "allowed-query:"
+
+
+class PersistedQueryError(Exception):
+    message = "PersistedQueryError"
+    code = "PERSISTED_QUERY_ERROR"
+
+
+class PersistedQueryNotFoundError(PersistedQueryError):
+    # The message expected by the clients to retry with the full query
+    message = "PersistedQueryNotFound"
+    code = "PERSISTED_QUERY_NOT_FOUND"
+
+
+class PersistedQueryNotAllowedError(PersistedQueryError):
+    message = "PersistedQueryNotAllowed"
+    code = "PERSISTED_QUERY_NOT_ALLOWED"
+
+
+class InvalidPersistedQueryError(PersistedQueryError):
+    message = "PersistedQueryInvalid"
+    code = "PERSISTED_QUERY_INVALID"
+
+
+class PersistedQueryStore:
+    def __init__(
+        self,
+        redis: Redis | None = None,
+        cache_size: int = 1000,
+        ttl: timedelta | None = None,
+        key_prefix: str = PERSISTED_QUERY_KEY_PREFIX,
+    ):
+        self._redis = redis
+        self._cache_size = cache_size
+        self._ttl = ttl
+        self._key_prefix = key_prefix
+        self._cache: OrderedDict[str, str] = OrderedDict()
+
+    async def get(self, query_hash: str) -> str | None:
+        if (query := self._cache.get(query_hash)) is not None:
+            self._cache.move_to_end(query_hash)
+            return query
+        if not self._redis:
+            return None
+        stored_query = await self._redis.get(self._key_prefix + query_hash)
+        if stored_query is None:
+            return None
+        query = (
+            stored_query.decode() if isinstance(stored_query, bytes) else stored_query
+        )
+        self._cache_query(query_hash, query)
+        return query
+
+    async def add(self, query_hash: str, query: str, expire: bool = True) -> None:
+        self._cache_query(query_hash, query)
+        if self._redis:
+            await self._redis.set(
+                self._key_prefix + query_hash, query, ex=self._ttl if expire else None
+            )
+
+    async def close(self) -> None:
+        if self._redis:
+            await self._redis.aclose()
+
+    def _cache_query(self, query_hash: str, query: str) -> None:
+        self._cache[query_hash] = query
+        self._cache.move_to_end(query_hash)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+
+def hash_query(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+async def resolve_persisted_query(
+    query: str | None,
+    extensions: Mapping[str, Any] | None,
+    store: PersistedQueryStore,
+    allow_list_only: bool = False,
+) -> str | None:
+    query_hash = _read_query_hash(extensions)
+    if query_hash is None:
+        if allow_list_only and query is not None:
+            return await _get_allowed_query(hash_query(query), store)
+        return query
+    if query is None:
+        if allow_list_only:
+            return await _get_allowed_query(query_hash, store)
+        if (stored_query := await store.get(query_hash)) is None:
+            raise PersistedQueryNotFoundError
+        return stored_query
+    if hash_query(query) != query_hash:
+        raise InvalidPersistedQueryError
+    if allow_list_only:
+        return await _get_allowed_query(query_hash, store)
+    await store.add(query_hash, query)
+    return query
+
+
+def _read_query_hash(extensions: Mapping[str, Any] | None) -> str | None:
+    persisted_query = (extensions or {}).get("persistedQuery")
+    if persisted_query is None:
+        return None
+    if (
+        not isinstance(persisted_query, Mapping)
+        or persisted_query.get("version") != _SUPPORTED_VERSION
+        or not isinstance(query_hash := persisted_query.get("sha256Hash"), str)
+    ):
+        raise InvalidPersistedQueryError
+    return query_hash
+
+
+async def _get_allowed_query(query_hash: str, store: PersistedQueryStore) -> str:
+    # Only the queries registered up front can be executed
+    if (query := await store.get(query_hash)) is None:
+        raise PersistedQueryNotAllowedError
+    return query
@@ -0,0 +1,59 @@
+from typing import Any
+
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLInterfaceType,
+    GraphQLResolveInfo,
+    GraphQLUnionType,
+    InlineFragmentNode,
+    NamedTypeNode,
+    SelectionSetNode,
+)
+from strawberry.types import Info
+
+
+def get_selected_field_names(info: Info[Any, Any], type_name: str) -> set[str]:
+    # The AST is walked directly, because the selections converted by Strawberry
+    # lose the fragments without a type condition. The skip and include directives
+    # are ignored, as reading the columns of a skipped field is harmless.
+    raw_info = info._raw_info
+    names: set[str] = set()
+    for field_node in raw_info.field_nodes:
+        if field_node.selection_set:
+            _collect_field_names(field_node.selection_set, raw_info, type_name, names)
+    return names
+
+
+def _collect_field_names(
+    selection_set: SelectionSetNode,
+    info: GraphQLResolveInfo,
+    type_name: str,
+    names: set[str],
+) -> None:
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            names.add(selection.name.value)
+        elif isinstance(selection, InlineFragmentNode):
+            if _matches_type_condition(selection.type_condition, info, type_name):
+                _collect_field_names(selection.selection_set, info, type_name, names)
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = info.fragments[selection.name.value]
+            if _matches_type_condition(fragment.type_condition, info, type_name):
+                _collect_field_names(fragment.selection_set, info, type_name, names)
+
+
+def _matches_type_condition(
+    type_condition: NamedTypeNode | None, info: GraphQLResolveInfo, type_name: str
+) -> bool:
+    if type_condition is None or type_condition.name.value == type_name:
+        return True
+    # The fragments on the other members of a union are never resolved, while
+    # the ones on its interfaces and unions are
+    condition_type = info.schema.get_type(type_condition.name.value)
+    object_type = info.schema.get_type(type_name)
+    return (
+        isinstance(condition_type, GraphQLInterfaceType | GraphQLUnionType)
+        and object_type is not None
+        and info.schema.is_sub_type(condition_type, object_type)
+    )
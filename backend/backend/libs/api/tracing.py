@@ -0,0 +1,61 @@
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import Any
+
+DURATION_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self._buckets = buckets
+        # The last count is for the values above the highest bucket
+        self._counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        # The buckets are cumulative, in the same way as in Prometheus
+        buckets = {}
+        total = 0
+        for bucket, count in zip(self._buckets, self._counts, strict=False):
+            total += count
+            buckets[str(bucket)] = total
+        buckets["+Inf"] = self.count
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
+
+
+class Histograms:
+    def __init__(self, buckets: Sequence[float]):
+        self._buckets = buckets
+        self._histograms: dict[str, Histogram] = {}
+
+    def observe(self, name: str, value: float) -> None:
+        if not (histogram := self._histograms.get(name)):
+            histogram = self._histograms[name] = Histogram(self._buckets)
+        histogram.observe(value)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: histogram.snapshot()
+            for name, histogram in sorted(self._histograms.items())
+        }
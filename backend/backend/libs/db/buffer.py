@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import Update, column, func, update, values
+from sqlalchemy.orm import InstrumentedAttribute
+
+from backend.libs.db.session import AsyncSession, AsyncSessionMaker
+
+_logger = logging.getLogger(__name__)
+
+
+class LatestValueBuffer:
+    def __init__(
+        self, key: InstrumentedAttribute[Any], column_: InstrumentedAttribute[Any]
+    ):
+        self._key = key
+        self._column = column_
+        self._values: dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, key: Hashable, value: Any) -> None:
+        current_value = self._values.get(key)
+        if current_value is None or value > current_value:
+            self._values[key] = value
+
+    async def flush(self, db: AsyncSession) -> int:
+        if not self._values:
+            return 0
+        buffered_values, self._values = self._values, {}
+        try:
+            await db.execute(self._build_update_statement(buffered_values))
+            await db.commit()
+        except BaseException:
+            # Keep the values for the next flush, unless they have been superseded
+            for key, value in buffered_values.items():
+                self.add(key, value)
+            raise
+        return len(buffered_values)
+
+    def _build_update_statement(self, buffered_values: dict[Hashable, Any]) -> Update:
+        rows = values(
+            column("key", self._key.type),
+            column("value", self._column.type),
+            name="buffered",
+        ).data(list(buffered_values.items()))
+        # Multiple processes may flush their values out of order, so never move the
+        # stored values backwards
+        return (
+            update(self._key.class_)
+            .where(self._key == rows.c.key)
+            .values({self._column: func.greatest(self._column, rows.c.value)})
+        )
+
+
+@asynccontextmanager
+async def periodic_flush(
+    buffer: LatestValueBuffer, session_factory: AsyncSessionMaker, interval: timedelta
+) -> AsyncIterator[None]:
+    task = asyncio.create_task(_flush_periodically(buffer, session_factory, interval))
+    try:
+        yield
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        # Don't lose the values buffered since the last flush
+        await _flush(buffer, session_factory)
+
+
+async def _flush_periodically(
+    buffer: LatestValueBuffer, session_factory: AsyncSessionMaker, interval: timedelta
+) -> None:
+    while True:
+        await asyncio.sleep(interval.total_seconds())
+        await _flush(buffer, session_factory)
+
+
+async def _flush(buffer: LatestValueBuffer, session_factory: AsyncSessionMaker) -> None:
+    try:
+        async with session_factory() as db:
+            flushed = await buffer.flush(db)
+    except Exception:
+        _logger.exception("Failed to flush %d buffered values", len(buffer))
+        return
+    if flushed:
+        _logger.debug("Flushed %d buffered values", flushed)
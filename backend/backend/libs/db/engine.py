@@ -1,13 +1,303 @@
-from sqlalchemy.engine import URL
-from sqlalchemy.ext.asyncio import AsyncEngine
+import asyncio
+import logging
+import re
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, Connection, ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
 from sqlalchemy.ext.asyncio import create_async_engine as aio_create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
 __all__ = ["AsyncEngine"]
 
+_logger = logging.getLogger(__name__)
+
+_QUERY_START_TIMES_KEY = "query_start_times"
+_SLOW_QUERY_THRESHOLD_KEY = "slow_query_threshold"
+_EXPLAIN_SAVEPOINT = "explain_slow_query"
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(NO\s+KEY\s+|KEY\s+)?(UPDATE|SHARE)\b", re.I)
+
+
+@dataclass
+class EngineProfile:
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: timedelta = timedelta(seconds=30)
+    pool_pre_ping: bool = True
+    pool_recycle: timedelta | None = timedelta(minutes=30)
+    statement_cache_size: int = 100
+    server_settings: Mapping[str, str] = field(default_factory=dict)
+    pgbouncer: bool = False
+
+
+@dataclass
+class PoolStats:
+    size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    wait_time: float
+
+
+@dataclass
+class QueryInstrumentation:
+    slow_query_threshold: timedelta = timedelta(milliseconds=200)
+    explain_slow_queries: bool = False
+
+
+@dataclass
+class QueryStats:
+    budget: int | None = None
+    count: int = 0
+    duration: float = 0.0
+    slow_count: int = 0
+    # The queries are also counted by the scope the tracking is nested in
+    parent: "QueryStats | None" = field(default=None, repr=False)
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
 
-def create_async_engine(url: URL) -> AsyncEngine:
-    return aio_create_async_engine(url)
+
+class _TimedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_time = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkouts += 1
+            self.wait_time += time.perf_counter() - start_time
+
+
+def create_async_engine(
+    url: URL,
+    profile: EngineProfile | None = None,
+    instrumentation: QueryInstrumentation | None = None,
+) -> AsyncEngine:
+    profile = profile or EngineProfile()
+    pool_recycle = profile.pool_recycle.total_seconds() if profile.pool_recycle else -1
+    engine = aio_create_async_engine(
+        url,
+        poolclass=_TimedQueuePool,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.pool_timeout.total_seconds(),
+        pool_pre_ping=profile.pool_pre_ping,
+        pool_recycle=pool_recycle,
+        connect_args=_get_connect_args(profile),
+    )
+    if instrumentation:
+        instrument_engine(engine, instrumentation)
+    return engine
+
+
+def _get_connect_args(profile: EngineProfile) -> dict[str, Any]:
+    connect_args: dict[str, Any] = {"server_settings": dict(profile.server_settings)}
+    if profile.pgbouncer:
+        # PgBouncer in the transaction mode may run consecutive statements on
+        # different server connections, so prepared statements can't be reused
+        connect_args |= {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _get_unique_statement_name,
+        }
+    else:
+        connect_args["statement_cache_size"] = profile.statement_cache_size
+    return connect_args
+
+
+def _get_unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
 
 
 async def dispose_async_engine(engine: AsyncEngine) -> None:
     await engine.dispose()
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    # Hold all the connections at once, otherwise the pool would reuse the first one
+    conns = [engine.connect() for _ in range(connections)]
+    try:
+        results = await asyncio.gather(
+            *(conn.start() for conn in conns), return_exceptions=True
+        )
+    finally:
+        # Also returned to the pool if the warm-up is cancelled
+        await asyncio.gather(
+            *(conn.close() for conn in conns if conn.sync_connection is not None)
+        )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+def get_pool_stats(engine: AsyncEngine) -> PoolStats:
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, _TimedQueuePool):
+        msg = "The engine must be created with the create_async_engine function"
+        raise TypeError(msg)
+    return PoolStats(
+        size=pool.size(),
+        max_overflow=pool._max_overflow,
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+        checkouts=pool.checkouts,
+        wait_time=pool.wait_time,
+    )
+
+
+def instrument_engine(
+    engine: AsyncEngine, instrumentation: QueryInstrumentation
+) -> None:
+    slow_query_threshold = instrumentation.slow_query_threshold.total_seconds()
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def connect(
+        dbapi_connection: Any,  # noqa: ARG001
+        connection_record: ConnectionPoolEntry,
+    ) -> None:
+        # Read by the queries executed directly on the driver connection
+        connection_record.info[_SLOW_QUERY_THRESHOLD_KEY] = slow_query_threshold
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn: Connection, *_: Any) -> None:
+        conn.info.setdefault(_QUERY_START_TIMES_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(exception_context: ExceptionContext) -> None:
+        # The failed queries never reach after_cursor_execute, which would otherwise
+        # pop their start times
+        conn = exception_context.connection
+        if conn is not None and (start_times := conn.info.get(_QUERY_START_TIMES_KEY)):
+            start_times.pop()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(  # noqa: PLR0913
+        conn: Connection,
+        cursor: Any,  # noqa: ARG001
+        statement: str,
+        parameters: Any,
+        context: Any,  # noqa: ARG001
+        executemany: bool,
+    ) -> None:
+        duration = time.perf_counter() - conn.info[_QUERY_START_TIMES_KEY].pop()
+        is_slow = duration >= slow_query_threshold
+        _record_query(statement, duration, is_slow)
+        if not is_slow:
+            return
+        _logger.warning(
+            "Slow query (%.1f ms): %s, parameters: %s",
+            duration * 1000,
+            statement,
+            _redact_parameters(parameters, executemany),
+        )
+        if instrumentation.explain_slow_queries:
+            _explain_query(conn, statement, parameters)
+
+
+@contextmanager
+def track_driver_query(conn: AsyncConnection, statement: str) -> Iterator[None]:
+    # The queries executed directly on the driver connection skip the events of
+    # the engine, so they are recorded here instead
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        # Recorded only on the instrumented engines, just like the other queries
+        if (threshold := conn.info.get(_SLOW_QUERY_THRESHOLD_KEY)) is not None:
+            duration = time.perf_counter() - start_time
+            _record_query(statement, duration, duration >= threshold)
+
+
+def _record_query(statement: str, duration: float, is_slow: bool) -> None:
+    stats = _query_stats.get()
+    while stats:
+        stats.count += 1
+        stats.duration += duration
+        stats.slow_count += is_slow
+        if stats.budget is not None and stats.count == stats.budget + 1:
+            _logger.warning(
+                "Query budget of %d exceeded, possible N+1 query: %s",
+                stats.budget,
+                statement,
+            )
+        stats = stats.parent
+
+
+def _redact_parameters(parameters: Any, executemany: bool) -> Any:
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, Mapping):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, Sequence):
+        return tuple(_redact_value(value) for value in parameters)
+    return parameters
+
+
+def _redact_value(value: Any) -> str:
+    return f"<{type(value).__name__}>"
+
+
+def _explain_query(conn: Connection, statement: str, parameters: Any) -> None:
+    # EXPLAIN ANALYZE executes the statement again, so only plain reads are safe
+    if not _is_plain_read(statement):
+        return
+    cursor = conn.connection.dbapi_connection.cursor()  # type: ignore[union-attr]
+    try:
+        # Runs in a savepoint, so that a failure doesn't abort the transaction of
+        # the caller
+        cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        finally:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+    except Exception:
+        _logger.exception("Failed to explain the slow query")
+        return
+    finally:
+        cursor.close()
+    _logger.warning("Slow query plan:\n%s", plan)
+
+
+def _is_plain_read(statement: str) -> bool:
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return False
+    # The locking reads would wait for the locks again, or lock other rows
+    return not _LOCKING_CLAUSE.search(statement)
+
+
+@contextmanager
+def track_queries(budget: int | None = None) -> Iterator[QueryStats]:
+    stats = QueryStats(budget=budget, parent=_query_stats.get())
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+        _logger.debug(
+            "Executed %d queries in %.1f ms (%d slow)",
+            stats.count,
+            stats.duration * 1000,
+            stats.slow_count,
+        )
+
+
+def get_query_stats() -> QueryStats | None:
+    return _query_stats.get()
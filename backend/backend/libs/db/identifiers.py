@@ -0,0 +1,84 @@
+import os
+import threading
+import time
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import DDL
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import expression
+from sqlalchemy.types import Uuid
+
+_MAX_COUNTER = 0xFFF
+
+_lock = threading.Lock()
+_last_timestamp = 0
+_counter = 0
+
+
+def uuid7() -> UUID:
+    global _last_timestamp, _counter  # noqa: PLW0603
+    with _lock:
+        timestamp = time.time_ns() // 1_000_000
+        if timestamp > _last_timestamp:
+            _last_timestamp = timestamp
+            # Start from a random value in the lower half to leave room for increments
+            _counter = int.from_bytes(os.urandom(2)) & (_MAX_COUNTER >> 1)
+        elif _counter < _MAX_COUNTER:
+            _counter += 1
+        else:
+            # Borrow the next millisecond to keep the ids monotonic
+            _last_timestamp += 1
+            _counter = 0
+        timestamp, counter = _last_timestamp, _counter
+    value = (
+        (timestamp & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | int.from_bytes(os.urandom(8)) & 0x3FFFFFFFFFFFFFFF
+    )
+    return UUID(int=value)
+
+
+class uuid_generate_v7(expression.FunctionElement[Any]):  # noqa: N801
+    type = Uuid()
+    inherit_cache = True
+
+
+@compiles(uuid_generate_v7, "postgresql")  # type: ignore[no-untyped-call, misc]
+def pg_uuid_generate_v7(  # type: ignore[no-untyped-def]
+    element, compiler, **kw  # noqa: ARG001
+) -> str:
+    return "uuid_generate_v7()"
+
+
+# Replaces the version bits of a random UUID and overlays its first 48 bits with
+# the Unix timestamp in milliseconds
+create_uuid_generate_v7_function = DDL(  # type: ignore[no-untyped-call]
+    """
+    CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(
+                        int8send(
+                            floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint
+                        )
+                        FROM 3
+                    )
+                    FROM 1 FOR 6
+                ),
+                52,
+                1
+            ),
+            53,
+            1
+        ),
+        'hex'
+    )::uuid
+    $$ LANGUAGE sql VOLATILE
+    """
+)
@@ -0,0 +1,227 @@
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import timedelta
+
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+_logger = logging.getLogger(__name__)
+
+# Created by the backfills themselves, so it has no model
+BACKFILL_CHECKPOINT_TABLE = "alembic_backfill_checkpoint"
+
+# The batch, the update and the checkpoint are a single statement, so they are
+# committed atomically even in the autocommit mode
+_BATCH_STATEMENT = """
+    WITH batch AS (
+        SELECT {key} FROM {table}
+        WHERE CAST(:last_key AS varchar) IS NULL
+            OR {key} > CAST(:last_key AS {key_type})
+        ORDER BY {key}
+        LIMIT :batch_size
+    ),
+    last AS (
+        SELECT {key} FROM batch ORDER BY {key} DESC LIMIT 1
+    ),
+    updated AS (
+        UPDATE {table} SET {assignments}
+        FROM batch WHERE {table}.{key} = batch.{key} AND ({where})
+        RETURNING 1
+    ),
+    checkpoint AS (
+        INSERT INTO alembic_backfill_checkpoint (name, last_key)
+        SELECT CAST(:name AS varchar), CAST({key} AS varchar) FROM last
+        ON CONFLICT (name) DO UPDATE SET last_key = excluded.last_key
+    )
+    SELECT
+        (SELECT CAST({key} AS varchar) FROM last),
+        (SELECT count(*) FROM updated)
+"""
+
+
+@dataclass
+class BackfillThrottle:
+    batch_size: int = 1000
+    pause: timedelta = timedelta(milliseconds=100)
+    max_replication_lag: timedelta | None = timedelta(seconds=5)
+    replication_lag_poll_interval: timedelta = timedelta(seconds=1)
+
+
+def backfill_in_batches(  # noqa: PLR0913
+    name: str,
+    table: str,
+    assignments: str,
+    where: str = "TRUE",
+    key: str = "id",
+    throttle: BackfillThrottle | None = None,
+) -> int:
+    throttle = throttle or BackfillThrottle()
+    # Commit every batch on its own, so that the locks are held only briefly and
+    # the progress survives an interrupted migration
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        _create_checkpoints_table(conn)
+        key_type = _get_type(conn, table, key)
+        statement = text(
+            _build_batch_statement(
+                _quote(conn, table), assignments, where, _quote(conn, key), key_type
+            )
+        )
+        last_key = conn.scalar(
+            text("SELECT last_key FROM alembic_backfill_checkpoint WHERE name = :name"),
+            {"name": name},
+        )
+        if last_key is not None:
+            _logger.info("Resuming backfill %r after %s", name, last_key)
+        total = 0
+        while True:
+            last_key, updated = conn.execute(
+                statement,
+                {"name": name, "last_key": last_key, "batch_size": throttle.batch_size},
+            ).one()
+            if last_key is None:
+                break
+            total += updated
+            _logger.info("Backfill %r updated %d rows, up to %s", name, total, last_key)
+            _throttle(conn, throttle)
+        conn.execute(
+            text("DELETE FROM alembic_backfill_checkpoint WHERE name = :name"),
+            {"name": name},
+        )
+    return total
+
+
+def _create_checkpoints_table(conn: Connection) -> None:
+    conn.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS alembic_backfill_checkpoint "
+            "(name varchar PRIMARY KEY, last_key varchar NOT NULL)"
+        )
+    )
+
+
+def _get_type(conn: Connection, table: str, column: str) -> str:
+    return str(
+        conn.scalar(
+            text(
+                "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+                "WHERE attrelid = CAST(:table AS regclass) AND attname = :column"
+            ),
+            {"table": _quote(conn, table), "column": column},
+        )
+    )
+
+
+def _build_batch_statement(
+    table: str, assignments: str, where: str, key: str, key_type: str
+) -> str:
+    return _BATCH_STATEMENT.format(  # nosec B608
+        table=table, assignments=assignments, where=where, key=key, key_type=key_type
+    )
+
+
+def _throttle(conn: Connection, throttle: BackfillThrottle) -> None:
+    time.sleep(throttle.pause.total_seconds())
+    if throttle.max_replication_lag is None:
+        return
+    while (lag := _get_replication_lag(conn)) > throttle.max_replication_lag:
+        _logger.info("Waiting for the replication lag of %s to decrease", lag)
+        time.sleep(throttle.replication_lag_poll_interval.total_seconds())
+
+
+def _get_replication_lag(conn: Connection) -> timedelta:
+    lag = conn.scalar(text("SELECT max(replay_lag) FROM pg_stat_replication"))
+    return lag or timedelta()
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    where: str | None = None,
+) -> None:
+    # Building an index concurrently can't run inside a transaction
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        create = f"CREATE {'UNIQUE ' if unique else ''}INDEX"
+        definition = _build_index_definition(columns, where)
+        partitions = _get_partitions(conn, table)
+        if not partitions:
+            _drop_invalid_index(conn, name)
+            conn.execute(
+                text(
+                    f"{create} CONCURRENTLY IF NOT EXISTS {_quote(conn, name)} "
+                    f"ON {_quote(conn, table)} {definition}"
+                )
+            )
+            return
+        # Partitioned tables don't support concurrent builds, so the index is built
+        # concurrently on every partition and then attached to the parent index
+        conn.execute(
+            text(
+                f"{create} IF NOT EXISTS {_quote(conn, name)} "
+                f"ON ONLY {_quote(conn, table)} {definition}"
+            )
+        )
+        for partition in partitions:
+            _drop_invalid_index(conn, f"{partition}_{name}")
+            partition_index = _quote(conn, f"{partition}_{name}")
+            conn.execute(
+                text(
+                    f"{create} CONCURRENTLY IF NOT EXISTS {partition_index} "
+                    f"ON {_quote(conn, partition)} {definition}"
+                )
+            )
+            conn.execute(
+                text(
+                    f"ALTER INDEX {_quote(conn, name)} "
+                    f"ATTACH PARTITION {partition_index}"
+                )
+            )
+
+
+def drop_index_concurrently(name: str, table: str) -> None:
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        # Indexes of partitioned tables can only be dropped together with the
+        # partition indexes, which doesn't support the concurrent mode
+        concurrently = "" if _get_partitions(conn, table) else " CONCURRENTLY"
+        conn.execute(text(f"DROP INDEX{concurrently} IF EXISTS {_quote(conn, name)}"))
+
+
+def _drop_invalid_index(conn: Connection, name: str) -> None:
+    # A failed concurrent build leaves an invalid index behind, which would be
+    # otherwise skipped when retrying the migration
+    is_valid = conn.scalar(
+        text(
+            "SELECT indisvalid FROM pg_index "
+            "WHERE indexrelid = to_regclass(CAST(:name AS text))"
+        ),
+        {"name": _quote(conn, name)},
+    )
+    if is_valid is False:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY {_quote(conn, name)}"))
+
+
+def _build_index_definition(columns: Sequence[str], where: str | None) -> str:
+    definition = f"({', '.join(columns)})"
+    return f"{definition} WHERE {where}" if where else definition
+
+
+def _get_partitions(conn: Connection, table: str) -> list[str]:
+    result = conn.scalars(
+        text(
+            "SELECT relname FROM pg_inherits JOIN pg_class ON pg_class.oid = inhrelid "
+            "WHERE inhparent = CAST(:table AS regclass) ORDER BY relname"
+        ),
+        {"table": _quote(conn, table)},
+    )
+    return list(result)
+
+
+def _quote(conn: Connection, identifier: str) -> str:
+    return conn.dialect.identifier_preparer.quote(identifier)
@@ -1,5 +1,11 @@
+from sqlalchemy import event
 from sqlalchemy.orm import DeclarativeBase
 
+from backend.libs.db.identifiers import create_uuid_generate_v7_function
+
 
 class Base(DeclarativeBase):
     pass
+
+
+event.listen(Base.metadata, "before_create", create_uuid_generate_v7_function)
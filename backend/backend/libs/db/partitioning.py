@@ -0,0 +1,33 @@
+from sqlalchemy import DDL, MetaData, Table, event
+
+_HASH_PARTITIONS_KEY = "hash_partitions"
+
+
+def partition_by_hash(table: Table, partitions: int) -> None:
+    table.info[_HASH_PARTITIONS_KEY] = partitions
+    # The parent table itself only declares the partitioning scheme, the rows are
+    # stored in the partitions created right after it
+    for remainder in range(partitions):
+        event.listen(
+            table,
+            "after_create",
+            DDL(  # type: ignore[no-untyped-call]
+                f'CREATE TABLE "{get_hash_partition_name(table.name, remainder)}" '
+                f'PARTITION OF "{table.name}" '
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            ),
+        )
+
+
+def get_hash_partition_name(table_name: str, remainder: int) -> str:
+    return f"{table_name}_p{remainder}"
+
+
+def get_hash_partition_names(metadata: MetaData) -> set[str]:
+    # The partitions aren't tables of the metadata, so the migrations have to
+    # know them to leave them alone
+    return {
+        get_hash_partition_name(table.name, remainder)
+        for table in metadata.tables.values()
+        for remainder in range(table.info.get(_HASH_PARTITIONS_KEY, 0))
+    }
@@ -1,14 +1,130 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, cast
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncSession,
     async_sessionmaker,
 )
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
-from backend.libs.db.engine import AsyncEngine
+from backend.libs.db.engine import AsyncEngine, track_driver_query
 
 __all__ = ["AsyncSession"]
 
 AsyncSessionMaker = async_sessionmaker[AsyncSession]
 
+_TIMEOUTS_KEY = "timeouts"
+
+# query_canceled, lock_not_available, idle_in_transaction_session_timeout
+_TIMEOUT_SQLSTATES = {"57014", "55P03", "25P03"}
+
+
+@dataclass
+class SessionTimeouts:
+    statement_timeout: timedelta | None = None
+    lock_timeout: timedelta | None = None
+    idle_in_transaction_session_timeout: timedelta | None = None
+
+
+class _Session(Session):
+    pass
+
+
+def create_async_session_factory(
+    engine: AsyncEngine, timeouts: SessionTimeouts | None = None
+) -> AsyncSessionMaker:
+    return async_sessionmaker(
+        bind=engine,
+        autoflush=False,
+        sync_session_class=_Session,
+        info={_TIMEOUTS_KEY: timeouts},
+    )
+
+
+async def set_session_timeouts(db: AsyncSession, timeouts: SessionTimeouts) -> None:
+    db.info[_TIMEOUTS_KEY] = timeouts
+    statement = _build_timeouts_statement(timeouts)
+    if db.in_transaction() and statement is not None:
+        await db.execute(statement)
+
+
+@event.listens_for(_Session, "after_begin")
+def _apply_session_timeouts(
+    session: Session, transaction: Any, connection: Connection  # noqa: ARG001
+) -> None:
+    timeouts: SessionTimeouts | None = session.info.get(_TIMEOUTS_KEY)
+    if not timeouts:
+        return
+    statement = _build_timeouts_statement(timeouts)
+    if statement is not None:
+        connection.execute(statement)
+
+
+def _build_timeouts_statement(timeouts: SessionTimeouts) -> Select[Any] | None:
+    settings = {
+        "statement_timeout": timeouts.statement_timeout,
+        "lock_timeout": timeouts.lock_timeout,
+        "idle_in_transaction_session_timeout": (
+            timeouts.idle_in_transaction_session_timeout
+        ),
+    }
+    configs = [
+        func.set_config(name, f"{int(value.total_seconds() * 1000)}ms", True)
+        for name, value in settings.items()
+        if value is not None
+    ]
+    # Set all the timeouts in a single round trip, scoped to the transaction
+    return select(*configs) if configs else None
+
+
+@dataclass
+class DriverConnection:
+    conn: AsyncConnection
+    driver_connection: Any
+
+    async def execute(self, query: str, *args: Any) -> str:
+        with track_driver_query(self.conn, query):
+            return cast(str, await self.driver_connection.execute(query, *args))
+
+    async def fetch(self, query: str, *args: Any) -> list[Any]:
+        with track_driver_query(self.conn, query):
+            return cast(list[Any], await self.driver_connection.fetch(query, *args))
+
+    async def fetchrow(self, query: str, *args: Any) -> Any:
+        with track_driver_query(self.conn, query):
+            return await self.driver_connection.fetchrow(query, *args)
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        with track_driver_query(self.conn, query):
+            return await self.driver_connection.fetchval(query, *args)
+
+    async def copy_records_to_table(self, table_name: str, **kwargs: Any) -> str:
+        with track_driver_query(self.conn, f"COPY {table_name}"):
+            return cast(
+                str,
+                await self.driver_connection.copy_records_to_table(
+                    table_name, **kwargs
+                ),
+            )
+
+
+async def get_driver_connection(db: AsyncSession) -> DriverConnection:
+    conn = await db.connection()
+    raw_conn = await conn.get_raw_connection()
+    return DriverConnection(conn, raw_conn.driver_connection)
+
 
-def create_async_session_factory(engine: AsyncEngine) -> AsyncSessionMaker:
-    return async_sessionmaker(bind=engine, autoflush=False)
+def is_timeout_error(exc: BaseException) -> bool:
+    if isinstance(exc, PoolTimeoutError):
+        return True
+    return (
+        isinstance(exc, DBAPIError)
+        and getattr(exc.orig, "sqlstate", None) in _TIMEOUT_SQLSTATES
+    )
@@ -0,0 +1,15 @@
+from typing import Any
+
+from sqlalchemy import ColumnElement, String, TypeDecorator, func
+
+
+class CaseInsensitiveString(TypeDecorator[str]):
+    impl = String
+    cache_ok = True
+
+    class Comparator(TypeDecorator.Comparator[str]):
+        # Matches the functional lower() indexes, so the comparisons stay index scans
+        def __eq__(self, other: Any) -> ColumnElement[bool]:  # type: ignore[override]
+            return func.lower(self.expr) == func.lower(other)
+
+    comparator_factory = Comparator
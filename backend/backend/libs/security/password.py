@@ -1,3 +1,6 @@
+import asyncio
+from collections.abc import Sequence
+
 from passlib.context import CryptContext
 
 from backend.libs.types.asynchronous import AsyncExecutor
@@ -25,3 +28,11 @@ def hash_password(password: str) -> str:
 
 async def async_hash_password(password: str, executor: AsyncExecutor) -> str:
     return await executor(hash_password, password)
+
+
+async def async_hash_passwords(
+    passwords: Sequence[str], executor: AsyncExecutor
+) -> list[str]:
+    return await asyncio.gather(
+        *(executor(hash_password, password) for password in passwords)
+    )
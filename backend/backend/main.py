@@ -1,35 +1,75 @@
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
 from backend.api.graphql.router import get_router as get_graphql_router
 from backend.api.rest.router import get_router as get_rest_router
+from backend.broadcast import broadcaster
 from backend.config.settings import settings
 from backend.db import engine
+from backend.libs.api.middleware import QueryTrackingMiddleware
+from backend.libs.db.buffer import periodic_flush
 from backend.libs.db.engine import AsyncEngine, dispose_async_engine
+from backend.libs.db.session import create_async_session_factory, is_timeout_error
 from backend.logs import setup_logging
+from backend.services.user.context import last_login_buffer
+from backend.warm_up import get_warm_up_steps, warm_up
 
 _app_settings = settings.app
+_db_settings = settings.db
+_user_settings = settings.user
 
 
 def get_local_app(db_engine: AsyncEngine, debug: bool = False) -> FastAPI:
+    graphql_router = get_graphql_router(debug)
+
     @asynccontextmanager
     async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
         _logging_listener = setup_logging(_app_settings.logging_level)
         _logging_listener.start()
-        yield
+        if _app_settings.warm_up:
+            steps = get_warm_up_steps(
+                db_engine,
+                graphql_router.schema,
+                _app_settings.warm_up_db_connections,
+            )
+            await warm_up(steps, _app_settings.warm_up_timeout)
+        async with periodic_flush(
+            last_login_buffer,
+            create_async_session_factory(db_engine),
+            _user_settings.last_login_flush_interval,
+        ):
+            yield
+        await graphql_router.persisted_query_store.close()
+        await broadcaster.close()
         await dispose_async_engine(db_engine)
         _logging_listener.stop()
 
     local_app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+    local_app.add_middleware(
+        QueryTrackingMiddleware, query_budget=_db_settings.query_budget
+    )
+    local_app.add_exception_handler(DBAPIError, _handle_db_timeout_error)
+    local_app.add_exception_handler(PoolTimeoutError, _handle_db_timeout_error)
 
-    local_app.include_router(get_graphql_router(debug), prefix="/api/graphql")
+    local_app.include_router(graphql_router, prefix="/api/graphql")
     local_app.include_router(get_rest_router(), prefix="/api/rest")
 
     return local_app
 
 
+async def _handle_db_timeout_error(_: Request, exc: Exception) -> ORJSONResponse:
+    if not is_timeout_error(exc):
+        raise exc
+    return ORJSONResponse(
+        {"detail": "Service temporarily unavailable"},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
 def get_app() -> FastAPI:
     return get_local_app(engine, _app_settings.dev_mode)
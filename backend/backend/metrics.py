@@ -0,0 +1,5 @@
+from backend.libs.api.tracing import COUNT_BUCKETS, DURATION_BUCKETS, Histograms
+
+# Shared by all the requests handled by the process
+graphql_durations = Histograms(DURATION_BUCKETS)
+graphql_statements = Histograms(COUNT_BUCKETS)
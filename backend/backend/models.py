@@ -1,6 +1,6 @@
 # Import the models, so that they can be registered in Base.metadata
 # and therefore detected by the Alembic
 from backend.libs.db.model import Base
-from backend.services.user.models import User
+from backend.services.user.models import User, UserEmail
 
-__all__ = ["Base", "User"]
+__all__ = ["Base", "User", "UserEmail"]
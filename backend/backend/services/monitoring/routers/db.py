@@ -0,0 +1,35 @@
+from dataclasses import asdict
+from typing import Any
+
+from fastapi import APIRouter
+
+from backend.db import engine
+from backend.libs.db.engine import get_pool_stats
+
+router = APIRouter()
+
+
+@router.get(
+    "/pool",
+    responses={
+        200: {
+            "description": "Connection pool statistics",
+            "headers": {"Content-Type": "application/json"},
+            "content": {
+                "application/json": {
+                    "example": {
+                        "size": 5,
+                        "max_overflow": 10,
+                        "checked_in": 3,
+                        "checked_out": 2,
+                        "overflow": 0,
+                        "checkouts": 1024,
+                        "wait_time": 0.25,
+                    },
+                }
+            },
+        },
+    },
+)
+async def get_pool_stats_route() -> dict[str, Any]:
+    return asdict(get_pool_stats(engine))
@@ -0,0 +1,43 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from backend.metrics import graphql_durations, graphql_statements
+
+router = APIRouter()
+
+
+@router.get(
+    "",
+    responses={
+        200: {
+            "description": "Histograms of the GraphQL operations",
+            "headers": {"Content-Type": "application/json"},
+            "content": {
+                "application/json": {
+                    "example": {
+                        "durations": {
+                            "parse": {
+                                "buckets": {"0.0005": 98, "0.001": 100, "+Inf": 100},
+                                "count": 100,
+                                "sum": 0.021,
+                            },
+                        },
+                        "statements": {
+                            "operation": {
+                                "buckets": {"0": 10, "1": 100, "+Inf": 100},
+                                "count": 100,
+                                "sum": 90,
+                            },
+                        },
+                    },
+                }
+            },
+        },
+    },
+)
+async def get_graphql_histograms_route() -> dict[str, Any]:
+    return {
+        "durations": graphql_durations.snapshot(),
+        "statements": graphql_statements.snapshot(),
+    }
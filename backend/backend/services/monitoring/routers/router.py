@@ -1,6 +1,10 @@
 from fastapi import APIRouter
 
+from backend.services.monitoring.routers.db import router as db_router
+from backend.services.monitoring.routers.graphql import router as graphql_router
 from backend.services.monitoring.routers.health import router as health_router
 
 router = APIRouter()
 router.include_router(health_router, prefix="/health")
+router.include_router(db_router, prefix="/db")
+router.include_router(graphql_router, prefix="/graphql")
@@ -3,6 +3,8 @@ from functools import partial
 from fastapi.concurrency import run_in_threadpool
 
 from backend.config.settings import settings
+from backend.libs.db.buffer import LatestValueBuffer
+from backend.libs.db.session import SessionTimeouts
 from backend.libs.security.password import (
     async_hash_password,
     async_verify_and_update_password,
@@ -16,7 +18,9 @@ from backend.libs.security.token import (
     read_paseto_token_public_v4,
 )
 from backend.services.user.jinja import load_template
+from backend.services.user.models import User
 
+_db_settings = settings.db
 _user_settings = settings.user
 
 
@@ -43,3 +47,7 @@ password_hasher = hash_password
 async_password_hasher = partial(async_hash_password, executor=run_in_threadpool)
 
 template_loader = load_template
+
+login_session_timeouts = SessionTimeouts(**_db_settings.login_timeouts.model_dump())
+
+last_login_buffer = LatestValueBuffer(User.id, User.last_login)
@@ -1,10 +1,28 @@
-from dataclasses import dataclass
-from datetime import datetime
-from functools import partial
+from collections.abc import AsyncIterator, Collection, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache, partial
+from typing import Any
 from uuid import UUID
 
-from backend.libs.db.crud import CRUD
-from backend.libs.types.unset import UNSET, UnsetType
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    RowMapping,
+    bindparam,
+    delete,
+    func,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from backend.libs.db.crud import CRUD, NoObjectFoundError
+from backend.libs.db.identifiers import uuid7
+from backend.libs.db.session import AsyncSession, get_driver_connection
+from backend.libs.types.unset import UNSET, UnsetType, is_unset
 from backend.services.user.models import User
 
 
@@ -31,3 +49,214 @@ class UserFilters:
 
 
 UserCRUD = partial(CRUD[User, UserCreateData, UserUpdateData, UserFilters], User)
+
+
+@dataclass(frozen=True, slots=True)
+class UserRecord:
+    id: UUID
+    email: str
+    full_name: str
+    confirmed_email: bool
+    updated_at: datetime
+
+
+_ASYNCPG_DIALECT = asyncpg.dialect()  # type: ignore[no-untyped-call]
+_READ_USER_RECORDS_QUERY = (
+    "SELECT id, email, full_name, confirmed_email, updated_at "
+    'FROM "user" WHERE id = ANY($1::uuid[])'
+)
+
+
+async def read_user_columns(
+    db: AsyncSession, user_id: UUID, columns: Collection[str]
+) -> dict[str, Any]:
+    # Skip the ORM and run the prepared statement directly on the asyncpg connection
+    conn = await get_driver_connection(db)
+    query = _get_read_user_columns_query(tuple(_get_user_column_names(columns)))
+    if not (row := await conn.fetchrow(query, user_id)):
+        raise NoObjectFoundError
+    return dict(row)
+
+
+@lru_cache(maxsize=64)
+def _get_read_user_columns_query(columns: tuple[str, ...]) -> str:
+    statement = select(*_get_user_columns(columns)).where(
+        User.id == bindparam("user_id")
+    )
+    return str(statement.compile(dialect=_ASYNCPG_DIALECT))
+
+
+async def update_user_columns(
+    db: AsyncSession, user_id: UUID, data: UserUpdateData, columns: Collection[str]
+) -> dict[str, Any]:
+    values = {
+        field: value for field, value in asdict(data).items() if not is_unset(value)
+    }
+    if not values:
+        return await read_user_columns(db, user_id, columns)
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(values)
+        .returning(*_get_user_columns(columns))
+    )
+    if not (row := result.mappings().one_or_none()):
+        raise NoObjectFoundError
+    await db.commit()
+    return dict(row)
+
+
+def _get_user_columns(names: Collection[str]) -> list[ColumnElement[Any]]:
+    return [User.__table__.c[name] for name in _get_user_column_names(names)]
+
+
+def _get_user_column_names(names: Collection[str]) -> list[str]:
+    # The id is always selected, so that a statement never has an empty column list
+    return list(dict.fromkeys(("id", *names)))
+
+
+async def read_user_records(
+    db: AsyncSession, user_ids: Sequence[UUID]
+) -> list[UserRecord]:
+    conn = await get_driver_connection(db)
+    rows = await conn.fetch(_READ_USER_RECORDS_QUERY, user_ids)
+    return [UserRecord(*row) for row in rows]
+
+
+# Other sessions of the same database role report when their transactions started
+_OLDEST_TRANSACTION_START_QUERY = """
+    SELECT min(xact_start) FROM pg_stat_activity WHERE pid <> pg_backend_pid()
+"""
+
+
+async def read_user_changes(
+    db: AsyncSession,
+    updated_after: datetime,
+    after_id: UUID,
+    limit: int,
+    delay: timedelta,
+) -> list[UserRecord]:
+    # The updated_at of a row is the start of its transaction, so the transactions
+    # still in progress may commit changes older than the ones returned now. They
+    # are held back until the oldest of them ends, which is read by a statement of
+    # its own, so that the ones committed since are visible to the next one.
+    oldest_transaction_start = await db.scalar(text(_OLDEST_TRANSACTION_START_QUERY))
+    result = await db.execute(
+        select(
+            User.id, User.email, User.full_name, User.confirmed_email, User.updated_at
+        )
+        .where(
+            tuple_(User.updated_at, User.id) > (updated_after, after_id),
+            User.updated_at
+            < func.least(
+                func.now() - delay,
+                bindparam(
+                    "oldest_transaction_start",
+                    oldest_transaction_start,
+                    DateTime(timezone=True),
+                ),
+            ),
+        )
+        .order_by(User.updated_at, User.id)
+        .limit(limit)
+    )
+    return [UserRecord(*row) for row in result]
+
+
+USER_EXPORT_FIELDS = (
+    "id",
+    "email",
+    "full_name",
+    "confirmed_email",
+    "last_login",
+    "created_at",
+    "updated_at",
+)
+
+
+async def stream_users(
+    db: AsyncSession, chunk_size: int
+) -> AsyncIterator[Sequence[RowMapping]]:
+    # Fetch the rows through a server-side cursor, so that only a single chunk is
+    # held in memory at a time
+    result = await db.stream(
+        select(
+            *(getattr(User, field) for field in USER_EXPORT_FIELDS)
+        ).execution_options(yield_per=chunk_size)
+    )
+    async for chunk in result.mappings().partitions():
+        yield chunk
+
+
+# The emails are claimed in the lookup table first, so that the ones registered
+# concurrently are skipped instead of failing the whole import
+_INSERT_IMPORTED_USERS_QUERY = """
+    WITH claimed_email AS (
+        INSERT INTO user_email (email, user_id)
+        SELECT lower(email), id FROM user_import
+        ON CONFLICT DO NOTHING
+        RETURNING user_id
+    )
+    INSERT INTO "user" (id, email, hashed_password, full_name, confirmed_email)
+    SELECT id, email, hashed_password, full_name, FALSE FROM user_import
+    JOIN claimed_email ON claimed_email.user_id = user_import.id
+    RETURNING id, email, full_name, confirmed_email, updated_at
+"""
+
+
+async def insert_new_users(
+    db: AsyncSession, data: Sequence[UserCreateData]
+) -> list[UserRecord]:
+    # Load the users into a staging table with COPY and move them with a single
+    # statement, skipping the already registered emails
+    await db.execute(
+        text(
+            "CREATE TEMPORARY TABLE user_import "
+            "(id uuid, email varchar, hashed_password varchar, full_name varchar) "
+            "ON COMMIT DROP"
+        )
+    )
+    conn = await get_driver_connection(db)
+    await conn.copy_records_to_table(
+        "user_import",
+        records=[
+            (uuid7(), item.email, item.hashed_password, item.full_name) for item in data
+        ],
+        columns=["id", "email", "hashed_password", "full_name"],
+    )
+    result = await db.execute(text(_INSERT_IMPORTED_USERS_QUERY))
+    records = [UserRecord(*row) for row in result]
+    await db.commit()
+    return records
+
+
+@dataclass(frozen=True, slots=True, order=True)
+class UserKey:
+    created_at: datetime
+    id: UUID
+
+
+async def delete_unconfirmed_users(
+    db: AsyncSession, created_before: datetime, limit: int, after: UserKey | None
+) -> list[UserKey]:
+    batch = (
+        select(User.id)
+        .where(~User.confirmed_email, User.created_at < created_before)
+        .order_by(User.created_at, User.id)
+        .limit(limit)
+        # Leave the users being confirmed right now alone
+        .with_for_update(skip_locked=True)
+    )
+    if after:
+        # Continue from the last deleted user instead of rescanning the skipped ones
+        batch = batch.where(
+            tuple_(User.created_at, User.id) > (after.created_at, after.id)
+        )
+    result = await db.execute(
+        delete(User)
+        .where(User.id.in_(batch.scalar_subquery()))
+        .returning(User.created_at, User.id)
+    )
+    deleted_keys = [UserKey(*row) for row in result]
+    await db.commit()
+    return deleted_keys
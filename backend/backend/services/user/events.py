@@ -0,0 +1,29 @@
+from collections.abc import Mapping
+from typing import Any
+from uuid import UUID
+
+import orjson
+
+from backend.libs.api.broadcast import Broadcaster
+
+# The events carry the whole user, so that the subscribers never read it again
+USER_EVENT_COLUMNS = ("id", "email", "full_name")
+
+
+def get_user_channel(user_id: UUID) -> str:
+    return f"user:{user_id}"
+
+
+async def publish_user_event(
+    broadcaster: Broadcaster, user_columns: Mapping[str, Any]
+) -> None:
+    event = {column: user_columns[column] for column in USER_EVENT_COLUMNS}
+    # The ids read by asyncpg are its own UUID type, which orjson doesn't know
+    message = orjson.dumps(event, default=str)
+    await broadcaster.publish(get_user_channel(event["id"]), message)
+
+
+def read_user_event(message: bytes) -> dict[str, Any]:
+    event: dict[str, Any] = orjson.loads(message)
+    event["id"] = UUID(event["id"])
+    return event
@@ -1,18 +1,28 @@
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, String, event, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.libs.db.functions import utcnow
+from backend.libs.db.identifiers import uuid7, uuid_generate_v7
 from backend.libs.db.model import Base
+from backend.libs.db.partitioning import partition_by_hash
+from backend.libs.db.types import CaseInsensitiveString
+
+USER_PARTITIONS = 16
 
 
 class User(Base):
     __tablename__ = "user"
+    __table_args__ = ({"postgresql_partition_by": "HASH (id)"},)
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
-    email: Mapped[str] = mapped_column(index=True, unique=True)
+    id: Mapped[UUID] = mapped_column(
+        primary_key=True, default=uuid7, server_default=uuid_generate_v7()
+    )
+    # Unique indexes of partitioned tables have to include the partition key, so
+    # the uniqueness of emails is enforced by the UserEmail lookup table instead
+    email: Mapped[str] = mapped_column(CaseInsensitiveString())
     hashed_password: Mapped[str] = mapped_column(String(128))
     full_name: Mapped[str] = mapped_column(String(128))
     confirmed_email: Mapped[bool] = mapped_column(default=False)
@@ -25,3 +35,59 @@ class User(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=utcnow(), onupdate=utcnow()
     )
+
+
+Index("ix_user_email_lower", func.lower(User.email))
+# Supports the keyset pagination of the change feed
+Index("ix_user_updated_at_id", User.updated_at, User.id)
+# Supports purging the stale unconfirmed users without scanning the confirmed ones
+Index(
+    "ix_user_unconfirmed_created_at",
+    User.created_at,
+    postgresql_where=~User.confirmed_email,
+)
+
+
+class UserEmail(Base):
+    __tablename__ = "user_email"
+
+    # Stored lowercased, so that emails differing only in case are not unique
+    email: Mapped[str] = mapped_column(primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), unique=True
+    )
+
+
+partition_by_hash(User.__table__, USER_PARTITIONS)  # type: ignore[arg-type]
+
+# Keep the lookup table in sync with the user emails, so that the CRUD operations
+# on users don't need to know about it
+event.listen(
+    UserEmail.__table__,
+    "after_create",
+    DDL(  # type: ignore[no-untyped-call]
+        """
+        CREATE OR REPLACE FUNCTION sync_user_email() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                -- The email may have been claimed up front by a bulk import
+                INSERT INTO user_email (email, user_id)
+                VALUES (lower(NEW.email), NEW.id)
+                ON CONFLICT (user_id) DO NOTHING;
+            ELSIF NEW.email IS DISTINCT FROM OLD.email THEN
+                UPDATE user_email SET email = lower(NEW.email) WHERE user_id = NEW.id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    ),
+)
+event.listen(
+    UserEmail.__table__,
+    "after_create",
+    DDL(  # type: ignore[no-untyped-call]
+        'CREATE TRIGGER sync_user_email AFTER INSERT OR UPDATE OF email ON "user" '
+        "FOR EACH ROW EXECUTE FUNCTION sync_user_email()"
+    ),
+)
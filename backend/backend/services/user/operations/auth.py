@@ -1,5 +1,5 @@
 import logging
-from collections.abc import Mapping
+from collections.abc import Collection, Mapping
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
@@ -23,6 +23,8 @@ from backend.services.user.operations.types import (
     AsyncPasswordValidator,
     AsyncTokenCreator,
     AsyncTokenReader,
+    LoginRecorder,
+    UserColumnsReader,
     UserCRUDProtocol,
 )
 from backend.services.user.schemas import CredentialsSchema
@@ -61,10 +63,11 @@ async def login(
     password_manager: PasswordManager,
     tokens_manager: AuthTokensManager,
     crud: UserCRUDProtocol,
+    login_recorder: LoginRecorder,
 ) -> tuple[str, str]:
     user = await _get_authenticated_user(credentials, password_manager, crud)
     _validate_user_email_is_confirmed(user)
-    await _login_user(user, crud)
+    _login_user(user, login_recorder)
     return await _create_auth_tokens(user.id, tokens_manager)
 
 
@@ -120,8 +123,10 @@ def _validate_user_email_is_confirmed(user: User) -> None:
         raise UserEmailNotConfirmedError
 
 
-async def _login_user(user: User, crud: UserCRUDProtocol) -> None:
-    await crud.update_and_refresh(user, UserUpdateData(last_login=datetime.now(UTC)))
+def _login_user(user: User, login_recorder: LoginRecorder) -> None:
+    # The last login is written in batches, so that the login storms don't update
+    # the user rows on every request
+    login_recorder(user.id, datetime.now(UTC))
 
 
 async def _create_auth_tokens(
@@ -151,6 +156,24 @@ async def get_confirmed_user_from_headers(
     return user
 
 
+async def get_confirmed_user_columns_from_headers(
+    headers: Mapping[Any, str],
+    token_reader: AsyncTokenReader,
+    columns_reader: UserColumnsReader,
+    columns: Collection[str],
+) -> dict[str, Any]:
+    token = _read_access_token_from_header(headers)
+    payload = await _read_access_token(token, token_reader)
+    # The confirmation is checked with the same query which reads the columns
+    user_columns = await _get_user_columns_by_id(
+        payload.user_id, [*columns, "confirmed_email"], columns_reader
+    )
+    if not user_columns["confirmed_email"]:
+        _logger.info("Email of the user with id %r not confirmed", payload.user_id)
+        raise UserEmailNotConfirmedError
+    return user_columns
+
+
 def _read_access_token_from_header(headers: Mapping[Any, str]) -> str:
     try:
         return read_bearer_token(headers)
@@ -195,6 +218,16 @@ async def _get_user_by_id(user_id: UUID, crud: UserCRUDProtocol) -> User:
         raise UserNotFoundError from exc
 
 
+async def _get_user_columns_by_id(
+    user_id: UUID, columns: Collection[str], columns_reader: UserColumnsReader
+) -> dict[str, Any]:
+    try:
+        return await columns_reader(user_id, columns)
+    except NoObjectFoundError as exc:
+        _logger.info("User with id %r not found", user_id)
+        raise UserNotFoundError from exc
+
+
 async def refresh_token(
     token: str, token_reader: AsyncTokenReader, token_creator: AsyncTokenCreator
 ) -> str:
@@ -0,0 +1,82 @@
+import logging
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import ValidationError
+
+from backend.services.user.crud import UserCreateData, UserRecord
+from backend.services.user.operations.types import AsyncPasswordsHasher, UsersInserter
+from backend.services.user.schemas import UserCreateSchema
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UserImportReport:
+    created: int = 0
+    skipped: int = 0
+    invalid: dict[int, str] = field(default_factory=dict)
+
+
+async def import_users(
+    rows: Iterable[Mapping[str, Any]],
+    passwords_hasher: AsyncPasswordsHasher,
+    users_inserter: UsersInserter,
+    batch_size: int,
+    success_callback: Callable[[Sequence[UserRecord]], None] = lambda _: None,
+) -> UserImportReport:
+    report = UserImportReport()
+    seen_emails: set[str] = set()
+    batch: list[UserCreateSchema] = []
+    for line, row in enumerate(rows, start=1):
+        try:
+            schema = UserCreateSchema.model_validate(row)
+        except ValidationError as exc:
+            report.invalid[line] = str(exc)
+            continue
+        # Emails repeated in the file are skipped like the already registered ones
+        if schema.email in seen_emails:
+            report.skipped += 1
+            continue
+        seen_emails.add(schema.email)
+        batch.append(schema)
+        if len(batch) == batch_size:
+            await _import_batch(
+                batch, passwords_hasher, users_inserter, report, success_callback
+            )
+            batch = []
+    if batch:
+        await _import_batch(
+            batch, passwords_hasher, users_inserter, report, success_callback
+        )
+    _logger.info(
+        "Imported %d users, skipped %d duplicated and %d invalid",
+        report.created,
+        report.skipped,
+        len(report.invalid),
+    )
+    return report
+
+
+async def _import_batch(
+    batch: Sequence[UserCreateSchema],
+    passwords_hasher: AsyncPasswordsHasher,
+    users_inserter: UsersInserter,
+    report: UserImportReport,
+    success_callback: Callable[[Sequence[UserRecord]], None],
+) -> None:
+    hashed_passwords = await passwords_hasher([schema.password for schema in batch])
+    created_users = await users_inserter(
+        [
+            UserCreateData(
+                email=schema.email,
+                hashed_password=hashed_password,
+                full_name=schema.full_name,
+            )
+            for schema, hashed_password in zip(batch, hashed_passwords, strict=True)
+        ]
+    )
+    report.created += len(created_users)
+    report.skipped += len(batch) - len(created_users)
+    success_callback(created_users)
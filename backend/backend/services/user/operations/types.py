@@ -1,11 +1,29 @@
-from collections.abc import Awaitable, Callable, Mapping
+from collections.abc import Awaitable, Callable, Collection, Mapping, Sequence
+from datetime import datetime
 from typing import Any, Protocol
+from uuid import UUID
 
 from backend.libs.db.crud import CRUDProtocol
-from backend.services.user.crud import UserCreateData, UserFilters, UserUpdateData
+from backend.services.user.crud import (
+    UserCreateData,
+    UserFilters,
+    UserKey,
+    UserRecord,
+    UserUpdateData,
+)
 from backend.services.user.models import User
 
 UserCRUDProtocol = CRUDProtocol[User, UserCreateData, UserUpdateData, UserFilters]
+UserColumnsReader = Callable[[UUID, Collection[str]], Awaitable[dict[str, Any]]]
+UserColumnsUpdater = Callable[
+    [UUID, UserUpdateData, Collection[str]], Awaitable[dict[str, Any]]
+]
+AsyncUserColumnsCallback = Callable[[dict[str, Any]], Awaitable[None]]
+LoginRecorder = Callable[[UUID, datetime], None]
+UsersInserter = Callable[[Sequence[UserCreateData]], Awaitable[list[UserRecord]]]
+UnconfirmedUsersDeleter = Callable[
+    [datetime, int, UserKey | None], Awaitable[list[UserKey]]
+]
 
 TokenCreator = Callable[[Mapping[str, Any]], str]
 AsyncTokenCreator = Callable[[Mapping[str, Any]], Awaitable[str]]
@@ -14,6 +32,7 @@ AsyncTokenReader = Callable[[str], Awaitable[dict[str, Any]]]
 AsyncPasswordValidator = Callable[[str, str], Awaitable[tuple[bool, str | None]]]
 PasswordHasher = Callable[[str], str]
 AsyncPasswordHasher = Callable[[str], Awaitable[str]]
+AsyncPasswordsHasher = Callable[[Sequence[str]], Awaitable[list[str]]]
 
 
 class TemplateLoader(Protocol):
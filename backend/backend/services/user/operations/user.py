@@ -1,11 +1,20 @@
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Collection
+from datetime import datetime
+from typing import Any
+from uuid import UUID
 
 from backend.libs.db.crud import NoObjectFoundError
 from backend.services.user.crud import UserCreateData, UserFilters, UserUpdateData
 from backend.services.user.exceptions import UserAlreadyExistsError
 from backend.services.user.models import User
-from backend.services.user.operations.types import AsyncPasswordHasher, UserCRUDProtocol
+from backend.services.user.operations.types import (
+    AsyncPasswordHasher,
+    AsyncUserColumnsCallback,
+    UnconfirmedUsersDeleter,
+    UserColumnsUpdater,
+    UserCRUDProtocol,
+)
 from backend.services.user.schemas import UserCreateSchema, UserUpdateSchema
 
 _logger = logging.getLogger(__name__)
@@ -31,12 +40,37 @@ async def create_user(
 
 
 async def update_user(
-    user: User, data: UserUpdateSchema, crud: UserCRUDProtocol
-) -> None:
+    user_id: UUID,
+    data: UserUpdateSchema,
+    columns_updater: UserColumnsUpdater,
+    columns: Collection[str],
+    success_callback: AsyncUserColumnsCallback | None = None,
+) -> dict[str, Any]:
     data_dict = data.model_dump(exclude_unset=True)
     update_data = UserUpdateData(**data_dict)
-    await crud.update_and_refresh(user, update_data)
+    user_columns = await columns_updater(user_id, update_data, columns)
+    if data_dict and success_callback:
+        await success_callback(user_columns)
+    return user_columns
 
 
 async def delete_user(user: User, crud: UserCRUDProtocol) -> None:
     await crud.delete(user)
+
+
+async def purge_unconfirmed_users(
+    created_before: datetime, users_deleter: UnconfirmedUsersDeleter, batch_size: int
+) -> int:
+    # Delete in small batches, so that every transaction locks only a few rows
+    deleted = 0
+    last_key = None
+    while True:
+        deleted_keys = await users_deleter(created_before, batch_size, last_key)
+        deleted += len(deleted_keys)
+        if len(deleted_keys) < batch_size:
+            break
+        last_key = max(deleted_keys)
+    _logger.info(
+        "Purged %d unconfirmed users created before %s", deleted, created_before
+    )
+    return deleted
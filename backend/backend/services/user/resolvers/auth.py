@@ -5,11 +5,14 @@ from strawberry import argument
 
 from backend.config.settings import settings
 from backend.libs.api.context import Info
+from backend.libs.db.session import set_session_timeouts
 from backend.services.user.context import (
     async_password_hasher,
     async_password_validator,
     async_token_creator,
     async_token_reader,
+    last_login_buffer,
+    login_session_timeouts,
 )
 from backend.services.user.crud import UserCRUD
 from backend.services.user.exceptions import (
@@ -65,11 +68,12 @@ async def login_resolver(
         access_token_creator=_access_token_creator,
         refresh_token_creator=_refresh_token_creator,
     )
+    await set_session_timeouts(info.context.db, login_session_timeouts)
     crud = UserCRUD(db=info.context.db)
 
     try:
         access_token, refresh_token_ = await login(
-            schema, password_manager, tokens_manager, crud
+            schema, password_manager, tokens_manager, crud, last_login_buffer.add
         )
     except (UserNotFoundError, InvalidPasswordError):
         return LoginFailure(problems=[InvalidCredentialsProblem()])
@@ -1,18 +1,31 @@
+from collections.abc import AsyncGenerator
+from functools import partial
 from typing import Annotated
 
 from pydantic import ValidationError
 from strawberry import argument
 
+from backend.broadcast import broadcaster
 from backend.libs.api.context import Info
 from backend.libs.api.types import (
     convert_graphql_type_to_dict,
     convert_pydantic_error_to_problems,
 )
 from backend.services.user.context import async_password_hasher
-from backend.services.user.crud import UserCRUD
+from backend.services.user.crud import UserCRUD, update_user_columns
+from backend.services.user.events import (
+    USER_EVENT_COLUMNS,
+    get_user_channel,
+    publish_user_event,
+    read_user_event,
+)
 from backend.services.user.exceptions import UserAlreadyExistsError
 from backend.services.user.models import User as UserModel
-from backend.services.user.operations.user import create_user, delete_user, update_user
+from backend.services.user.operations.user import (
+    create_user,
+    delete_user,
+    update_user,
+)
 from backend.services.user.schemas import UserCreateSchema, UserUpdateSchema
 from backend.services.user.tasks import send_confirmation_email_task
 from backend.services.user.types.user import (
@@ -25,6 +38,8 @@ from backend.services.user.types.user import (
     User,
     UserAlreadyExistsProblem,
     UserCreateInput,
+    get_user_columns,
+    get_user_type_from_columns,
     get_user_type_from_model,
 )
 
@@ -54,14 +69,14 @@ async def create_user_resolver(
 
 
 async def get_me_resolver(info: Info) -> User:
-    user = await info.context.user
-    return get_user_type_from_model(user)
+    user_columns = await info.context.get_user_columns(get_user_columns(info))
+    return get_user_type_from_columns(info, user_columns)
 
 
 async def update_me_resolver(
     info: Info, user_input: Annotated[UpdateMeInput, argument(name="input")]
 ) -> UpdateMeResponse:
-    user = await info.context.user
+    user_columns = await info.context.get_user_columns(["id"])
 
     try:
         schema = UserUpdateSchema.model_validate(
@@ -70,10 +85,22 @@ async def update_me_resolver(
     except ValidationError as exc:
         return UpdateMeFailure(problems=convert_pydantic_error_to_problems(exc))
 
-    crud = UserCRUD(db=info.context.db)
-
-    await update_user(user, schema, crud)
-    return get_user_type_from_model(user)
+    updated_user_columns = await update_user(
+        user_columns["id"],
+        schema,
+        partial(update_user_columns, info.context.db),
+        # The subscribers are sent the whole user, whichever fields are selected
+        [*get_user_columns(info), *USER_EVENT_COLUMNS],
+        partial(publish_user_event, broadcaster),
+    )
+    return get_user_type_from_columns(info, updated_user_columns)
+
+
+async def subscribe_me_resolver(info: Info) -> AsyncGenerator[User, None]:
+    user_id = info.context.get_connection_user_id()
+    async with broadcaster.subscribe(get_user_channel(user_id)) as messages:
+        async for message in messages:
+            yield get_user_type_from_columns(info, read_user_event(message))
 
 
 async def delete_me_resolver(info: Info) -> DeleteMeResponse:
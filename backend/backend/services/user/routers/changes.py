@@ -0,0 +1,68 @@
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime
+from typing import Annotated
+from uuid import UUID
+
+import orjson
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from backend.config.settings import settings
+from backend.db import get_db
+from backend.libs.db.session import AsyncSession
+from backend.services.user.crud import UserRecord, read_user_changes
+from backend.services.user.routers.deps import verify_change_feed_api_key
+
+_user_settings = settings.user
+
+_FEED_START = datetime.min.replace(tzinfo=UTC)
+_FEED_START_ID = UUID(int=0)
+
+router = APIRouter()
+
+
+@router.get(
+    "",
+    dependencies=[Depends(verify_change_feed_api_key)],
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": (
+                "Users changed after the cursor, one JSON object per line, ordered "
+                "by (updated_at, id). Pass the values of the last line as the "
+                "cursor of the next request."
+            ),
+            "content": {
+                "application/x-ndjson": {
+                    "example": (
+                        '{"id":"018f2b4e-8c1a-7d2e-9f3a-1b2c3d4e5f60",'
+                        '"email":"user@email.com","full_name":"Test User",'
+                        '"confirmed_email":true,'
+                        '"updated_at":"2024-01-01T00:00:00+00:00"}\n'
+                    ),
+                }
+            },
+        },
+        401: {"description": "Missing or invalid API key"},
+    },
+)
+async def get_user_changes_route(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    updated_after: datetime = _FEED_START,
+    after_id: UUID = _FEED_START_ID,
+    limit: Annotated[
+        int, Query(ge=1, le=_user_settings.change_feed_max_page_size)
+    ] = _user_settings.change_feed_page_size,
+) -> StreamingResponse:
+    records = await read_user_changes(
+        db, updated_after, after_id, limit, _user_settings.change_feed_delay
+    )
+    return StreamingResponse(
+        _serialize_records(records), media_type="application/x-ndjson"
+    )
+
+
+async def _serialize_records(records: Sequence[UserRecord]) -> AsyncIterator[bytes]:
+    for record in records:
+        # asyncpg returns its own UUID subclass, which orjson doesn't recognize
+        yield orjson.dumps(record, default=str) + b"\n"
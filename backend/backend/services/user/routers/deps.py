@@ -0,0 +1,21 @@
+from fastapi import HTTPException, Request, status
+
+from backend.config.settings import settings
+from backend.libs.api.keys import InvalidAPIKeyError, validate_api_key
+
+_user_settings = settings.user
+
+
+def verify_change_feed_api_key(request: Request) -> None:
+    _verify_api_key(request, _user_settings.change_feed_api_key)
+
+
+def verify_export_api_key(request: Request) -> None:
+    _verify_api_key(request, _user_settings.export_api_key)
+
+
+def _verify_api_key(request: Request, api_key: str | None) -> None:
+    try:
+        validate_api_key(request.headers, api_key)
+    except InvalidAPIKeyError as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED) from exc
@@ -0,0 +1,110 @@
+import csv
+import io
+from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+from enum import Enum
+from typing import Annotated
+
+import orjson
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import RowMapping
+
+from backend.config.settings import settings
+from backend.db import get_background_session_factory
+from backend.libs.db.session import AsyncSessionMaker
+from backend.services.user.crud import USER_EXPORT_FIELDS, stream_users
+from backend.services.user.routers.deps import verify_export_api_key
+
+_user_settings = settings.user
+
+router = APIRouter()
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+@router.get(
+    "",
+    dependencies=[Depends(verify_export_api_key)],
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "All the users, streamed in the requested format",
+            "content": {
+                "application/x-ndjson": {
+                    "example": (
+                        '{"id":"018f2b4e-8c1a-7d2e-9f3a-1b2c3d4e5f60",'
+                        '"email":"user@email.com","full_name":"Test User",'
+                        '"confirmed_email":true,'
+                        '"last_login":"2024-01-02T00:00:00+00:00",'
+                        '"created_at":"2024-01-01T00:00:00+00:00",'
+                        '"updated_at":"2024-01-02T00:00:00+00:00"}\n'
+                    ),
+                },
+                "text/csv": {
+                    "example": (
+                        "id,email,full_name,confirmed_email,last_login,created_at,"
+                        "updated_at\r\n018f2b4e-8c1a-7d2e-9f3a-1b2c3d4e5f60,"
+                        "user@email.com,Test User,True,2024-01-02 00:00:00+00:00,"
+                        "2024-01-01 00:00:00+00:00,2024-01-02 00:00:00+00:00\r\n"
+                    ),
+                },
+            },
+        },
+        401: {"description": "Missing or invalid API key"},
+    },
+)
+async def export_users_route(
+    session_factory: Annotated[
+        AsyncSessionMaker, Depends(get_background_session_factory)
+    ],
+    format: ExportFormat = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    return StreamingResponse(
+        _export_users(session_factory, format),
+        media_type=_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format.value}"'},
+    )
+
+
+async def _export_users(
+    session_factory: AsyncSessionMaker, format: ExportFormat
+) -> AsyncIterator[bytes]:
+    serializer: Callable[[Sequence[RowMapping]], bytes]
+    if format == ExportFormat.CSV:
+        serializer = _serialize_csv
+        yield _write_csv([USER_EXPORT_FIELDS])
+    else:
+        serializer = _serialize_ndjson
+    # The session is owned by the stream, as the request dependencies are closed
+    # before the response is sent. A client disconnect cancels the stream, which
+    # closes the cursor and releases the connection.
+    async with session_factory() as db:
+        async for chunk in stream_users(db, _user_settings.export_chunk_size):
+            yield serializer(chunk)
+
+
+def _serialize_ndjson(rows: Sequence[RowMapping]) -> bytes:
+    # asyncpg returns its own UUID subclass, which orjson doesn't recognize
+    return b"".join(
+        orjson.dumps(dict(row), default=str, option=orjson.OPT_APPEND_NEWLINE)
+        for row in rows
+    )
+
+
+def _serialize_csv(rows: Sequence[RowMapping]) -> bytes:
+    return _write_csv(row.values() for row in rows)
+
+
+def _write_csv(rows: Iterable[Iterable[object]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+
+from backend.services.user.routers.changes import router as changes_router
+from backend.services.user.routers.export import router as export_router
+
+router = APIRouter()
+router.include_router(changes_router, prefix="/changes")
+router.include_router(export_router, prefix="/export")
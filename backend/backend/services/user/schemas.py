@@ -1,12 +1,16 @@
-from pydantic import BaseModel, EmailStr, Field
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, EmailStr, Field
 
 from backend.config.settings import settings
 
 _user_settings = settings.user
 
+NormalizedEmailStr = Annotated[EmailStr, AfterValidator(str.lower)]
+
 
 class UserCreateSchema(BaseModel):
-    email: EmailStr
+    email: NormalizedEmailStr
     password: str = Field(min_length=_user_settings.password_min_length)
     full_name: str = Field(
         min_length=_user_settings.full_name_min_length,
@@ -1,8 +1,16 @@
+import asyncio
 import logging
+from datetime import UTC, datetime
 from functools import partial
 from uuid import UUID
 
 from backend.config.settings import settings
+from backend.libs.db.engine import (
+    EngineProfile,
+    create_async_engine,
+    dispose_async_engine,
+)
+from backend.libs.db.session import SessionTimeouts, create_async_session_factory
 from backend.libs.email.message import (
     EmailParticipants,
     SMTPServer,
@@ -13,6 +21,7 @@ from backend.services.user.context import (
     template_loader,
     token_creator,
 )
+from backend.services.user.crud import delete_unconfirmed_users
 from backend.services.user.operations.email import (
     ConfirmationEmailData,
     ConfirmationTokenData,
@@ -23,10 +32,12 @@ from backend.services.user.operations.password import (
     ResetPasswordTokenData,
     send_reset_password_email,
 )
+from backend.services.user.operations.user import purge_unconfirmed_users
 from backend.worker import worker_app
 
 _logger = logging.getLogger(__name__)
 
+_db_settings = settings.db
 _email_settings = settings.email
 _user_settings = settings.user
 
@@ -87,3 +98,37 @@ def send_reset_password_email_task(
         token_data, reset_password_token_creator, password_hasher, email_data
     )
     _logger.info("Sent reset password email to %r", user_email)
+
+
+@worker_app.task  # type: ignore[misc]
+def purge_unconfirmed_users_task() -> int:
+    # The confirmation links of these users have already expired
+    created_before = (
+        datetime.now(UTC) - _user_settings.email_confirmation_token_lifetime
+    )
+    return asyncio.run(_purge_unconfirmed_users(created_before))
+
+
+async def _purge_unconfirmed_users(created_before: datetime) -> int:
+    # Every task runs in a new event loop, so it can't share the pooled connections
+    engine = create_async_engine(
+        _db_settings.url,
+        EngineProfile(
+            pool_size=1,
+            max_overflow=0,
+            server_settings=_db_settings.server_settings,
+            pgbouncer=_db_settings.pgbouncer,
+        ),
+    )
+    session_factory = create_async_session_factory(
+        engine, SessionTimeouts(**_db_settings.background_timeouts.model_dump())
+    )
+    try:
+        async with session_factory() as db:
+            return await purge_unconfirmed_users(
+                created_before,
+                partial(delete_unconfirmed_users, db),
+                _user_settings.unconfirmed_users_purge_batch_size,
+            )
+    finally:
+        await dispose_async_engine(engine)
@@ -1,24 +1,48 @@
-from collections.abc import Sequence
-from typing import Annotated
+from collections.abc import Mapping, Sequence
+from typing import Annotated, Any
 from uuid import UUID
 
 import strawberry
 
+from backend.libs.api.context import Info
+from backend.libs.api.selection import get_selected_field_names
 from backend.libs.api.types import InvalidInputProblem, Problem
+from backend.services.user.crud import UserRecord
 from backend.services.user.models import User as UserModel
 
 
 @strawberry.type
 class User:
-    id: UUID
-    email: str
-    full_name: str
+    # The fields whose columns haven't been read are left unset
+    id: UUID = strawberry.UNSET
+    email: str = strawberry.UNSET
+    full_name: str = strawberry.UNSET
+
+
+# Maps the fields of the User type to the model columns they're read from
+_USER_FIELD_COLUMNS = {"id": "id", "email": "email", "fullName": "full_name"}
+USER_TYPE_COLUMNS = tuple(_USER_FIELD_COLUMNS.values())
 
 
-def get_user_type_from_model(model: UserModel) -> User:
+def get_user_type_from_model(model: UserModel | UserRecord) -> User:
     return User(id=model.id, email=model.email, full_name=model.full_name)
 
 
+def get_user_columns(info: Info) -> list[str]:
+    selected_fields = get_selected_field_names(info, "User")
+    return [
+        column
+        for field, column in _USER_FIELD_COLUMNS.items()
+        if field in selected_fields
+    ]
+
+
+def get_user_type_from_columns(info: Info, columns: Mapping[str, Any]) -> User:
+    # Only the selected fields are set, so that a column missing from the ones read
+    # fails here instead of being resolved as null
+    return User(**{column: columns[column] for column in get_user_columns(info)})
+
+
 @strawberry.input
 class UserCreateInput:
     email: str
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from strawberry import Schema
+from strawberry.extensions.runner import SchemaExtensionsRunner
+from strawberry.types import ExecutionContext
+
+from backend.api.graphql.operations import KNOWN_OPERATIONS
+from backend.libs.db.engine import AsyncEngine, warm_up_pool
+from backend.services.user.context import (
+    async_password_hasher,
+    async_password_validator,
+    async_token_creator,
+    async_token_reader,
+)
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmUpStep:
+    name: str
+    run: Callable[[], Awaitable[None]]
+
+
+async def warm_up(steps: Iterable[WarmUpStep], timeout: timedelta) -> None:
+    tasks = {asyncio.create_task(_run_step(step)): step.name for step in steps}
+    if not tasks:
+        return
+    _, pending = await asyncio.wait(tasks, timeout=timeout.total_seconds())
+    for task in pending:
+        task.cancel()
+        _logger.warning("Warm-up of %r timed out", tasks[task])
+    # The cancelled steps still release what they hold, e.g. the connections
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _run_step(step: WarmUpStep) -> None:
+    start_time = time.perf_counter()
+    try:
+        await step.run()
+    except Exception:
+        _logger.exception("Warm-up of %r failed", step.name)
+        return
+    _logger.info(
+        "Warmed up %r in %.1f ms", step.name, (time.perf_counter() - start_time) * 1000
+    )
+
+
+def get_warm_up_steps(
+    engine: AsyncEngine, schema: Schema, db_connections: int
+) -> list[WarmUpStep]:
+    async def warm_up_database() -> None:
+        await warm_up_pool(engine, db_connections)
+
+    async def warm_up_tokens() -> None:
+        token = await async_token_creator({"type": "warm-up"}, expiration=60)
+        await async_token_reader(token)
+
+    async def warm_up_passwords() -> None:
+        hashed_password = await async_password_hasher("warm-up")
+        await async_password_validator("warm-up", hashed_password)
+
+    async def warm_up_schema() -> None:
+        # The operations are parsed and validated by the extensions of the schema,
+        # so that their documents are cached with the same options and rules
+        for operation in KNOWN_OPERATIONS:
+            execution_context = ExecutionContext(query=operation, schema=schema)
+            extensions_runner = SchemaExtensionsRunner(
+                execution_context=execution_context,
+                extensions=schema.get_extensions(),
+            )
+            async with extensions_runner.operation():
+                async with extensions_runner.parsing():
+                    pass
+                async with extensions_runner.validation():
+                    pass
+
+    return [
+        WarmUpStep(name="database", run=warm_up_database),
+        WarmUpStep(name="tokens", run=warm_up_tokens),
+        WarmUpStep(name="passwords", run=warm_up_passwords),
+        WarmUpStep(name="schema", run=warm_up_schema),
+    ]
@@ -3,6 +3,7 @@ from celery import Celery
 from backend.config.settings import settings
 
 _worker_settings = settings.worker
+_user_settings = settings.user
 
 worker_app = Celery(
     "celery",
@@ -10,3 +11,13 @@ worker_app = Celery(
     backend=_worker_settings.result_backend,
 )
 worker_app.autodiscover_tasks(["backend.services.monitoring", "backend.services.user"])
+worker_app.conf.beat_schedule = {
+    "purge-unconfirmed-users": {
+        "task": "backend.services.user.tasks.purge_unconfirmed_users_task",
+        "schedule": _user_settings.unconfirmed_users_purge_interval,
+        # Don't pile up the runs if the workers are not keeping up
+        "options": {
+            "expires": _user_settings.unconfirmed_users_purge_interval.total_seconds()
+        },
+    },
+}
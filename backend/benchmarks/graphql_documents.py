@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from graphql import ExecutionResult as GraphQLExecutionResult
+from graphql.validation import NoSchemaIntrospectionCustomRule
+from strawberry import Schema
+from strawberry.extensions import AddValidationRules, SchemaExtension
+
+from backend.api.graphql.extensions import create_document_cache_extension
+from backend.api.graphql.mutation import Mutation
+from backend.api.graphql.operations import KNOWN_OPERATIONS
+from backend.api.graphql.query import Query
+from backend.config.settings import settings
+
+_logger = logging.getLogger(__name__)
+
+_graphql_settings = settings.graphql
+
+_ITERATIONS = 2000
+
+_OPERATIONS: dict[str, tuple[str, dict[str, Any] | None]] = {
+    "me": (KNOWN_OPERATIONS[0], None),
+    "login": (
+        KNOWN_OPERATIONS[1],
+        {"input": {"email": "benchmark@email.com", "password": "password"}},
+    ),
+}
+
+
+class _SkipExecution(SchemaExtension):
+    # Measure only the parsing and the validation, not the resolvers
+    def on_execute(self) -> Iterator[None]:
+        self.execution_context.result = GraphQLExecutionResult(data={})
+        yield
+
+
+def _create_schema(cached: bool) -> Schema:
+    extensions: list[type[SchemaExtension] | SchemaExtension] = [
+        AddValidationRules([NoSchemaIntrospectionCustomRule]),
+        _SkipExecution,
+    ]
+    if cached:
+        extensions.insert(
+            0,
+            create_document_cache_extension(
+                _graphql_settings.parser_cache_size,
+                _graphql_settings.validation_cache_size,
+            ),
+        )
+    return Schema(query=Query, mutation=Mutation, extensions=extensions)
+
+
+async def _benchmark(
+    schema: Schema, query: str, variables: dict[str, Any] | None
+) -> float:
+    # The first execution fills the caches
+    await schema.execute(query, variable_values=variables)
+    start_time = time.process_time()
+    for _ in range(_ITERATIONS):
+        result = await schema.execute(query, variable_values=variables)
+        assert not result.errors
+    return (time.process_time() - start_time) / _ITERATIONS
+
+
+async def main() -> None:
+    uncached_schema = _create_schema(cached=False)
+    cached_schema = _create_schema(cached=True)
+    for name, (query, variables) in _OPERATIONS.items():
+        uncached = await _benchmark(uncached_schema, query, variables)
+        cached = await _benchmark(cached_schema, query, variables)
+        _logger.info(
+            "%s: %.1f us/request uncached, %.1f us/request cached, "
+            "%.1f us (%.0f%%) CPU saved",
+            name,
+            uncached * 1_000_000,
+            cached * 1_000_000,
+            (uncached - cached) * 1_000_000,
+            (uncached - cached) / uncached * 100,
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s")
+    _logger.setLevel(logging.INFO)
+    asyncio.run(main())
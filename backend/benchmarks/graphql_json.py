@@ -0,0 +1,85 @@
+import json
+import logging
+import time
+from collections.abc import Callable
+from typing import Any, cast
+from uuid import uuid4
+
+import orjson
+from fastapi import Response
+from strawberry.http import GraphQLHTTPResponse
+
+from backend.api.graphql.router import get_router
+
+_logger = logging.getLogger(__name__)
+
+_ITERATIONS = 200
+_USERS = 5000
+
+_router = get_router()
+
+
+def _create_response_data() -> dict[str, Any]:
+    users = [
+        {
+            "id": str(uuid4()),
+            "email": f"user-{index}@email.com",
+            "fullName": f"Benchmark User {index}",
+        }
+        for index in range(_USERS)
+    ]
+    return {"data": {"users": users}}
+
+
+def _encode_with_json(response_data: dict[str, Any]) -> bytes:
+    return Response(json.dumps(response_data), media_type="application/json").body
+
+
+def _encode_with_orjson_str(response_data: dict[str, Any]) -> bytes:
+    return Response(
+        orjson.dumps(response_data).decode(), media_type="application/json"
+    ).body
+
+
+def _encode_with_router(response_data: dict[str, Any]) -> bytes:
+    return _router.create_response(
+        cast(GraphQLHTTPResponse, response_data), Response()
+    ).body
+
+
+def _benchmark(function: Callable[[Any], object], argument: Any) -> float:
+    function(argument)
+    start_time = time.process_time()
+    for _ in range(_ITERATIONS):
+        function(argument)
+    return (time.process_time() - start_time) / _ITERATIONS
+
+
+def main() -> None:
+    response_data = _create_response_data()
+    body = orjson.dumps(response_data)
+    _logger.info("Payload: %d users, %.1f KiB", _USERS, len(body) / 1024)
+
+    encoders = {
+        "json str": _encode_with_json,
+        "orjson str": _encode_with_orjson_str,
+        # The bytes from orjson, as they're sent by the router
+        "router": _encode_with_router,
+    }
+    for name, encoder in encoders.items():
+        duration = _benchmark(encoder, response_data)
+        _logger.info("encode %s: %.0f us/response", name, duration * 1_000_000)
+
+    decoders: dict[str, Callable[[bytes], object]] = {
+        "json": json.loads,
+        "router": _router.parse_json,
+    }
+    for name, decoder in decoders.items():
+        duration = _benchmark(decoder, body)
+        _logger.info("decode %s: %.0f us/request", name, duration * 1_000_000)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s")
+    _logger.setLevel(logging.INFO)
+    main()
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete
+
+from backend.config.settings import settings
+from backend.libs.db.engine import (
+    EngineProfile,
+    create_async_engine,
+    dispose_async_engine,
+)
+from backend.libs.db.session import AsyncSession, create_async_session_factory
+from backend.services.user.crud import UserCRUD, UserFilters, read_user_columns
+from backend.services.user.models import User
+
+_logger = logging.getLogger(__name__)
+
+_db_settings = settings.db
+
+_CONCURRENCY = 50
+_ITERATIONS = 40
+
+_Lookup = Callable[[AsyncSession, UUID], Awaitable[object]]
+
+
+_RECORD_COLUMNS = ("email", "full_name", "confirmed_email", "updated_at")
+
+
+async def _read_with_orm(db: AsyncSession, user_id: UUID) -> User:
+    return await UserCRUD(db=db).read_one(UserFilters(id=user_id))
+
+
+async def _read_record_columns(db: AsyncSession, user_id: UUID) -> dict[str, object]:
+    return await read_user_columns(db, user_id, _RECORD_COLUMNS)
+
+
+async def _read_selected_columns(db: AsyncSession, user_id: UUID) -> dict[str, object]:
+    return await read_user_columns(db, user_id, ("confirmed_email",))
+
+
+async def _run(
+    session_factory: Callable[[], AsyncSession], lookup: _Lookup, user_id: UUID
+) -> list[float]:
+    durations = []
+    for _ in range(_ITERATIONS):
+        async with session_factory() as db:
+            start_time = time.perf_counter()
+            await lookup(db, user_id)
+            durations.append(time.perf_counter() - start_time)
+    return durations
+
+
+async def _benchmark(
+    name: str,
+    session_factory: Callable[[], AsyncSession],
+    lookup: _Lookup,
+    user_id: UUID,
+) -> None:
+    start_time = time.perf_counter()
+    results = await asyncio.gather(
+        *(_run(session_factory, lookup, user_id) for _ in range(_CONCURRENCY))
+    )
+    total_time = time.perf_counter() - start_time
+    durations = sorted(duration for result in results for duration in result)
+    _logger.info(
+        "%s: %.0f lookups/s, median %.2f ms, p99 %.2f ms",
+        name,
+        len(durations) / total_time,
+        statistics.median(durations) * 1000,
+        durations[int(len(durations) * 0.99)] * 1000,
+    )
+
+
+async def main() -> None:
+    engine = create_async_engine(
+        _db_settings.url, EngineProfile(pool_size=_CONCURRENCY, max_overflow=0)
+    )
+    session_factory = create_async_session_factory(engine)
+    user_id = uuid4()
+    async with session_factory() as db:
+        user = User(
+            id=user_id,
+            email="benchmark@email.com",
+            hashed_password="hashed_password",
+            full_name="Benchmark User",
+        )
+        db.add(user)
+        await db.commit()
+    try:
+        # The first round warms up the pool and the statement caches
+        lookups = {
+            "UserCRUD.read_one": _read_with_orm,
+            "read_user_columns (record columns)": _read_record_columns,
+            "read_user_columns (selected columns)": _read_selected_columns,
+        }
+        for lookup in lookups.values():
+            await _run(session_factory, lookup, user_id)
+        for name, lookup in lookups.items():
+            await _benchmark(name, session_factory, lookup, user_id)
+    finally:
+        async with session_factory() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await dispose_async_engine(engine)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s")
+    _logger.setLevel(logging.INFO)
+    asyncio.run(main())
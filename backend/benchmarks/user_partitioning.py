@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import Any
+
+from backend.config.settings import settings
+from backend.libs.db.engine import create_async_engine, dispose_async_engine
+from backend.libs.db.session import (
+    AsyncSessionMaker,
+    create_async_session_factory,
+    get_driver_connection,
+)
+from backend.services.user.models import USER_PARTITIONS
+
+_logger = logging.getLogger(__name__)
+
+_db_settings = settings.db
+
+_LOOKUPS = 20_000
+
+_CREATE_PLAIN_TABLE = """
+    CREATE TABLE benchmark_user_plain (
+        id uuid PRIMARY KEY, email varchar UNIQUE, full_name varchar(128)
+    )
+"""
+_CREATE_PARTITIONED_TABLE = """
+    CREATE TABLE benchmark_user_partitioned (
+        id uuid PRIMARY KEY, email varchar, full_name varchar(128)
+    ) PARTITION BY HASH (id)
+"""
+_CREATE_PARTITION = """
+    CREATE TABLE benchmark_user_partitioned_p{remainder}
+    PARTITION OF benchmark_user_partitioned
+    FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})
+"""
+_CREATE_LOOKUP_TABLE = """
+    CREATE TABLE benchmark_user_email (email varchar PRIMARY KEY, user_id uuid)
+"""
+_FILL_TABLE = """
+    INSERT INTO {table} (id, email, full_name)
+    SELECT gen_random_uuid(), 'user' || i || '@email.com', 'User ' || i
+    FROM generate_series(1, $1) AS i
+"""
+
+_QUERIES = {
+    "plain by id": "SELECT * FROM benchmark_user_plain WHERE id = $1",
+    "plain by email": "SELECT * FROM benchmark_user_plain WHERE email = $1",
+    "partitioned by id": "SELECT * FROM benchmark_user_partitioned WHERE id = $1",
+    "partitioned by email": (
+        "SELECT * FROM benchmark_user_partitioned WHERE email = $1"
+    ),
+    "partitioned by email via lookup table": """
+        SELECT u.* FROM benchmark_user_email e
+        JOIN benchmark_user_partitioned u ON u.id = e.user_id
+        WHERE e.email = $1
+    """,
+}
+
+_TABLES = ["benchmark_user_plain", "benchmark_user_partitioned", "benchmark_user_email"]
+
+
+async def _create_tables(conn: Any, rows: int) -> None:
+    await conn.execute(_CREATE_PLAIN_TABLE)
+    await conn.execute(_CREATE_PARTITIONED_TABLE)
+    for remainder in range(USER_PARTITIONS):
+        await conn.execute(
+            _CREATE_PARTITION.format(partitions=USER_PARTITIONS, remainder=remainder)
+        )
+    await conn.execute(_CREATE_LOOKUP_TABLE)
+    await conn.execute(_FILL_TABLE.format(table="benchmark_user_plain"), rows)
+    await conn.execute(
+        "INSERT INTO benchmark_user_partitioned SELECT * FROM benchmark_user_plain"
+    )
+    await conn.execute(
+        "INSERT INTO benchmark_user_email SELECT email, id FROM benchmark_user_plain"
+    )
+    await conn.execute("CREATE INDEX ON benchmark_user_partitioned (email)")
+    for table in _TABLES:
+        await conn.execute(f"ANALYZE {table}")
+
+
+async def _benchmark(conn: Any, name: str, query: str, values: list[Any]) -> None:
+    statement = await conn.prepare(query)
+    start_time = time.perf_counter()
+    for value in values:
+        await statement.fetchrow(value)
+    total_time = time.perf_counter() - start_time
+    _logger.info(
+        "%s: %.0f lookups/s, %.3f ms per lookup",
+        name,
+        len(values) / total_time,
+        total_time / len(values) * 1000,
+    )
+
+
+async def _run_benchmarks(session_factory: AsyncSessionMaker, rows: int) -> None:
+    async with session_factory() as db:
+        conn = await get_driver_connection(db)
+        for table in _TABLES:
+            await conn.execute(f"DROP TABLE IF EXISTS {table}")
+        try:
+            _logger.info("Creating %d users in %d partitions", rows, USER_PARTITIONS)
+            await _create_tables(conn, rows)
+            await db.commit()
+            conn = await get_driver_connection(db)
+            sample = await conn.fetch(
+                "SELECT id, email FROM benchmark_user_plain "
+                "TABLESAMPLE SYSTEM (1) LIMIT $1",
+                _LOOKUPS,
+            )
+            ids = [row["id"] for row in sample]
+            emails = [row["email"] for row in sample]
+            random.shuffle(ids)
+            random.shuffle(emails)
+            for name, query in _QUERIES.items():
+                values = ids if name.endswith("by id") else emails
+                await _benchmark(conn, name, query, values)
+        finally:
+            await db.rollback()
+            conn = await get_driver_connection(db)
+            for table in _TABLES:
+                await conn.execute(f"DROP TABLE IF EXISTS {table}")
+            await db.commit()
+
+
+async def main(rows: int) -> None:
+    engine = create_async_engine(_db_settings.url)
+    try:
+        await _run_benchmarks(create_async_session_factory(engine), rows)
+    finally:
+        await dispose_async_engine(engine)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    args = parser.parse_args()
+    logging.basicConfig(format="%(message)s")
+    _logger.setLevel(logging.INFO)
+    asyncio.run(main(args.rows))
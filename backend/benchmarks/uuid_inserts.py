@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from uuid import UUID, uuid4
+
+from backend.config.settings import settings
+from backend.libs.db.engine import create_async_engine, dispose_async_engine
+from backend.libs.db.identifiers import uuid7
+from backend.libs.db.session import (
+    AsyncSessionMaker,
+    create_async_session_factory,
+    get_driver_connection,
+)
+
+_logger = logging.getLogger(__name__)
+
+_db_settings = settings.db
+
+_BATCH_SIZE = 10_000
+
+
+async def _benchmark(
+    session_factory: AsyncSessionMaker,
+    name: str,
+    generate: Callable[[], UUID],
+    rows: int,
+) -> None:
+    table = f"benchmark_{name}"
+    async with session_factory() as db:
+        conn = await get_driver_connection(db)
+        await conn.execute(f"DROP TABLE IF EXISTS {table}")
+        await conn.execute(
+            f"CREATE TABLE {table} (id uuid PRIMARY KEY, created_at timestamptz)"
+        )
+        await db.commit()
+        start_time = time.perf_counter()
+        for _ in range(rows // _BATCH_SIZE):
+            conn = await get_driver_connection(db)
+            await conn.copy_records_to_table(
+                table,
+                records=[(generate(), None) for _ in range(_BATCH_SIZE)],
+                columns=["id", "created_at"],
+            )
+            await db.commit()
+        total_time = time.perf_counter() - start_time
+        conn = await get_driver_connection(db)
+        index_size = await conn.fetchval(
+            "SELECT pg_relation_size($1::regclass)", f"{table}_pkey"
+        )
+        await conn.execute(f"DROP TABLE {table}")
+        await db.commit()
+    _logger.info(
+        "%s: %.0f rows/s, primary key index %.1f MiB",
+        name,
+        rows / total_time,
+        index_size / 2**20,
+    )
+
+
+async def main(rows: int) -> None:
+    engine = create_async_engine(_db_settings.url)
+    session_factory = create_async_session_factory(engine)
+    try:
+        await _benchmark(session_factory, "uuid4", uuid4, rows)
+        await _benchmark(session_factory, "uuid7", uuid7, rows)
+    finally:
+        await dispose_async_engine(engine)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+    logging.basicConfig(format="%(message)s")
+    _logger.setLevel(logging.INFO)
+    asyncio.run(main(args.rows))
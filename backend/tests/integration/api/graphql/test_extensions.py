@@ -0,0 +1,70 @@
+from unittest.mock import AsyncMock
+
+import pytest
+import strawberry
+from sqlalchemy import text
+
+from backend.api.graphql.extensions import ReadOnlyQueriesExtension
+from backend.libs.api.context import Context, Info, Loaders
+from backend.libs.api.loaders import create_cached_loader, create_loader
+from tests.integration.conftest import AsyncSession, AsyncSessionMaker
+
+
+async def _show_read_only(info: Info) -> str:
+    return str(await info.context.db.scalar(text("SHOW transaction_read_only")))
+
+
+@strawberry.type
+class Query:
+    read_only: str = strawberry.field(resolver=_show_read_only)
+
+
+@strawberry.type
+class Mutation:
+    read_only: str = strawberry.field(resolver=_show_read_only)
+
+
+_schema = strawberry.Schema(
+    query=Query, mutation=Mutation, extensions=[ReadOnlyQueriesExtension]
+)
+
+
+def _create_context(db: AsyncSession, session_factory: AsyncSessionMaker) -> Context:
+    # The user is never read by these operations
+    loaders = Loaders(
+        user_by_id=create_loader(
+            AsyncMock(side_effect=AssertionError), key_getter=lambda user: user.id
+        ),
+        access_token=create_cached_loader(AsyncMock(side_effect=AssertionError)),
+    )
+    return Context(
+        db,
+        AsyncMock(side_effect=AssertionError),
+        AsyncMock(side_effect=AssertionError),
+        loaders,
+        session_factory,
+    )
+
+
+@pytest.mark.anyio()
+async def test_query_is_executed_in_read_only_transaction(
+    db: AsyncSession, session_factory: AsyncSessionMaker
+) -> None:
+    result = await _schema.execute(
+        "query { readOnly }", context_value=_create_context(db, session_factory)
+    )
+
+    assert result.data == {"readOnly": "on"}
+
+
+@pytest.mark.anyio()
+async def test_mutation_is_executed_in_read_write_transaction(
+    db: AsyncSession,
+    session_factory: AsyncSessionMaker,
+) -> None:
+    result = await _schema.execute(
+        "mutation { readOnly }",
+        context_value=_create_context(db, session_factory),
+    )
+
+    assert result.data == {"readOnly": "off"}
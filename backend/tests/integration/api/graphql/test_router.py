@@ -1,9 +1,56 @@
+import hashlib
+import json
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
 import pytest
-from fastapi import status
+from fastapi import FastAPI, status
 from httpx import AsyncClient
+from redis.asyncio import Redis
 
+from backend.api.graphql import context as graphql_context
+from backend.api.graphql import router as graphql_router
+from backend.config.settings import settings
+from backend.db import get_session_factory
+from backend.libs.db.engine import (
+    QueryInstrumentation,
+    create_async_engine,
+    dispose_async_engine,
+)
 from backend.main import get_local_app
-from tests.integration.conftest import AsyncEngine
+from backend.services.user import crud
+from backend.services.user.context import async_token_reader, login_session_timeouts
+from tests.integration.conftest import AsyncEngine, AsyncSession, AsyncSessionMaker
+from tests.integration.helpers.user import (
+    create_auth_header,
+    create_confirmed_user,
+    hash_password,
+)
+from tests.integration.helpers.websocket import connect_websocket
+
+_graphql_settings = settings.graphql
+
+_TEST_PERSISTED_QUERY_KEY_PREFIX = "test-persisted-query:"
+
+
+@pytest.fixture(name="_persisted_query_key_prefix")
+async def _persisted_query_key_prefix_fixture(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncGenerator[None, None]:
+    # The persisted queries would otherwise outlive the tests in Redis
+    monkeypatch.setattr(
+        graphql_router, "PERSISTED_QUERY_KEY_PREFIX", _TEST_PERSISTED_QUERY_KEY_PREFIX
+    )
+    yield
+    if redis_url := _graphql_settings.persisted_queries_redis_url:
+        redis = Redis.from_url(redis_url)
+        keys = [
+            key async for key in redis.scan_iter(f"{_TEST_PERSISTED_QUERY_KEY_PREFIX}*")
+        ]
+        if keys:
+            await redis.delete(*keys)
+        await redis.aclose()
 
 
 @pytest.mark.anyio()
@@ -44,3 +91,624 @@ async def test_schema_introspection_is_enabled_disabled(
         response = await client.post(graphql_url, json=payload)
 
     assert bool(response.json().get("errors")) == error
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize(("debug", "traced"), [(True, True), (False, False)])
+async def test_trace_is_returned_if_requested_in_debug_mode(
+    debug: bool, traced: bool, db_engine: AsyncEngine, graphql_url: str
+) -> None:
+    app = get_local_app(db_engine, debug)
+    payload = {"query": "query { __typename }"}
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            graphql_url, json=payload, headers={"X-GraphQL-Trace": "1"}
+        )
+
+    assert ("tracing" in response.json().get("extensions", {})) == traced
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("_persisted_query_key_prefix")
+async def test_persisted_query_is_registered_and_executed_by_hash(
+    db_engine: AsyncEngine, graphql_url: str
+) -> None:
+    app = get_local_app(db_engine)
+    query = "query RegisteredByHash { __typename }"
+    extensions = {
+        "persistedQuery": {
+            "version": 1,
+            "sha256Hash": hashlib.sha256(query.encode()).hexdigest(),
+        }
+    }
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        not_found_response = await client.post(
+            graphql_url, json={"extensions": extensions}
+        )
+        registered_response = await client.post(
+            graphql_url, json={"query": query, "extensions": extensions}
+        )
+        persisted_response = await client.get(
+            graphql_url, params={"extensions": json.dumps(extensions)}
+        )
+
+    assert not_found_response.json()["errors"][0]["extensions"] == {
+        "code": "PERSISTED_QUERY_NOT_FOUND"
+    }
+    assert registered_response.json() == {"data": {"__typename": "Query"}}
+    assert persisted_response.json() == {"data": {"__typename": "Query"}}
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("_persisted_query_key_prefix")
+async def test_persisted_query_sent_by_client_is_not_allowed_by_allow_list(
+    monkeypatch: pytest.MonkeyPatch, db_engine: AsyncEngine, graphql_url: str
+) -> None:
+    query = "query SentByClient { __typename }"
+    extensions = {
+        "persistedQuery": {
+            "version": 1,
+            "sha256Hash": hashlib.sha256(query.encode()).hexdigest(),
+        }
+    }
+    app = get_local_app(db_engine)
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        await client.post(graphql_url, json={"query": query, "extensions": extensions})
+    monkeypatch.setattr(_graphql_settings, "persisted_queries_allow_list_only", True)
+    allow_list_app = get_local_app(db_engine)
+
+    async with AsyncClient(app=allow_list_app, base_url="http://test") as client:
+        response = await client.post(graphql_url, json={"extensions": extensions})
+
+    assert response.json()["errors"][0]["extensions"] == {
+        "code": "PERSISTED_QUERY_NOT_ALLOWED"
+    }
+
+
+@pytest.mark.anyio()
+async def test_persisted_query_is_rejected_if_hash_does_not_match(
+    client: AsyncClient, graphql_url: str
+) -> None:
+    payload = {
+        "query": "query MismatchedHash { __typename }",
+        "extensions": {"persistedQuery": {"version": 1, "sha256Hash": "invalid"}},
+    }
+
+    response = await client.post(graphql_url, json=payload)
+
+    assert response.json()["errors"][0]["extensions"] == {
+        "code": "PERSISTED_QUERY_INVALID"
+    }
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("_persisted_query_key_prefix")
+async def test_long_query_is_rejected_before_it_is_persisted(
+    db_engine: AsyncEngine, graphql_url: str
+) -> None:
+    app = get_local_app(db_engine)
+    # A comment is no token at all, just like a string literal is a single one
+    comment = "#" * _graphql_settings.max_query_length
+    query = f"{comment}\nquery {{ __typename }}"
+    extensions = {
+        "persistedQuery": {
+            "version": 1,
+            "sha256Hash": hashlib.sha256(query.encode()).hexdigest(),
+        }
+    }
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            graphql_url, json={"query": query, "extensions": extensions}
+        )
+        persisted_response = await client.post(
+            graphql_url, json={"extensions": extensions}
+        )
+
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert persisted_response.json()["errors"][0]["extensions"] == {
+        "code": "PERSISTED_QUERY_NOT_FOUND"
+    }
+
+
+@pytest.mark.anyio()
+async def test_expensive_operation_is_rejected_before_execution(
+    client: AsyncClient, graphql_url: str
+) -> None:
+    logins = " ".join(
+        f'login{index}: login(input: {{username: "test@email.com", '
+        f'password: "plain_password"}}) {{ __typename }}'
+        for index in range(5)
+    )
+    payload = {"query": f"mutation {{ {logins} }}"}
+
+    response = await client.post(graphql_url, json=payload)
+
+    assert response.json() == {
+        "data": None,
+        "errors": [
+            {
+                "message": "Operation 'anonymous' has a cost of 1255, which exceeds "
+                "the maximum cost of 1000",
+                "locations": [{"line": 1, "column": 1}],
+            }
+        ],
+    }
+
+
+@pytest.mark.anyio()
+async def test_batch_of_operations_is_executed_in_order(
+    db: AsyncSession, auth_private_key: str, client: AsyncClient, graphql_url: str
+) -> None:
+    user = await create_confirmed_user(db, full_name="Test User")
+    auth_header = create_auth_header(auth_private_key, user.id)
+    payload = [
+        {"query": "query { me { fullName } }"},
+        {
+            "query": """
+              mutation {
+                updateMe(input: {fullName: "Updated User"}) {
+                  ... on User {
+                    fullName
+                  }
+                }
+              }
+            """
+        },
+        {"query": "query { me { fullName } }"},
+    ]
+
+    response = await client.post(graphql_url, json=payload, headers=auth_header)
+
+    assert response.json() == [
+        {"data": {"me": {"fullName": "Test User"}}},
+        {"data": {"updateMe": {"fullName": "Updated User"}}},
+        {"data": {"me": {"fullName": "Updated User"}}},
+    ]
+
+
+@pytest.mark.anyio()
+async def test_batch_of_queries_is_executed_concurrently(
+    db: AsyncSession, auth_private_key: str, client: AsyncClient, graphql_url: str
+) -> None:
+    user = await create_confirmed_user(db, full_name="Test User")
+    auth_header = create_auth_header(auth_private_key, user.id)
+    payload = [
+        {"query": "query { me { fullName } }"},
+        {"query": "query { me { email } }"},
+        {"query": "query { __typename }"},
+    ]
+
+    response = await client.post(graphql_url, json=payload, headers=auth_header)
+
+    assert response.json() == [
+        {"data": {"me": {"fullName": "Test User"}}},
+        {"data": {"me": {"email": "test_helper_user@email.com"}}},
+        {"data": {"__typename": "Query"}},
+    ]
+
+
+@pytest.mark.anyio()
+async def test_batch_of_queries_opens_limited_number_of_sessions(
+    app: FastAPI,
+    session_factory: AsyncSessionMaker,
+    client: AsyncClient,
+    graphql_url: str,
+) -> None:
+    open_sessions: list[AsyncSession] = []
+    max_open_sessions = 0
+
+    @asynccontextmanager
+    async def create_session() -> AsyncIterator[AsyncSession]:
+        nonlocal max_open_sessions
+        async with session_factory() as session:
+            open_sessions.append(session)
+            max_open_sessions = max(max_open_sessions, len(open_sessions))
+            try:
+                yield session
+            finally:
+                open_sessions.remove(session)
+
+    app.dependency_overrides[get_session_factory] = lambda: create_session
+    payload = [{"query": "query { __typename }"}] * 5
+
+    response = await client.post(graphql_url, json=payload)
+
+    assert len(response.json()) == 5
+    assert max_open_sessions == _graphql_settings.max_batch_concurrency
+
+
+@pytest.mark.anyio()
+async def test_batch_of_mutations_are_executed_in_own_sessions(
+    app: FastAPI,
+    db: AsyncSession,
+    session_factory: AsyncSessionMaker,
+    client: AsyncClient,
+    graphql_url: str,
+) -> None:
+    await create_confirmed_user(
+        db, email="test@email.com", hashed_password=hash_password("plain_password")
+    )
+    sessions: list[AsyncSession] = []
+
+    def create_session() -> AsyncSession:
+        session = session_factory()
+        sessions.append(session)
+        return session
+
+    app.dependency_overrides[get_session_factory] = lambda: create_session
+    payload = [
+        {
+            "query": """
+              mutation {
+                login(input: {username: "test@email.com", password: "plain_password"}) {
+                  __typename
+                }
+              }
+            """
+        },
+        {
+            "query": """
+              mutation {
+                createUser(
+                  input: {
+                    email: "new@email.com", password: "plain_password", fullName: "New"
+                  }
+                ) {
+                  __typename
+                }
+              }
+            """
+        },
+    ]
+
+    response = await client.post(graphql_url, json=payload)
+
+    assert response.json() == [
+        {"data": {"login": {"__typename": "LoginSuccess"}}},
+        {"data": {"createUser": {"__typename": "User"}}},
+    ]
+    login_session, create_user_session = sessions
+    assert login_session_timeouts in login_session.info.values()
+    # The timeouts of the login aren't applied to the next mutation
+    assert login_session_timeouts not in create_user_session.info.values()
+
+
+@pytest.mark.anyio()
+async def test_batch_of_operations_verifies_token_once(
+    db: AsyncSession,
+    auth_private_key: str,
+    client: AsyncClient,
+    graphql_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    user = await create_confirmed_user(db)
+    auth_header = create_auth_header(auth_private_key, user.id)
+    tokens: list[str] = []
+
+    async def read_token(token: str) -> dict[str, Any]:
+        tokens.append(token)
+        return await async_token_reader(token)
+
+    monkeypatch.setattr(graphql_context, "async_token_reader", read_token)
+    payload = [
+        {"query": "query { me { fullName } }"},
+        {"query": "mutation { updateMe(input: {}) { __typename } }"},
+        {"query": "query { me { email } }"},
+    ]
+
+    response = await client.post(graphql_url, json=payload, headers=auth_header)
+
+    assert all("errors" not in result for result in response.json())
+    assert len(tokens) == 1
+
+
+@pytest.mark.anyio()
+async def test_batch_of_operations_traces_statements_per_operation(
+    db: AsyncSession, auth_private_key: str, graphql_url: str
+) -> None:
+    user = await create_confirmed_user(db)
+    headers = {**create_auth_header(auth_private_key, user.id), "X-GraphQL-Trace": "1"}
+    payload = [
+        {"query": "query { __typename }"},
+        {"query": "query { me { fullName } }"},
+    ]
+    engine = create_async_engine(
+        settings.db.url, instrumentation=QueryInstrumentation()
+    )
+    try:
+        async with AsyncClient(
+            app=get_local_app(engine, debug=True), base_url="http://test"
+        ) as client:
+            response = await client.post(graphql_url, json=payload, headers=headers)
+    finally:
+        await dispose_async_engine(engine)
+
+    # Every session sets its timeouts first, and the user is read on top of that
+    assert [
+        result["extensions"]["tracing"]["statements"] for result in response.json()
+    ] == [1, 2]
+
+
+@pytest.mark.anyio()
+async def test_batch_of_operations_reports_errors_per_operation(
+    client: AsyncClient, graphql_url: str
+) -> None:
+    payload = [{"query": "query { __typename }"}, {"query": "query { unknown }"}]
+
+    response = await client.post(graphql_url, json=payload)
+
+    first_result, second_result = response.json()
+    assert first_result == {"data": {"__typename": "Query"}}
+    assert second_result["data"] is None
+    assert second_result["errors"]
+
+
+@pytest.mark.anyio()
+async def test_batch_of_operations_reports_missing_query_per_operation(
+    client: AsyncClient, graphql_url: str
+) -> None:
+    payload = [{"query": "query { __typename }"}, {}]
+
+    response = await client.post(graphql_url, json=payload)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"data": {"__typename": "Query"}},
+        {
+            "data": None,
+            "errors": [{"message": "No GraphQL query found in the request"}],
+        },
+    ]
+
+
+@pytest.mark.anyio()
+async def test_batch_of_operations_is_rejected_if_total_cost_is_too_high(
+    client: AsyncClient, graphql_url: str
+) -> None:
+    login = (
+        'mutation { login(input: {username: "test@email.com", '
+        'password: "plain_password"}) { __typename } }'
+    )
+    payload = [{"query": login}] * 4
+
+    response = await client.post(graphql_url, json=payload)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.text == (
+        "Batch has a cost of 1004, which exceeds the maximum cost of 1000"
+    )
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize("batch_size", [0, 11])
+async def test_batch_of_operations_is_rejected_if_size_is_out_of_range(
+    batch_size: int, client: AsyncClient, graphql_url: str
+) -> None:
+    payload = [{"query": "query { __typename }"}] * batch_size
+
+    response = await client.post(graphql_url, json=payload)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio()
+async def test_me_query_is_not_modified_if_etag_matches(
+    db: AsyncSession, auth_private_key: str, client: AsyncClient, graphql_url: str
+) -> None:
+    user = await create_confirmed_user(db)
+    auth_header = create_auth_header(auth_private_key, user.id)
+    params = {"query": "query { me { fullName } }"}
+    response = await client.get(graphql_url, params=params, headers=auth_header)
+    etag = response.headers["ETag"]
+
+    response = await client.get(
+        graphql_url, params=params, headers=auth_header | {"If-None-Match": etag}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+
+@pytest.mark.anyio()
+async def test_me_query_etag_changes_if_user_is_updated(
+    db: AsyncSession, auth_private_key: str, client: AsyncClient, graphql_url: str
+) -> None:
+    user = await create_confirmed_user(db, full_name="Test User")
+    auth_header = create_auth_header(auth_private_key, user.id)
+    params = {"query": "query { me { fullName } }"}
+    response = await client.get(graphql_url, params=params, headers=auth_header)
+    etag = response.headers["ETag"]
+    mutation = 'mutation { updateMe(input: {fullName: "Updated User"}) { __typename } }'
+    await client.post(graphql_url, json={"query": mutation}, headers=auth_header)
+
+    response = await client.get(
+        graphql_url, params=params, headers=auth_header | {"If-None-Match": etag}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"data": {"me": {"fullName": "Updated User"}}}
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.anyio()
+async def test_me_query_with_etag_reads_user_once(
+    monkeypatch: pytest.MonkeyPatch,
+    db: AsyncSession,
+    auth_private_key: str,
+    client: AsyncClient,
+    graphql_url: str,
+) -> None:
+    user = await create_confirmed_user(db, full_name="Test User")
+    auth_header = create_auth_header(auth_private_key, user.id)
+    read_columns = []
+
+    async def read_user_columns(*args: Any) -> dict[str, Any]:
+        read_columns.append(args[-1])
+        return await crud.read_user_columns(*args)
+
+    monkeypatch.setattr(graphql_context, "read_user_columns", read_user_columns)
+
+    response = await client.get(
+        graphql_url,
+        params={"query": "query { me { fullName } }"},
+        headers=auth_header | {"If-None-Match": '"outdated"'},
+    )
+
+    assert response.json() == {"data": {"me": {"fullName": "Test User"}}}
+    assert len(read_columns) == 1
+
+
+@pytest.mark.anyio()
+async def test_me_query_sent_with_post_has_no_etag(
+    db: AsyncSession, auth_private_key: str, client: AsyncClient, graphql_url: str
+) -> None:
+    user = await create_confirmed_user(db)
+    auth_header = create_auth_header(auth_private_key, user.id)
+    payload = {"query": "query { me { fullName } }"}
+
+    response = await client.post(graphql_url, json=payload, headers=auth_header)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "ETag" not in response.headers
+
+
+@pytest.mark.anyio()
+async def test_websocket_connection_is_acknowledged_for_authenticated_user(
+    db: AsyncSession, auth_private_key: str, app: FastAPI, graphql_url: str
+) -> None:
+    user = await create_confirmed_user(db)
+    auth_header = create_auth_header(auth_private_key, user.id)
+
+    async with connect_websocket(app, graphql_url) as websocket:
+        await websocket.receive()
+        await websocket.send_json({"type": "connection_init", "payload": auth_header})
+
+        message = await websocket.receive_json()
+
+    assert message == {"type": "connection_ack"}
+
+
+@pytest.mark.anyio()
+async def test_websocket_connection_is_closed_if_connection_init_has_no_valid_token(
+    app: FastAPI, graphql_url: str
+) -> None:
+    async with connect_websocket(app, graphql_url) as websocket:
+        await websocket.receive()
+        await websocket.send_json(
+            {"type": "connection_init", "payload": {"Authorization": "Bearer invalid"}}
+        )
+
+        message = await websocket.receive()
+
+    assert message["type"] == "websocket.close"
+    assert message["code"] == 4403
+
+
+@pytest.mark.anyio()
+async def test_websocket_connection_is_closed_if_connection_init_has_no_payload(
+    app: FastAPI, graphql_url: str
+) -> None:
+    async with connect_websocket(app, graphql_url) as websocket:
+        await websocket.receive()
+        await websocket.send_json({"type": "connection_init"})
+
+        message = await websocket.receive()
+
+    assert message["type"] == "websocket.close"
+    assert message["code"] == 4403
+
+
+@pytest.mark.anyio()
+async def test_websocket_rejects_long_subscriptions(
+    db: AsyncSession, auth_private_key: str, app: FastAPI, graphql_url: str
+) -> None:
+    user = await create_confirmed_user(db)
+    auth_header = create_auth_header(auth_private_key, user.id)
+    comment = "#" * _graphql_settings.max_query_length
+    query = f"{comment}\nsubscription {{ __typename }}"
+
+    async with connect_websocket(app, graphql_url) as websocket:
+        await websocket.receive()
+        await websocket.send_json({"type": "connection_init", "payload": auth_header})
+        await websocket.receive_json()
+        await websocket.send_json(
+            {"id": "1", "type": "subscribe", "payload": {"query": query}}
+        )
+
+        message = await websocket.receive_json()
+
+    assert message["type"] == "error"
+    assert message["payload"][0]["message"] == (
+        f"Query must not be longer than {_graphql_settings.max_query_length} bytes"
+    )
+
+
+@pytest.mark.anyio()
+async def test_websocket_rejects_operations_other_than_subscriptions(
+    db: AsyncSession, auth_private_key: str, app: FastAPI, graphql_url: str
+) -> None:
+    user = await create_confirmed_user(db)
+    auth_header = create_auth_header(auth_private_key, user.id)
+
+    async with connect_websocket(app, graphql_url) as websocket:
+        await websocket.receive()
+        await websocket.send_json({"type": "connection_init", "payload": auth_header})
+        await websocket.receive_json()
+        await websocket.send_json(
+            {"id": "1", "type": "subscribe", "payload": {"query": "{ __typename }"}}
+        )
+
+        message = await websocket.receive_json()
+
+    assert message["id"] == "1"
+    assert message["type"] == "error"
+    assert message["payload"][0]["message"] == (
+        "Only subscriptions are supported over WebSocket"
+    )
+
+
+@pytest.mark.anyio()
+async def test_websocket_connections_over_the_limit_are_rejected(
+    monkeypatch: pytest.MonkeyPatch, db_engine: AsyncEngine, graphql_url: str
+) -> None:
+    monkeypatch.setattr(settings.graphql, "max_subscription_connections", 1)
+    app = get_local_app(db_engine)
+
+    async with connect_websocket(app, graphql_url) as first_websocket:
+        accepted_message = await first_websocket.receive()
+        async with connect_websocket(app, graphql_url) as second_websocket:
+            rejected_message = await second_websocket.receive()
+
+    assert accepted_message["type"] == "websocket.accept"
+    assert rejected_message["type"] == "websocket.close"
+    assert rejected_message["code"] == 1013
+
+
+@pytest.mark.anyio()
+async def test_invalid_json_body_is_rejected(
+    client: AsyncClient, graphql_url: str
+) -> None:
+    response = await client.post(
+        graphql_url,
+        content=b'{"query": ',
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.text == "Unable to parse request body as JSON"
+
+
+@pytest.mark.anyio()
+async def test_response_is_encoded_as_json(
+    client: AsyncClient, graphql_url: str
+) -> None:
+    response = await client.post(graphql_url, json={"query": "{ __typename }"})
+
+    assert response.headers["Content-Type"] == "application/json"
+    assert response.headers["Content-Length"] == str(len(response.content))
+    assert response.json() == {"data": {"__typename": "Query"}}
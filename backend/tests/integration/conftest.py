@@ -5,7 +5,7 @@ from fastapi import FastAPI
 from httpx import AsyncClient
 
 from backend.config.settings import settings
-from backend.db import get_db
+from backend.db import get_db, get_session_factory
 from backend.libs.db.engine import (
     AsyncEngine,
     create_async_engine,
@@ -19,7 +19,7 @@ from backend.libs.db.session import (
 from backend.main import get_local_app
 from backend.models import Base
 
-__all__ = ["AsyncClient", "AsyncEngine", "AsyncSession", "Base"]
+__all__ = ["AsyncClient", "AsyncEngine", "AsyncSession", "AsyncSessionMaker", "Base"]
 
 _db_settings = settings.db
 _user_settings = settings.user
@@ -61,12 +61,13 @@ def app_instance_fixture(db_engine: AsyncEngine) -> FastAPI:
 
 @pytest.fixture(name="app")
 def app_fixture(
-    app_instance: FastAPI, db: AsyncSession
+    app_instance: FastAPI, db: AsyncSession, session_factory: AsyncSessionMaker
 ) -> Generator[FastAPI, None, None]:
     async def get_test_db() -> AsyncSession:
         return db
 
     app_instance.dependency_overrides[get_db] = get_test_db
+    app_instance.dependency_overrides[get_session_factory] = lambda: session_factory
     yield app_instance
     app_instance.dependency_overrides.clear()
 
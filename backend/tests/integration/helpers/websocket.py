@@ -0,0 +1,55 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import orjson
+from starlette.types import ASGIApp, Message
+
+
+class WebSocketClient:
+    def __init__(self) -> None:
+        self.incoming: asyncio.Queue[Message] = asyncio.Queue()
+        self.outgoing: asyncio.Queue[Message] = asyncio.Queue()
+
+    async def send_json(self, data: Any) -> None:
+        await self.incoming.put(
+            {"type": "websocket.receive", "text": orjson.dumps(data).decode()}
+        )
+
+    async def receive(self) -> Message:
+        return await asyncio.wait_for(self.outgoing.get(), timeout=5)
+
+    async def receive_json(self) -> Any:
+        message = await self.receive()
+        assert message["type"] == "websocket.send", message
+        return orjson.loads(message["text"])
+
+
+@asynccontextmanager
+async def connect_websocket(
+    app: ASGIApp, path: str, subprotocols: tuple[str, ...] = ("graphql-transport-ws",)
+) -> AsyncIterator[WebSocketClient]:
+    # Talks to the app directly, so that it runs in the same event loop as the tests
+    client = WebSocketClient()
+    scope = {
+        "type": "websocket",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "scheme": "ws",
+        "query_string": b"",
+        "headers": [],
+        "server": ("test", 80),
+        "client": ("test", 50000),
+        "subprotocols": list(subprotocols),
+    }
+    await client.incoming.put({"type": "websocket.connect"})
+    task: asyncio.Task[None] = asyncio.create_task(
+        app(scope, client.incoming.get, client.outgoing.put)  # type: ignore[arg-type]
+    )
+    try:
+        yield client
+    finally:
+        await client.incoming.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(task, timeout=5)
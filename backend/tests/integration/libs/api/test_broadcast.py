@@ -0,0 +1,36 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from uuid import uuid4
+
+import pytest
+from redis.asyncio import Redis
+
+from backend.config.settings import settings
+from backend.libs.api.broadcast import Broadcaster
+
+_worker_settings = settings.worker
+
+
+@pytest.fixture(name="broadcasters")
+async def broadcasters_fixture() -> AsyncGenerator[list[Broadcaster], None]:
+    broadcasters = [
+        Broadcaster(Redis.from_url(_worker_settings.broker_url)) for _ in range(2)
+    ]
+    yield broadcasters
+    for broadcaster in broadcasters:
+        await broadcaster.close()
+
+
+@pytest.mark.anyio()
+async def test_broadcaster_delivers_messages_through_redis(
+    broadcasters: list[Broadcaster],
+) -> None:
+    publisher, subscriber = broadcasters
+    channel = f"test-channel-{uuid4()}"
+
+    async with subscriber.subscribe(channel) as messages:
+        await publisher.publish(channel, b"message")
+
+        message = await asyncio.wait_for(anext(messages), timeout=5)
+
+    assert message == b"message"
@@ -0,0 +1,43 @@
+from collections.abc import AsyncGenerator
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from redis.asyncio import Redis
+
+from backend.config.settings import settings
+from backend.libs.api.persisted_queries import PersistedQueryStore
+
+_worker_settings = settings.worker
+
+
+@pytest.fixture(name="redis")
+async def redis_fixture() -> AsyncGenerator[Redis, None]:
+    redis = Redis.from_url(_worker_settings.broker_url)
+    yield redis
+    await redis.aclose()
+
+
+@pytest.mark.anyio()
+async def test_store_shares_queries_through_redis(redis: Redis) -> None:
+    key_prefix = f"test-persisted-query-{uuid4()}:"
+    first_store = PersistedQueryStore(redis, key_prefix=key_prefix)
+    second_store = PersistedQueryStore(redis, key_prefix=key_prefix)
+
+    await first_store.add("hash", "query")
+
+    assert await second_store.get("hash") == "query"
+    await redis.delete(f"{key_prefix}hash")
+
+
+@pytest.mark.anyio()
+async def test_store_expires_queries_in_redis(redis: Redis) -> None:
+    key_prefix = f"test-persisted-query-{uuid4()}:"
+    store = PersistedQueryStore(redis, ttl=timedelta(minutes=1), key_prefix=key_prefix)
+
+    await store.add("expiring", "query")
+    await store.add("persistent", "query", expire=False)
+
+    assert 0 < await redis.ttl(f"{key_prefix}expiring") <= 60
+    assert await redis.ttl(f"{key_prefix}persistent") == -1
+    await redis.delete(f"{key_prefix}expiring", f"{key_prefix}persistent")
@@ -0,0 +1,67 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from backend.libs.db.buffer import LatestValueBuffer, periodic_flush
+from backend.libs.db.session import AsyncSessionMaker
+from backend.services.user.models import User
+from tests.integration.conftest import AsyncSession
+from tests.integration.helpers.user import create_user
+
+
+@pytest.mark.anyio()
+async def test_flush_updates_rows_in_single_statement(db: AsyncSession) -> None:
+    first_user_id = (await create_user(db, email="first@email.com")).id
+    second_user_id = (await create_user(db, email="second@email.com")).id
+    buffer = LatestValueBuffer(User.id, User.last_login)
+    buffer.add(first_user_id, datetime(2024, 1, 1, tzinfo=UTC))
+    buffer.add(first_user_id, datetime(2024, 1, 3, tzinfo=UTC))
+    buffer.add(first_user_id, datetime(2024, 1, 2, tzinfo=UTC))
+    buffer.add(second_user_id, datetime(2024, 1, 4, tzinfo=UTC))
+
+    flushed = await buffer.flush(db)
+
+    first_user = await db.get_one(User, first_user_id)
+    second_user = await db.get_one(User, second_user_id)
+    assert flushed == 2
+    assert len(buffer) == 0
+    assert first_user.last_login == datetime(2024, 1, 3, tzinfo=UTC)
+    assert second_user.last_login == datetime(2024, 1, 4, tzinfo=UTC)
+
+
+@pytest.mark.anyio()
+async def test_flush_does_not_move_values_backwards(db: AsyncSession) -> None:
+    user = await create_user(db, last_login=datetime(2024, 1, 2, tzinfo=UTC))
+    buffer = LatestValueBuffer(User.id, User.last_login)
+    buffer.add(user.id, datetime(2024, 1, 1, tzinfo=UTC))
+
+    await buffer.flush(db)
+
+    await db.refresh(user)
+    assert user.last_login == datetime(2024, 1, 2, tzinfo=UTC)
+
+
+@pytest.mark.anyio()
+async def test_flush_keeps_values_if_update_fails(db: AsyncSession) -> None:
+    buffer = LatestValueBuffer(User.id, User.last_login)
+    buffer.add("invalid-id", datetime(2024, 1, 1, tzinfo=UTC))
+
+    with pytest.raises(DBAPIError):
+        await buffer.flush(db)
+
+    assert len(buffer) == 1
+
+
+@pytest.mark.anyio()
+async def test_periodic_flush_flushes_buffer_on_exit(
+    db: AsyncSession, session_factory: AsyncSessionMaker
+) -> None:
+    user = await create_user(db)
+    buffer = LatestValueBuffer(User.id, User.last_login)
+
+    async with periodic_flush(buffer, session_factory, timedelta(hours=1)):
+        buffer.add(user.id, datetime(2024, 1, 1, tzinfo=UTC))
+
+    await db.refresh(user)
+    assert user.last_login == datetime(2024, 1, 1, tzinfo=UTC)
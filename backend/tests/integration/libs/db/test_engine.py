@@ -0,0 +1,246 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from backend.config.settings import settings
+from backend.libs.db.engine import (
+    _QUERY_START_TIMES_KEY,
+    EngineProfile,
+    QueryInstrumentation,
+    create_async_engine,
+    dispose_async_engine,
+    get_pool_stats,
+    get_query_stats,
+    track_queries,
+    warm_up_pool,
+)
+from backend.libs.db.session import get_driver_connection
+from tests.integration.conftest import AsyncEngine, AsyncSession
+
+_db_settings = settings.db
+
+
+@pytest.fixture(name="instrumented_engine")
+async def instrumented_engine_fixture() -> AsyncGenerator[AsyncEngine, None]:
+    engine = create_async_engine(
+        _db_settings.url,
+        instrumentation=QueryInstrumentation(
+            slow_query_threshold=timedelta(seconds=10)
+        ),
+    )
+    yield engine
+    await dispose_async_engine(engine)
+
+
+@pytest.fixture(name="slow_query_engine")
+async def slow_query_engine_fixture() -> AsyncGenerator[AsyncEngine, None]:
+    engine = create_async_engine(
+        _db_settings.url,
+        instrumentation=QueryInstrumentation(
+            slow_query_threshold=timedelta(), explain_slow_queries=True
+        ),
+    )
+    yield engine
+    await dispose_async_engine(engine)
+
+
+@pytest.mark.anyio()
+async def test_track_queries_counts_executed_queries(
+    instrumented_engine: AsyncEngine,
+) -> None:
+    with track_queries() as stats:
+        async with instrumented_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+
+    assert stats.count == 2
+    assert stats.duration > 0
+    assert stats.slow_count == 0
+
+
+@pytest.mark.anyio()
+async def test_queries_are_not_tracked_outside_of_tracking_scope(
+    instrumented_engine: AsyncEngine,
+) -> None:
+    async with instrumented_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert get_query_stats() is None
+
+
+@pytest.mark.anyio()
+async def test_exceeded_query_budget_is_reported(
+    instrumented_engine: AsyncEngine, caplog: pytest.LogCaptureFixture
+) -> None:
+    with track_queries(budget=1):
+        async with instrumented_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+
+    assert "Query budget of 1 exceeded, possible N+1 query: SELECT 2" in caplog.text
+
+
+@pytest.mark.anyio()
+async def test_slow_query_is_logged_with_redacted_parameters(
+    slow_query_engine: AsyncEngine, caplog: pytest.LogCaptureFixture
+) -> None:
+    with track_queries() as stats:
+        async with slow_query_engine.connect() as conn:
+            await conn.execute(
+                text("SELECT CAST(:secret AS TEXT)"), {"secret": "password"}
+            )
+
+    assert stats.slow_count == 1
+    assert "Slow query" in caplog.text
+    assert "('<str>',)" in caplog.text
+    assert "password" not in caplog.text
+
+
+@pytest.mark.anyio()
+async def test_slow_query_plan_is_logged(
+    slow_query_engine: AsyncEngine, caplog: pytest.LogCaptureFixture
+) -> None:
+    async with slow_query_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert "Slow query plan:" in caplog.text
+    assert "Execution Time" in caplog.text
+
+
+@pytest.mark.anyio()
+async def test_failed_slow_query_plan_does_not_abort_transaction(
+    slow_query_engine: AsyncEngine, caplog: pytest.LogCaptureFixture
+) -> None:
+    async with slow_query_engine.begin() as conn:
+        await conn.execute(text("CREATE TEMPORARY SEQUENCE explain_sequence"))
+        # Divides by zero only when it's executed again to be explained
+        await conn.execute(text("SELECT 1 / (2 - nextval('explain_sequence'))"))
+        result = await conn.execute(text("SELECT 1"))
+
+    assert "Failed to explain the slow query" in caplog.text
+    assert result.scalar_one() == 1
+
+
+@pytest.mark.anyio()
+async def test_locking_slow_query_is_not_explained(
+    slow_query_engine: AsyncEngine, caplog: pytest.LogCaptureFixture
+) -> None:
+    async with slow_query_engine.begin() as conn:
+        await conn.execute(text("SELECT 1 FROM pg_class LIMIT 1 FOR SHARE"))
+
+    assert "Slow query (" in caplog.text
+    assert "Slow query plan:" not in caplog.text
+
+
+@pytest.mark.anyio()
+async def test_pool_stats_report_checked_out_connections() -> None:
+    engine = create_async_engine(
+        _db_settings.url, EngineProfile(pool_size=2, max_overflow=1)
+    )
+
+    async with engine.connect(), engine.connect(), engine.connect():
+        stats = get_pool_stats(engine)
+    await dispose_async_engine(engine)
+
+    assert stats.size == 2
+    assert stats.max_overflow == 1
+    assert stats.checked_out == 3
+    assert stats.overflow == 1
+    assert stats.checkouts == 3
+
+
+@pytest.mark.anyio()
+async def test_server_settings_are_applied_to_connections() -> None:
+    engine = create_async_engine(
+        _db_settings.url, EngineProfile(server_settings={"jit": "off"})
+    )
+
+    async with engine.connect() as conn:
+        jit = await conn.scalar(text("SHOW jit"))
+    await dispose_async_engine(engine)
+
+    assert jit == "off"
+
+
+@pytest.mark.anyio()
+async def test_pgbouncer_profile_executes_queries_without_statement_cache() -> None:
+    engine = create_async_engine(_db_settings.url, EngineProfile(pgbouncer=True))
+
+    async with engine.connect() as conn:
+        result = await conn.scalar(text("SELECT 1"))
+        result = await conn.scalar(text("SELECT 1"))
+    await dispose_async_engine(engine)
+
+    assert result == 1
+
+
+@pytest.mark.anyio()
+async def test_warm_up_pool_opens_pooled_connections() -> None:
+    engine = create_async_engine(_db_settings.url, EngineProfile(pool_size=3))
+
+    await warm_up_pool(engine, 3)
+    stats = get_pool_stats(engine)
+    await dispose_async_engine(engine)
+
+    assert stats.checked_in == 3
+    assert stats.checked_out == 0
+
+
+@pytest.mark.anyio()
+async def test_warm_up_pool_returns_connections_if_cancelled() -> None:
+    engine = create_async_engine(
+        _db_settings.url, EngineProfile(pool_size=1, max_overflow=0)
+    )
+
+    # The second connection waits for the first one, which is held until the end
+    warm_up_task = asyncio.create_task(warm_up_pool(engine, 2))
+    await asyncio.sleep(0.5)
+    warm_up_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await warm_up_task
+    stats = get_pool_stats(engine)
+    await dispose_async_engine(engine)
+
+    assert stats.checked_out == 0
+
+
+@pytest.mark.anyio()
+async def test_track_queries_counts_queries_executed_on_driver_connection(
+    instrumented_engine: AsyncEngine,
+) -> None:
+    with track_queries() as stats:
+        async with AsyncSession(instrumented_engine) as db:
+            conn = await get_driver_connection(db)
+            await conn.fetchrow("SELECT 1")
+
+    assert stats.count == 1
+
+
+@pytest.mark.anyio()
+async def test_nested_query_tracking_counts_queries_in_outer_scope_too(
+    instrumented_engine: AsyncEngine,
+) -> None:
+    with track_queries() as outer_stats:
+        async with instrumented_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            with track_queries() as inner_stats:
+                await conn.execute(text("SELECT 2"))
+
+    assert outer_stats.count == 2
+    assert inner_stats.count == 1
+
+
+@pytest.mark.anyio()
+async def test_failed_query_leaves_no_start_time_behind(
+    instrumented_engine: AsyncEngine,
+) -> None:
+    async with instrumented_engine.connect() as conn:
+        with pytest.raises(DBAPIError):
+            await conn.execute(text("SELECT 1 / 0"))
+        start_times = conn.info[_QUERY_START_TIMES_KEY]
+
+    assert start_times == []
@@ -0,0 +1,23 @@
+import pytest
+from sqlalchemy import select
+
+from backend.libs.db.identifiers import uuid_generate_v7
+from tests.integration.conftest import AsyncSession
+
+
+@pytest.mark.anyio()
+async def test_uuid_generate_v7_generates_version_7_uuid(db: AsyncSession) -> None:
+    uuid = await db.scalar(select(uuid_generate_v7()))
+
+    assert uuid
+    assert uuid.version == 7
+
+
+@pytest.mark.anyio()
+async def test_uuid_generate_v7_generates_time_ordered_uuids(db: AsyncSession) -> None:
+    first = await db.scalar(select(uuid_generate_v7()))
+    second = await db.scalar(select(uuid_generate_v7()))
+
+    assert first
+    assert second
+    assert first.int >> 80 <= second.int >> 80
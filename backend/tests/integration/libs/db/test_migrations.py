@@ -0,0 +1,224 @@
+import subprocess
+import sys
+from collections.abc import AsyncGenerator, Callable
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from backend.libs.db.migrations import (
+    BackfillThrottle,
+    backfill_in_batches,
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+from tests.integration.conftest import AsyncEngine
+
+_BACKEND_PATH = Path(__file__).parents[4]
+
+_THROTTLE = BackfillThrottle(
+    batch_size=3, pause=timedelta(), max_replication_lag=timedelta(seconds=5)
+)
+
+
+def _run_migration(conn: Connection, migration: Callable[[], Any]) -> Any:
+    migration_context = MigrationContext.configure(conn)
+    with migration_context.begin_transaction(), Operations.context(migration_context):
+        return migration()
+
+
+@pytest.fixture(name="_create_table")
+async def _create_table_fixture(db_engine: AsyncEngine) -> AsyncGenerator[None, None]:
+    async with db_engine.begin() as conn:
+        await conn.execute(
+            text("CREATE TABLE backfill (id integer PRIMARY KEY, name varchar)")
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO backfill SELECT i, 'Name ' || i "
+                "FROM generate_series(1, 10) AS i"
+            )
+        )
+    yield
+    async with db_engine.begin() as conn:
+        await conn.execute(text("DROP TABLE backfill"))
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_backfill_checkpoint"))
+
+
+@pytest.mark.usefixtures("_create_table")
+@pytest.mark.anyio()
+async def test_backfill_in_batches_updates_rows(db_engine: AsyncEngine) -> None:
+    async with db_engine.connect() as conn:
+        updated = await conn.run_sync(
+            _run_migration,
+            lambda: backfill_in_batches(
+                "lowercase_names",
+                "backfill",
+                "name = lower(name)",
+                where="name <> lower(name)",
+                throttle=_THROTTLE,
+            ),
+        )
+        names = await conn.scalars(text("SELECT DISTINCT name ~ '[A-Z]' FROM backfill"))
+        checkpoints = await conn.scalar(
+            text("SELECT count(*) FROM alembic_backfill_checkpoint")
+        )
+
+    assert updated == 10
+    assert names.all() == [False]
+    assert checkpoints == 0
+
+
+@pytest.mark.usefixtures("_create_table")
+@pytest.mark.anyio()
+async def test_backfill_in_batches_resumes_from_checkpoint(
+    db_engine: AsyncEngine,
+) -> None:
+    async with db_engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE TABLE alembic_backfill_checkpoint "
+                "(name varchar PRIMARY KEY, last_key varchar NOT NULL)"
+            )
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO alembic_backfill_checkpoint "
+                "VALUES ('lowercase_names', '7')"
+            )
+        )
+
+    async with db_engine.connect() as conn:
+        updated = await conn.run_sync(
+            _run_migration,
+            lambda: backfill_in_batches(
+                "lowercase_names", "backfill", "name = lower(name)", throttle=_THROTTLE
+            ),
+        )
+        names = await conn.scalars(text("SELECT name FROM backfill ORDER BY id"))
+
+    assert updated == 3
+    assert names.all()[6:] == ["Name 7", "name 8", "name 9", "name 10"]
+
+
+@pytest.mark.usefixtures("_create_table")
+@pytest.mark.anyio()
+async def test_create_index_concurrently_creates_index(db_engine: AsyncEngine) -> None:
+    async with db_engine.connect() as conn:
+        await conn.run_sync(
+            _run_migration,
+            lambda: create_index_concurrently(
+                "ix_backfill_lower_name", "backfill", ["lower(name)"], unique=True
+            ),
+        )
+        is_valid = await conn.scalar(
+            text(
+                "SELECT indisvalid FROM pg_index "
+                "WHERE indexrelid = 'ix_backfill_lower_name'::regclass"
+            )
+        )
+        await conn.commit()
+        await conn.run_sync(
+            _run_migration,
+            lambda: drop_index_concurrently("ix_backfill_lower_name", "backfill"),
+        )
+        exists = await conn.scalar(
+            text("SELECT to_regclass('ix_backfill_lower_name') IS NOT NULL")
+        )
+
+    assert is_valid is True
+    assert exists is False
+
+
+@pytest.mark.usefixtures("_create_tables")
+@pytest.mark.anyio()
+async def test_create_index_concurrently_creates_index_on_partitions(
+    db_engine: AsyncEngine,
+) -> None:
+    async with db_engine.connect() as conn:
+        await conn.run_sync(
+            _run_migration,
+            lambda: create_index_concurrently(
+                "ix_user_full_name", "user", ["full_name"]
+            ),
+        )
+        # Resuming the interrupted migration doesn't fail on the existing indexes
+        await conn.run_sync(
+            _run_migration,
+            lambda: create_index_concurrently(
+                "ix_user_full_name", "user", ["full_name"]
+            ),
+        )
+        partition_indexes = await conn.scalar(
+            text(
+                "SELECT count(*) FROM pg_inherits "
+                "WHERE inhparent = 'ix_user_full_name'::regclass"
+            )
+        )
+        is_valid = await conn.scalar(
+            text(
+                "SELECT indisvalid FROM pg_index "
+                "WHERE indexrelid = 'ix_user_full_name'::regclass"
+            )
+        )
+
+    assert partition_indexes == 16
+    assert is_valid is True
+
+
+def _run_alembic(*args: str) -> subprocess.CompletedProcess[str]:
+    # Run in its own process, so that the models defined by the tests aren't
+    # compared with the migrations
+    return subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=_BACKEND_PATH,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_migrations_match_models() -> None:
+    upgrade = _run_alembic("upgrade", "head")
+    try:
+        check = _run_alembic("check")
+    finally:
+        _run_alembic("downgrade", "base")
+
+    assert upgrade.returncode == 0, upgrade.stderr
+    assert check.returncode == 0, check.stderr
+
+
+@pytest.mark.anyio()
+async def test_case_insensitive_emails_migration_lowercases_emails(
+    db_engine: AsyncEngine,
+) -> None:
+    _run_alembic("upgrade", "b1e0c3d4a5f6")
+    try:
+        async with db_engine.begin() as conn:
+            await conn.execute(
+                text(
+                    'INSERT INTO "user" (email, hashed_password, full_name, '
+                    "confirmed_email) VALUES ('Test@Email.com', '', '', false)"
+                )
+            )
+        upgrade = _run_alembic("upgrade", "e7a2d9c41b08")
+        async with db_engine.connect() as conn:
+            emails = (
+                await conn.execute(
+                    text(
+                        'SELECT "user".email, user_email.email FROM "user" '
+                        'JOIN user_email ON user_email.user_id = "user".id'
+                    )
+                )
+            ).one()
+    finally:
+        _run_alembic("downgrade", "base")
+
+    assert upgrade.returncode == 0, upgrade.stderr
+    assert tuple(emails) == ("test@email.com", "test@email.com")
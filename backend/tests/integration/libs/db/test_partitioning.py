@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, text
+
+from backend.libs.db.partitioning import get_hash_partition_names, partition_by_hash
+from tests.integration.conftest import AsyncEngine
+
+
+@pytest.mark.anyio()
+async def test_partition_by_hash_creates_partitions(db_engine: AsyncEngine) -> None:
+    metadata = MetaData()
+    table = Table(
+        "partitioned",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        postgresql_partition_by="HASH (id)",
+    )
+    partition_by_hash(table, 4)
+
+    async with db_engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(table.insert(), [{"id": value} for value in range(1, 101)])
+        result = await conn.execute(
+            text(
+                "SELECT inhrelid::regclass::text, "
+                "(SELECT count(*) FROM partitioned p WHERE p.tableoid = inhrelid) "
+                "FROM pg_inherits WHERE inhparent = 'partitioned'::regclass "
+                "ORDER BY 1"
+            )
+        )
+        partitions = result.all()
+        await conn.run_sync(metadata.drop_all)
+
+    assert [name for name, _ in partitions] == [
+        "partitioned_p0",
+        "partitioned_p1",
+        "partitioned_p2",
+        "partitioned_p3",
+    ]
+    assert sum(count for _, count in partitions) == 100
+
+
+def test_get_hash_partition_names_returns_partitions_of_tables() -> None:
+    metadata = MetaData()
+    table = Table(
+        "partitioned",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        postgresql_partition_by="HASH (id)",
+    )
+    Table("plain", metadata, Column("id", Integer, primary_key=True))
+    partition_by_hash(table, 2)
+
+    assert get_hash_partition_names(metadata) == {"partitioned_p0", "partitioned_p1"}
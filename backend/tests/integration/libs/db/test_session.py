@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from backend.libs.db.session import (
+    SessionTimeouts,
+    create_async_session_factory,
+    is_timeout_error,
+    set_session_timeouts,
+)
+from tests.integration.conftest import AsyncEngine
+
+
+@pytest.mark.anyio()
+async def test_session_factory_applies_timeouts(db_engine: AsyncEngine) -> None:
+    session_factory = create_async_session_factory(
+        db_engine,
+        SessionTimeouts(
+            statement_timeout=timedelta(seconds=1),
+            lock_timeout=timedelta(milliseconds=500),
+            idle_in_transaction_session_timeout=timedelta(seconds=10),
+        ),
+    )
+
+    async with session_factory() as session:
+        statement_timeout = await session.scalar(text("SHOW statement_timeout"))
+        lock_timeout = await session.scalar(text("SHOW lock_timeout"))
+        idle_timeout = await session.scalar(
+            text("SHOW idle_in_transaction_session_timeout")
+        )
+
+    assert statement_timeout == "1s"
+    assert lock_timeout == "500ms"
+    assert idle_timeout == "10s"
+
+
+@pytest.mark.anyio()
+async def test_session_timeouts_are_scoped_to_transaction(
+    db_engine: AsyncEngine,
+) -> None:
+    session_factory = create_async_session_factory(
+        db_engine, SessionTimeouts(statement_timeout=timedelta(seconds=1))
+    )
+
+    async with session_factory() as session:
+        await session.commit()
+    async with db_engine.connect() as conn:
+        statement_timeout = await conn.scalar(text("SHOW statement_timeout"))
+
+    assert statement_timeout == "0"
+
+
+@pytest.mark.anyio()
+async def test_set_session_timeouts_overrides_timeouts_in_transaction(
+    db_engine: AsyncEngine,
+) -> None:
+    session_factory = create_async_session_factory(
+        db_engine, SessionTimeouts(statement_timeout=timedelta(seconds=1))
+    )
+
+    async with session_factory() as session:
+        await session.execute(text("SELECT 1"))
+        await set_session_timeouts(
+            session, SessionTimeouts(statement_timeout=timedelta(seconds=2))
+        )
+        statement_timeout = await session.scalar(text("SHOW statement_timeout"))
+
+    assert statement_timeout == "2s"
+
+
+@pytest.mark.anyio()
+async def test_set_session_timeouts_overrides_timeouts_for_next_transaction(
+    db_engine: AsyncEngine,
+) -> None:
+    session_factory = create_async_session_factory(
+        db_engine, SessionTimeouts(statement_timeout=timedelta(seconds=1))
+    )
+
+    async with session_factory() as session:
+        await set_session_timeouts(
+            session, SessionTimeouts(statement_timeout=timedelta(seconds=2))
+        )
+        statement_timeout = await session.scalar(text("SHOW statement_timeout"))
+
+    assert statement_timeout == "2s"
+
+
+@pytest.mark.anyio()
+async def test_exceeded_statement_timeout_is_timeout_error(
+    db_engine: AsyncEngine,
+) -> None:
+    session_factory = create_async_session_factory(
+        db_engine, SessionTimeouts(statement_timeout=timedelta(milliseconds=10))
+    )
+
+    async with session_factory() as session:
+        with pytest.raises(DBAPIError) as exc_info:
+            await session.execute(text("SELECT pg_sleep(1)"))
+
+    assert is_timeout_error(exc_info.value)
+
+
+@pytest.mark.anyio()
+async def test_other_database_error_is_not_timeout_error(
+    db_engine: AsyncEngine,
+) -> None:
+    session_factory = create_async_session_factory(db_engine)
+
+    async with session_factory() as session:
+        with pytest.raises(DBAPIError) as exc_info:
+            await session.execute(text("SELECT 1 / 0"))
+
+    assert not is_timeout_error(exc_info.value)
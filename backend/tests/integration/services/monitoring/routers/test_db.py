@@ -0,0 +1,21 @@
+import pytest
+from fastapi import status
+from tests.integration.conftest import AsyncClient
+
+
+@pytest.mark.anyio()
+async def test_get_pool_stats_returns_pool_statistics(
+    client: AsyncClient, rest_url: str
+) -> None:
+    response = await client.get(f"{rest_url}/monitoring/db/pool")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json().keys() == {
+        "size",
+        "max_overflow",
+        "checked_in",
+        "checked_out",
+        "overflow",
+        "checkouts",
+        "wait_time",
+    }
@@ -0,0 +1,17 @@
+import pytest
+from fastapi import status
+from tests.integration.conftest import AsyncClient
+
+
+@pytest.mark.anyio()
+async def test_get_graphql_histograms_returns_recorded_histograms(
+    client: AsyncClient, graphql_url: str, rest_url: str
+) -> None:
+    await client.post(graphql_url, json={"query": "query { __typename }"})
+
+    response = await client.get(f"{rest_url}/monitoring/graphql")
+
+    assert response.status_code == status.HTTP_200_OK
+    histograms = response.json()
+    assert histograms.keys() == {"durations", "statements"}
+    assert histograms["durations"]["encode"]["count"] > 0
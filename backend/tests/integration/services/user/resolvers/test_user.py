@@ -1,6 +1,7 @@
 from uuid import UUID
 
 import pytest
+from fastapi import FastAPI
 
 from tests.integration.conftest import AsyncClient, AsyncSession
 from tests.integration.helpers.user import (
@@ -8,6 +9,7 @@ from tests.integration.helpers.user import (
     create_confirmed_user,
     create_user,
 )
+from tests.integration.helpers.websocket import connect_websocket
 
 
 @pytest.mark.anyio()
@@ -43,6 +45,35 @@ async def test_create_user_returns_created_user(
     assert data["fullName"] == "Test User"
 
 
+@pytest.mark.anyio()
+async def test_create_user_normalizes_email(
+    client: AsyncClient, graphql_url: str
+) -> None:
+    query = """
+      mutation CreateUser($input: UserCreateInput!) {
+        createUser(input: $input) {
+          ... on User {
+            email
+          }
+        }
+      }
+    """
+    variables = {
+        "input": {
+            "email": "Test@Email.com",
+            "password": "plain_password",
+            "fullName": "Test User",
+        }
+    }
+
+    response = await client.post(
+        graphql_url, json={"query": query, "variables": variables}
+    )
+
+    data = response.json()["data"]["createUser"]
+    assert data["email"] == "test@email.com"
+
+
 @pytest.mark.anyio()
 async def test_create_user_returns_problem_if_email_is_invalid(
     client: AsyncClient, graphql_url: str
@@ -236,6 +267,61 @@ async def test_get_me_returns_user(
     }
 
 
+@pytest.mark.anyio()
+async def test_get_me_returns_selected_fields_from_fragments(
+    db: AsyncSession, auth_private_key: str, client: AsyncClient, graphql_url: str
+) -> None:
+    user = await create_confirmed_user(
+        db, email="test@email.com", full_name="Test User"
+    )
+    auth_header = create_auth_header(auth_private_key, user.id)
+    query = """
+      query GetMe {
+        me {
+          ...UserName
+          ... on User {
+            email
+          }
+        }
+      }
+
+      fragment UserName on User {
+        fullName
+      }
+    """
+
+    response = await client.post(
+        graphql_url, json={"query": query}, headers=auth_header
+    )
+
+    data = response.json()["data"]["me"]
+    assert data == {"fullName": "Test User", "email": "test@email.com"}
+
+
+@pytest.mark.anyio()
+async def test_get_me_returns_selected_fields_from_fragments_without_type(
+    db: AsyncSession, auth_private_key: str, client: AsyncClient, graphql_url: str
+) -> None:
+    user = await create_confirmed_user(db, email="test@email.com")
+    auth_header = create_auth_header(auth_private_key, user.id)
+    query = """
+      query GetMe {
+        me {
+          ... @include(if: true) {
+            email
+          }
+        }
+      }
+    """
+
+    response = await client.post(
+        graphql_url, json={"query": query}, headers=auth_header
+    )
+
+    data = response.json()["data"]["me"]
+    assert data == {"email": "test@email.com"}
+
+
 @pytest.mark.anyio()
 async def test_update_me_returns_updated_user(
     db: AsyncSession, auth_private_key: str, client: AsyncClient, graphql_url: str
@@ -380,3 +466,64 @@ async def test_delete_me_returns_success_message(
 
     data = response.json()["data"]["deleteMe"]
     assert "message" in data
+
+
+@pytest.mark.anyio()
+async def test_subscribe_me_receives_updated_user(
+    db: AsyncSession,
+    auth_private_key: str,
+    app: FastAPI,
+    client: AsyncClient,
+    graphql_url: str,
+) -> None:
+    user = await create_confirmed_user(db, full_name="Test User")
+    auth_header = create_auth_header(auth_private_key, user.id)
+    subscription = """
+      subscription {
+        me {
+          email
+          fullName
+        }
+      }
+    """
+    mutation = """
+      mutation UpdateMe($input: UpdateMeInput!) {
+        updateMe(input: $input) {
+          ... on User {
+            id
+          }
+        }
+      }
+    """
+    variables = {"input": {"fullName": "Updated User"}}
+
+    async with connect_websocket(app, graphql_url) as websocket:
+        await websocket.receive()
+        await websocket.send_json({"type": "connection_init", "payload": auth_header})
+        await websocket.receive_json()
+        await websocket.send_json(
+            {"id": "1", "type": "subscribe", "payload": {"query": subscription}}
+        )
+        # The round trip lets the subscription start listening before the update
+        await websocket.send_json({"type": "ping"})
+        await websocket.receive_json()
+        await client.post(
+            graphql_url,
+            json={"query": mutation, "variables": variables},
+            headers=auth_header,
+        )
+
+        message = await websocket.receive_json()
+
+    assert message == {
+        "id": "1",
+        "type": "next",
+        "payload": {
+            "data": {
+                "me": {
+                    "email": "test_helper_user@email.com",
+                    "fullName": "Updated User",
+                }
+            }
+        },
+    }
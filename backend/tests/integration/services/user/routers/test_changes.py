@@ -0,0 +1,154 @@
+from datetime import UTC, datetime, timedelta
+
+import orjson
+import pytest
+from fastapi import status
+from sqlalchemy import text
+
+from backend.config.settings import settings
+from tests.integration.conftest import AsyncClient, AsyncSession, AsyncSessionMaker
+from tests.integration.helpers.user import create_user
+
+_user_settings = settings.user
+
+_API_KEY = "test-api-key"
+
+
+@pytest.fixture(name="_change_feed_api_key")
+def _change_feed_api_key_fixture(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(_user_settings, "change_feed_api_key", _API_KEY)
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("_change_feed_api_key")
+async def test_get_user_changes_streams_changed_users(
+    client: AsyncClient, rest_url: str, db: AsyncSession
+) -> None:
+    updated_at = datetime(2024, 1, 1, tzinfo=UTC)
+    user = await create_user(
+        db, email="test@email.com", full_name="Test User", updated_at=updated_at
+    )
+    user_id = user.id
+
+    response = await client.get(
+        f"{rest_url}/users/changes", headers={"Authorization": f"Bearer {_API_KEY}"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    assert [orjson.loads(line) for line in response.text.splitlines()] == [
+        {
+            "id": str(user_id),
+            "email": "test@email.com",
+            "full_name": "Test User",
+            "confirmed_email": False,
+            "updated_at": "2024-01-01T00:00:00+00:00",
+        }
+    ]
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("_change_feed_api_key")
+async def test_get_user_changes_paginates_after_cursor(
+    client: AsyncClient, rest_url: str, db: AsyncSession
+) -> None:
+    updated_at = datetime(2024, 1, 1, tzinfo=UTC)
+    for day in range(3):
+        await create_user(
+            db,
+            email=f"user{day}@email.com",
+            updated_at=updated_at + timedelta(days=day),
+        )
+
+    first_page = await client.get(
+        f"{rest_url}/users/changes",
+        params={"limit": 2},
+        headers={"Authorization": f"Bearer {_API_KEY}"},
+    )
+    last_change = orjson.loads(first_page.text.splitlines()[-1])
+    second_page = await client.get(
+        f"{rest_url}/users/changes",
+        params={
+            "limit": 2,
+            "updated_after": last_change["updated_at"],
+            "after_id": last_change["id"],
+        },
+        headers={"Authorization": f"Bearer {_API_KEY}"},
+    )
+
+    first_emails = [
+        orjson.loads(line)["email"] for line in first_page.text.splitlines()
+    ]
+    second_emails = [
+        orjson.loads(line)["email"] for line in second_page.text.splitlines()
+    ]
+    assert first_emails == ["user0@email.com", "user1@email.com"]
+    assert second_emails == ["user2@email.com"]
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("_change_feed_api_key")
+async def test_get_user_changes_holds_back_recent_changes(
+    client: AsyncClient, rest_url: str, db: AsyncSession
+) -> None:
+    await create_user(db)
+
+    response = await client.get(
+        f"{rest_url}/users/changes", headers={"Authorization": f"Bearer {_API_KEY}"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not response.text
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("_change_feed_api_key")
+async def test_get_user_changes_rejects_invalid_api_key(
+    client: AsyncClient, rest_url: str
+) -> None:
+    response = await client.get(
+        f"{rest_url}/users/changes", headers={"Authorization": "Bearer invalid"}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio()
+async def test_get_user_changes_is_disabled_without_api_key(
+    client: AsyncClient, rest_url: str
+) -> None:
+    response = await client.get(f"{rest_url}/users/changes")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("_change_feed_api_key")
+async def test_get_user_changes_holds_back_changes_until_older_transactions_end(
+    monkeypatch: pytest.MonkeyPatch,
+    client: AsyncClient,
+    rest_url: str,
+    db: AsyncSession,
+    session_factory: AsyncSessionMaker,
+) -> None:
+    monkeypatch.setattr(_user_settings, "change_feed_delay", timedelta(0))
+    headers = {"Authorization": f"Bearer {_API_KEY}"}
+
+    async with session_factory() as concurrent_db:
+        # Started before the user is created, so it could still commit older changes
+        await concurrent_db.execute(text("SELECT 1"))
+        await create_user(db, email="test@email.com")
+        held_back_response = await client.get(
+            f"{rest_url}/users/changes", headers=headers
+        )
+        # The requests share the session of the test, whose transaction would keep
+        # seeing the same activity of the other sessions
+        await db.rollback()
+    released_response = await client.get(f"{rest_url}/users/changes", headers=headers)
+
+    assert not held_back_response.text
+    assert [
+        orjson.loads(line)["email"] for line in released_response.text.splitlines()
+    ] == ["test@email.com"]
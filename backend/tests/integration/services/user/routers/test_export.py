@@ -0,0 +1,122 @@
+import csv
+from collections.abc import Generator
+from datetime import UTC, datetime
+
+import orjson
+import pytest
+from fastapi import FastAPI, status
+
+from backend.config.settings import settings
+from backend.db import get_background_session_factory
+from backend.libs.db.session import AsyncSessionMaker
+from tests.integration.conftest import AsyncClient, AsyncSession
+from tests.integration.helpers.user import create_user
+
+_user_settings = settings.user
+
+_API_KEY = "test-api-key"
+
+
+@pytest.fixture(name="_export_api_key")
+def _export_api_key_fixture(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_user_settings, "export_api_key", _API_KEY)
+    monkeypatch.setattr(_user_settings, "export_chunk_size", 2)
+
+
+@pytest.fixture(name="_background_session_factory")
+def _background_session_factory_fixture(
+    app: FastAPI, session_factory: AsyncSessionMaker
+) -> Generator[None, None, None]:
+    app.dependency_overrides[get_background_session_factory] = lambda: session_factory
+    yield
+    del app.dependency_overrides[get_background_session_factory]
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("_export_api_key", "_background_session_factory")
+async def test_export_users_streams_ndjson(
+    client: AsyncClient, rest_url: str, db: AsyncSession
+) -> None:
+    created_at = datetime(2024, 1, 1, tzinfo=UTC)
+    for number in range(3):
+        await create_user(
+            db,
+            email=f"user{number}@email.com",
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+    response = await client.get(
+        f"{rest_url}/users/export", headers={"Authorization": f"Bearer {_API_KEY}"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    assert (
+        response.headers["Content-Disposition"] == 'attachment; filename="users.ndjson"'
+    )
+    users = [orjson.loads(line) for line in response.text.splitlines()]
+    assert sorted(user["email"] for user in users) == [
+        "user0@email.com",
+        "user1@email.com",
+        "user2@email.com",
+    ]
+    assert users[0].keys() == {
+        "id",
+        "email",
+        "full_name",
+        "confirmed_email",
+        "last_login",
+        "created_at",
+        "updated_at",
+    }
+    assert users[0]["created_at"] == "2024-01-01T00:00:00+00:00"
+    assert "hashed_password" not in users[0]
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("_export_api_key", "_background_session_factory")
+async def test_export_users_streams_csv(
+    client: AsyncClient, rest_url: str, db: AsyncSession
+) -> None:
+    await create_user(db, email="test@email.com", full_name="Test, User")
+
+    response = await client.get(
+        f"{rest_url}/users/export",
+        params={"format": "csv"},
+        headers={"Authorization": f"Bearer {_API_KEY}"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Type"].startswith("text/csv")
+    rows = list(csv.DictReader(response.text.splitlines()))
+    assert len(rows) == 1
+    assert rows[0]["email"] == "test@email.com"
+    assert rows[0]["full_name"] == "Test, User"
+
+
+@pytest.mark.anyio()
+@pytest.mark.usefixtures("_export_api_key", "_background_session_factory", "db")
+async def test_export_users_streams_csv_header_without_users(
+    client: AsyncClient, rest_url: str
+) -> None:
+    response = await client.get(
+        f"{rest_url}/users/export",
+        params={"format": "csv"},
+        headers={"Authorization": f"Bearer {_API_KEY}"},
+    )
+
+    assert response.text.splitlines() == [
+        "id,email,full_name,confirmed_email,last_login,created_at,updated_at"
+    ]
+
+
+@pytest.mark.anyio()
+async def test_export_users_is_disabled_without_api_key(
+    client: AsyncClient, rest_url: str
+) -> None:
+    response = await client.get(
+        f"{rest_url}/users/export", headers={"Authorization": "Bearer "}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
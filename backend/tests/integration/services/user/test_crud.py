@@ -0,0 +1,245 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import pytest
+
+from backend.libs.db.crud import NoObjectFoundError
+from backend.services.user.crud import (
+    UserCreateData,
+    UserCRUD,
+    UserFilters,
+    UserKey,
+    UserUpdateData,
+    delete_unconfirmed_users,
+    insert_new_users,
+    read_user_columns,
+    read_user_records,
+    update_user_columns,
+)
+from backend.services.user.models import User
+from tests.integration.conftest import AsyncSession, AsyncSessionMaker
+from tests.integration.helpers.user import create_confirmed_user, create_user
+
+
+@pytest.mark.anyio()
+async def test_read_one_filters_email_case_insensitively(db: AsyncSession) -> None:
+    user = await create_user(db, email="test@email.com")
+
+    found_user = await UserCRUD(db=db).read_one(UserFilters(email="TEST@Email.com"))
+
+    assert found_user.id == user.id
+
+
+@pytest.mark.anyio()
+async def test_read_user_columns_returns_only_requested_columns(
+    db: AsyncSession,
+) -> None:
+    user = await create_user(db, email="test@email.com", full_name="Test User")
+
+    user_columns = await read_user_columns(db, user.id, ["full_name"])
+
+    assert user_columns == {"id": user.id, "full_name": "Test User"}
+
+
+@pytest.mark.anyio()
+async def test_read_user_columns_raises_exception_if_user_does_not_exist(
+    db: AsyncSession,
+) -> None:
+    await create_user(db, id=UUID("6d9c79d6-9641-4746-92d9-2cc9ebdca941"))
+
+    with pytest.raises(NoObjectFoundError):
+        await read_user_columns(
+            db, UUID("1a4a2a27-1a3d-4ad4-a6c4-ec4a6fa5f4b2"), ["email"]
+        )
+
+
+@pytest.mark.anyio()
+async def test_update_user_columns_updates_user_and_returns_requested_columns(
+    db: AsyncSession,
+) -> None:
+    user = await create_user(db, email="test@email.com", full_name="Test User")
+    user_id, updated_at = user.id, user.updated_at
+
+    user_columns = await update_user_columns(
+        db, user_id, UserUpdateData(full_name="Updated User"), ["full_name"]
+    )
+
+    assert user_columns == {"id": user_id, "full_name": "Updated User"}
+    updated_user = await db.get_one(User, user_id, populate_existing=True)
+    assert updated_user.full_name == "Updated User"
+    assert updated_user.email == "test@email.com"
+    assert updated_user.updated_at > updated_at
+
+
+@pytest.mark.anyio()
+async def test_update_user_columns_reads_columns_if_there_is_nothing_to_update(
+    db: AsyncSession,
+) -> None:
+    user = await create_user(db, full_name="Test User")
+
+    user_columns = await update_user_columns(
+        db, user.id, UserUpdateData(), ["full_name"]
+    )
+
+    assert user_columns == {"id": user.id, "full_name": "Test User"}
+
+
+@pytest.mark.anyio()
+async def test_update_user_columns_raises_exception_if_user_does_not_exist(
+    db: AsyncSession,
+) -> None:
+    with pytest.raises(NoObjectFoundError):
+        await update_user_columns(
+            db,
+            UUID("1a4a2a27-1a3d-4ad4-a6c4-ec4a6fa5f4b2"),
+            UserUpdateData(full_name="Updated User"),
+            ["full_name"],
+        )
+
+
+@pytest.mark.anyio()
+async def test_read_user_records_returns_existing_user_records(
+    db: AsyncSession,
+) -> None:
+    first_user_id = (await create_user(db, email="first@email.com")).id
+    second_user_id = (await create_user(db, email="second@email.com")).id
+    await create_user(db, email="third@email.com")
+
+    records = await read_user_records(
+        db,
+        [first_user_id, second_user_id, UUID("1a4a2a27-1a3d-4ad4-a6c4-ec4a6fa5f4b2")],
+    )
+
+    assert {record.email for record in records} == {
+        "first@email.com",
+        "second@email.com",
+    }
+
+
+@pytest.mark.anyio()
+async def test_delete_unconfirmed_users_deletes_stale_unconfirmed_users(
+    db: AsyncSession,
+) -> None:
+    created_before = datetime.now(UTC)
+    stale_user = await create_user(
+        db, email="stale@email.com", created_at=created_before - timedelta(days=1)
+    )
+    stale_user_key = UserKey(stale_user.created_at, stale_user.id)
+    confirmed_user = await create_confirmed_user(
+        db, email="confirmed@email.com", created_at=created_before - timedelta(days=1)
+    )
+    confirmed_user_id = confirmed_user.id
+    recent_user = await create_user(
+        db, email="recent@email.com", created_at=created_before + timedelta(days=1)
+    )
+    recent_user_id = recent_user.id
+
+    deleted_keys = await delete_unconfirmed_users(db, created_before, 10, None)
+
+    assert deleted_keys == [stale_user_key]
+    assert not await db.get(User, stale_user_key.id)
+    assert await db.get(User, confirmed_user_id)
+    assert await db.get(User, recent_user_id)
+
+
+@pytest.mark.anyio()
+async def test_delete_unconfirmed_users_deletes_limited_batch_after_key(
+    db: AsyncSession,
+) -> None:
+    created_before = datetime.now(UTC)
+    keys = []
+    for day in (3, 2, 1):
+        user = await create_user(
+            db,
+            email=f"user{day}@email.com",
+            created_at=created_before - timedelta(days=day),
+        )
+        keys.append(UserKey(user.created_at, user.id))
+
+    deleted_keys = await delete_unconfirmed_users(db, created_before, 1, keys[0])
+
+    assert deleted_keys == [keys[1]]
+    assert await db.get(User, keys[0].id)
+    assert await db.get(User, keys[2].id)
+
+
+@pytest.mark.anyio()
+async def test_insert_new_users_inserts_users(db: AsyncSession) -> None:
+    data = [
+        UserCreateData(
+            email=f"user{number}@email.com",
+            hashed_password="hashed_password",
+            full_name="Test User",
+        )
+        for number in range(2)
+    ]
+
+    records = await insert_new_users(db, data)
+
+    assert sorted(record.email for record in records) == [
+        "user0@email.com",
+        "user1@email.com",
+    ]
+    for record in records:
+        user = await db.get_one(User, record.id)
+        assert user.hashed_password == "hashed_password"
+        assert not user.confirmed_email
+
+
+@pytest.mark.anyio()
+async def test_insert_new_users_skips_registered_emails(db: AsyncSession) -> None:
+    await create_user(db, email="registered@email.com")
+    data = [
+        UserCreateData(
+            email=email, hashed_password="hashed_password", full_name="Test User"
+        )
+        for email in ("registered@email.com", "new@email.com")
+    ]
+
+    records = await insert_new_users(db, data)
+
+    assert [record.email for record in records] == ["new@email.com"]
+
+
+@pytest.mark.anyio()
+async def test_insert_new_users_skips_emails_registered_concurrently(
+    db: AsyncSession, session_factory: AsyncSessionMaker
+) -> None:
+    data = [
+        UserCreateData(
+            email=email, hashed_password="hashed_password", full_name="Test User"
+        )
+        for email in ("registered@email.com", "new@email.com")
+    ]
+
+    async with session_factory() as other_db:
+        # Registered, but not committed, before the import claims the emails
+        other_db.add(
+            User(
+                email="registered@email.com",
+                hashed_password="hashed_password",
+                full_name="Test User",
+            )
+        )
+        await other_db.flush()
+        insert_task = asyncio.create_task(insert_new_users(db, data))
+        await asyncio.sleep(0.1)
+        await other_db.commit()
+        records = await insert_task
+
+    assert [record.email for record in records] == ["new@email.com"]
+
+
+@pytest.mark.anyio()
+async def test_insert_new_users_skips_repeated_emails(db: AsyncSession) -> None:
+    data = [
+        UserCreateData(
+            email=email, hashed_password="hashed_password", full_name="Test User"
+        )
+        for email in ("new@email.com", "NEW@email.com")
+    ]
+
+    records = await insert_new_users(db, data)
+
+    assert len(records) == 1
@@ -0,0 +1,93 @@
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager, suppress
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+
+from backend.services.user.crud import UserCRUD
+from backend.services.user.operations.auth import (
+    AuthTokensManager,
+    PasswordManager,
+    login,
+)
+from backend.services.user.operations.password import recover_password
+from backend.services.user.operations.types import UserCRUDProtocol
+from backend.services.user.operations.user import create_user as create_user_operation
+from backend.services.user.schemas import CredentialsSchema, UserCreateSchema
+from tests.integration.conftest import AsyncEngine, AsyncSession
+from tests.integration.helpers.user import create_user
+
+
+async def _hash_password(_: str) -> str:
+    return "hashed_password"
+
+
+async def _validate_password(*_: str) -> tuple[bool, None]:
+    return False, None
+
+
+async def _create_token(_: Any) -> str:
+    return "token"
+
+
+async def _login(crud: UserCRUDProtocol) -> None:
+    await login(
+        CredentialsSchema(email="TEST@Email.com", password="password"),
+        PasswordManager(validator=_validate_password, hasher=_hash_password),
+        AuthTokensManager(
+            access_token_creator=_create_token, refresh_token_creator=_create_token
+        ),
+        crud,
+        lambda *_: None,
+    )
+
+
+async def _sign_up(crud: UserCRUDProtocol) -> None:
+    await create_user_operation(
+        UserCreateSchema(
+            email="TEST@Email.com", password="password", full_name="Test User"
+        ),
+        _hash_password,
+        crud,
+    )
+
+
+async def _recover_password(crud: UserCRUDProtocol) -> None:
+    await recover_password("TEST@Email.com", crud)
+
+
+@contextmanager
+def _capture_statements(engine: AsyncEngine) -> Iterator[list[tuple[str, Any]]]:
+    statements = []
+
+    def capture(*args: Any) -> None:
+        statements.append((args[2], args[3]))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize("operation", [_login, _sign_up, _recover_password])
+async def test_email_lookup_uses_index_scan(
+    operation: Callable[[UserCRUDProtocol], Awaitable[None]],
+    db: AsyncSession,
+    db_engine: AsyncEngine,
+) -> None:
+    await create_user(db, email="test@email.com")
+
+    with _capture_statements(db_engine) as statements, suppress(Exception):
+        await operation(UserCRUD(db=db))
+    statement, parameters = statements[0]
+    conn = await db.connection()
+    # The tables are too small for the planner to prefer the index on its own
+    await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    plan = "\n".join(row[0] for row in result)
+
+    assert "Index Cond: (lower((email)::text) = 'test@email.com'::text)" in plan
+    assert "Seq Scan" not in plan
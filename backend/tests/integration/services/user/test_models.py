@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from backend.services.user.models import UserEmail
+from tests.integration.conftest import AsyncSession
+from tests.integration.helpers.db import save_to_db
+from tests.integration.helpers.user import create_user
+
+
+@pytest.mark.anyio()
+async def test_user_email_is_added_to_lookup_table(db: AsyncSession) -> None:
+    user = await create_user(db, email="test@email.com")
+
+    user_email = await db.scalar(
+        select(UserEmail).where(UserEmail.email == "test@email.com")
+    )
+
+    assert user_email
+    assert user_email.user_id == user.id
+
+
+@pytest.mark.anyio()
+async def test_user_email_is_updated_in_lookup_table(db: AsyncSession) -> None:
+    user = await create_user(db, email="test@email.com")
+    user.email = "updated@email.com"
+    await save_to_db(db, user)
+
+    emails = await db.scalars(select(UserEmail.email))
+
+    assert emails.all() == ["updated@email.com"]
+
+
+@pytest.mark.anyio()
+async def test_user_email_is_removed_from_lookup_table(db: AsyncSession) -> None:
+    user = await create_user(db, email="test@email.com")
+    await db.delete(user)
+    await db.commit()
+
+    emails = await db.scalars(select(UserEmail.email))
+
+    assert emails.all() == []
+
+
+@pytest.mark.anyio()
+async def test_user_email_must_be_unique(db: AsyncSession) -> None:
+    await create_user(db, email="test@email.com")
+
+    with pytest.raises(IntegrityError):
+        await create_user(db, email="test@email.com")
+
+
+@pytest.mark.anyio()
+async def test_user_email_must_be_unique_regardless_of_case(db: AsyncSession) -> None:
+    await create_user(db, email="test@email.com")
+
+    with pytest.raises(IntegrityError):
+        await create_user(db, email="TEST@Email.com")
@@ -0,0 +1,150 @@
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+import pytest
+import strawberry
+from graphql import DocumentNode
+from strawberry.extensions import MaxTokensLimiter, SchemaExtension
+
+from backend.api.graphql.extensions import (
+    create_document_cache_extension,
+    create_tracing_extension,
+)
+from backend.libs.api.tracing import Histograms
+
+
+async def _get_farewell() -> str:
+    return "Bye"
+
+
+@strawberry.type
+class Query:
+    greeting: str = "Hello"
+    farewell: str = strawberry.field(resolver=_get_farewell)
+
+
+@dataclass
+class _Request:
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class _Context:
+    request: _Request
+
+
+class _DocumentRecorder(SchemaExtension):
+    documents: list[DocumentNode] = []  # noqa: RUF012
+
+    def on_execute(self) -> Iterator[None]:
+        assert self.execution_context.graphql_document
+        self.documents.append(self.execution_context.graphql_document)
+        yield
+
+
+def create_schema() -> strawberry.Schema:
+    return strawberry.Schema(
+        query=Query,
+        extensions=[create_document_cache_extension(10, 10), _DocumentRecorder],
+    )
+
+
+@pytest.mark.anyio()
+async def test_document_cache_reuses_parsed_documents() -> None:
+    schema = create_schema()
+    _DocumentRecorder.documents = []
+
+    first_result = await schema.execute("query { greeting }", root_value=Query())
+    second_result = await schema.execute("query { greeting }", root_value=Query())
+
+    assert first_result.data == second_result.data == {"greeting": "Hello"}
+    first_document, second_document = _DocumentRecorder.documents
+    assert first_document is second_document
+
+
+@pytest.mark.anyio()
+async def test_document_cache_reports_cached_validation_errors() -> None:
+    schema = create_schema()
+
+    first_result = await schema.execute("query { unknown }")
+    second_result = await schema.execute("query { unknown }")
+
+    assert first_result.errors
+    assert second_result.errors
+    assert first_result.errors[0].message == second_result.errors[0].message
+
+
+@pytest.mark.anyio()
+async def test_document_cache_reports_syntax_errors() -> None:
+    schema = create_schema()
+
+    result = await schema.execute("query {")
+
+    assert result.errors
+    assert "Syntax Error" in result.errors[0].message
+
+
+@pytest.mark.anyio()
+async def test_document_cache_respects_parse_options() -> None:
+    schema = strawberry.Schema(
+        query=Query,
+        extensions=[create_document_cache_extension(10, 10), MaxTokensLimiter(3)],
+    )
+
+    result = await schema.execute("query { greeting }", root_value=Query())
+
+    assert result.errors
+    assert "Document contains more than 3 tokens" in result.errors[0].message
+
+
+def create_traced_schema(
+    durations: Histograms, sample_rate: float, trace_header: str | None = None
+) -> strawberry.Schema:
+    tracing_extension = create_tracing_extension(
+        durations, Histograms(buckets=(1,)), sample_rate, trace_header
+    )
+    return strawberry.Schema(query=Query, extensions=[tracing_extension])
+
+
+@pytest.mark.anyio()
+async def test_tracing_records_phases_and_async_resolvers() -> None:
+    durations = Histograms(buckets=(1,))
+    schema = create_traced_schema(durations, sample_rate=1)
+
+    await schema.execute("query { greeting farewell }", root_value=Query())
+
+    assert durations.snapshot().keys() == {
+        "operation",
+        "parse",
+        "validate",
+        "execute",
+        "resolver:Query.farewell",
+    }
+
+
+@pytest.mark.anyio()
+async def test_tracing_records_nothing_if_operation_is_not_sampled() -> None:
+    durations = Histograms(buckets=(1,))
+    schema = create_traced_schema(durations, sample_rate=0)
+
+    result = await schema.execute("query { farewell }", root_value=Query())
+
+    assert not result.extensions
+    assert durations.snapshot() == {}
+
+
+@pytest.mark.anyio()
+async def test_tracing_returns_trace_if_requested_with_header() -> None:
+    durations = Histograms(buckets=(1,))
+    schema = create_traced_schema(durations, sample_rate=0, trace_header="X-Trace")
+    context = _Context(request=_Request(headers={"X-Trace": "1"}))
+
+    result = await schema.execute(
+        "query { farewell }", root_value=Query(), context_value=context
+    )
+
+    assert result.extensions
+    trace = result.extensions["tracing"]
+    assert trace["phases"].keys() == {"operation", "parse", "validate", "execute"}
+    assert trace["resolvers"].keys() == {"Query.farewell"}
+    assert "operation" in durations.snapshot()
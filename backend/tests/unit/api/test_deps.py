@@ -3,9 +3,19 @@ from uuid import UUID
 
 import pytest
 
-from backend.api.deps import UnauthorizedError, get_confirmed_user
+from backend.api.deps import (
+    UnauthorizedError,
+    get_confirmed_user,
+    get_confirmed_user_columns,
+)
 from backend.libs.security.token import InvalidTokenError
-from tests.unit.helpers.user import UserCRUD, create_confirmed_user, create_user
+from tests.unit.helpers.user import (
+    UserColumnsReader,
+    UserCRUD,
+    create_confirmed_user,
+    create_user,
+    create_user_record,
+)
 
 
 @dataclass
@@ -117,3 +127,58 @@ async def test_get_confirmed_user_raises_exception_if_user_email_is_not_confirme
 
     with pytest.raises(UnauthorizedError, match="Invalid token"):
         await get_confirmed_user(request, read_token, crud)
+
+
+@pytest.mark.anyio()
+async def test_get_confirmed_user_columns_retrieves_confirmed_user_columns() -> None:
+    request = Request(headers={"Authorization": "Bearer test-token"})
+    record = create_user_record(
+        id=UUID("6d9c79d6-9641-4746-92d9-2cc9ebdca941"), full_name="Test User"
+    )
+    columns_reader = UserColumnsReader(existing_record=record)
+
+    async def read_token(_: str) -> dict[str, str]:
+        return {
+            "sub": "6d9c79d6-9641-4746-92d9-2cc9ebdca941",
+            "type": "access",
+        }
+
+    user_columns = await get_confirmed_user_columns(
+        request, ["full_name"], read_token, columns_reader
+    )
+
+    assert user_columns == {
+        "id": UUID("6d9c79d6-9641-4746-92d9-2cc9ebdca941"),
+        "full_name": "Test User",
+        "confirmed_email": True,
+    }
+
+
+@pytest.mark.anyio()
+async def test_get_confirmed_user_columns_raises_exception_if_token_is_missing() -> None:
+    request = Request(headers={})
+    columns_reader = UserColumnsReader()
+
+    async def read_token(_: str) -> dict[str, str]:
+        return {
+            "sub": "6d9c79d6-9641-4746-92d9-2cc9ebdca941",
+            "type": "access",
+        }
+
+    with pytest.raises(UnauthorizedError, match="Authentication token required"):
+        await get_confirmed_user_columns(request, [], read_token, columns_reader)
+
+
+@pytest.mark.anyio()
+async def test_get_confirmed_user_columns_raises_exception_if_user_is_not_found() -> None:
+    request = Request(headers={"Authorization": "Bearer test-token"})
+    columns_reader = UserColumnsReader()
+
+    async def read_token(_: str) -> dict[str, str]:
+        return {
+            "sub": "6d9c79d6-9641-4746-92d9-2cc9ebdca941",
+            "type": "access",
+        }
+
+    with pytest.raises(UnauthorizedError, match="Invalid token"):
+        await get_confirmed_user_columns(request, [], read_token, columns_reader)
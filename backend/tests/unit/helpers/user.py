@@ -1,11 +1,15 @@
+from collections.abc import Collection
 from dataclasses import asdict
+from datetime import datetime
 from typing import Any
+from uuid import UUID, uuid4
 
 from backend.libs.db.crud import NoObjectFoundError
 from backend.libs.types.unset import is_unset
 from backend.services.user.crud import (
     UserCreateData,
     UserFilters,
+    UserRecord,
     UserUpdateData,
 )
 from backend.services.user.models import User
@@ -17,6 +21,30 @@ def create_confirmed_user(**kwargs: Any) -> User:
     return create_user(**kwargs)
 
 
+def create_user_record(**kwargs: Any) -> UserRecord:
+    default_attributes: dict[str, Any] = {
+        "id": uuid4(),
+        "email": "test_helper_user@email.com",
+        "full_name": "Test Helper User",
+        "confirmed_email": True,
+        "updated_at": datetime(2024, 1, 1),
+    }
+    return UserRecord(**default_attributes | kwargs)
+
+
+class UserColumnsReader:
+    def __init__(self, existing_record: UserRecord | None = None):
+        self._existing_record = existing_record
+
+    async def __call__(self, user_id: UUID, columns: Collection[str]) -> dict[str, Any]:
+        if self._existing_record and self._existing_record.id == user_id:
+            return {
+                column: getattr(self._existing_record, column)
+                for column in ("id", *columns)
+            }
+        raise NoObjectFoundError
+
+
 def create_user(**kwargs: Any) -> User:
     default_attributes = {
         "email": "test_helper_user@email.com",
@@ -0,0 +1,56 @@
+import pytest
+from redis.asyncio import Redis
+
+from backend.libs.api.broadcast import Broadcaster
+
+
+@pytest.mark.anyio()
+async def test_broadcaster_delivers_messages_to_every_subscriber_of_channel() -> None:
+    broadcaster = Broadcaster()
+
+    async with broadcaster.subscribe(
+        "channel"
+    ) as first_messages, broadcaster.subscribe(
+        "channel"
+    ) as second_messages, broadcaster.subscribe(
+        "other"
+    ) as other_messages:
+        await broadcaster.publish("channel", b"message")
+        await broadcaster.publish("other", b"other message")
+
+        assert await anext(first_messages) == b"message"
+        assert await anext(second_messages) == b"message"
+        assert await anext(other_messages) == b"other message"
+
+
+@pytest.mark.anyio()
+async def test_broadcaster_drops_oldest_messages_of_slow_subscriber() -> None:
+    broadcaster = Broadcaster(queue_size=2)
+
+    async with broadcaster.subscribe("channel") as messages:
+        for message in (b"first", b"second", b"third"):
+            await broadcaster.publish("channel", message)
+
+        assert [await anext(messages), await anext(messages)] == [b"second", b"third"]
+
+
+@pytest.mark.anyio()
+async def test_broadcaster_does_not_deliver_messages_after_unsubscribing() -> None:
+    broadcaster = Broadcaster()
+    async with broadcaster.subscribe("channel"):
+        pass
+
+    async with broadcaster.subscribe("channel") as messages:
+        await broadcaster.publish("channel", b"message")
+
+        assert await anext(messages) == b"message"
+
+
+@pytest.mark.anyio()
+async def test_broadcaster_does_not_raise_if_redis_is_unavailable() -> None:
+    redis = Redis.from_url("redis://localhost:1", socket_connect_timeout=1)
+    broadcaster = Broadcaster(redis)
+
+    await broadcaster.publish("channel", b"message")
+
+    await broadcaster.close()
@@ -1,6 +1,10 @@
 import pytest
 
-from backend.libs.api.headers import BearerTokenNotFoundError, read_bearer_token
+from backend.libs.api.headers import (
+    BearerTokenNotFoundError,
+    matches_etag,
+    read_bearer_token,
+)
 
 
 def test_read_bearer_token_retrieves_token() -> None:
@@ -30,3 +34,26 @@ def test_read_bearer_token_raises_exception_if_token_is_not_bearer_token() -> No
 
     with pytest.raises(BearerTokenNotFoundError):
         read_bearer_token(headers)
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "matches"),
+    [
+        ('"test-etag"', True),
+        ('W/"test-etag"', True),
+        ('"other-etag", "test-etag"', True),
+        ("*", True),
+        ('"other-etag"', False),
+        ("", False),
+    ],
+)
+def test_matches_etag_compares_etag_with_if_none_match_header(
+    if_none_match: str, matches: bool
+) -> None:
+    headers = {"If-None-Match": if_none_match}
+
+    assert matches_etag(headers, '"test-etag"') == matches
+
+
+def test_matches_etag_returns_false_if_header_is_missing() -> None:
+    assert not matches_etag({}, '"test-etag"')
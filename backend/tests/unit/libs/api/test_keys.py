@@ -0,0 +1,30 @@
+import pytest
+
+from backend.libs.api.keys import InvalidAPIKeyError, validate_api_key
+
+
+def test_validate_api_key_accepts_matching_key() -> None:
+    headers = {"Authorization": "Bearer test-key"}
+
+    validate_api_key(headers, "test-key")
+
+
+def test_validate_api_key_raises_exception_if_key_does_not_match() -> None:
+    headers = {"Authorization": "Bearer invalid-key"}
+
+    with pytest.raises(InvalidAPIKeyError):
+        validate_api_key(headers, "test-key")
+
+
+def test_validate_api_key_raises_exception_if_key_is_missing() -> None:
+    headers = {"Content-Type": "application/json"}
+
+    with pytest.raises(InvalidAPIKeyError):
+        validate_api_key(headers, "test-key")
+
+
+def test_validate_api_key_raises_exception_if_key_is_not_configured() -> None:
+    headers = {"Authorization": "Bearer "}
+
+    with pytest.raises(InvalidAPIKeyError):
+        validate_api_key(headers, None)
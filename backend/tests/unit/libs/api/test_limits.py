@@ -0,0 +1,120 @@
+from graphql import build_schema, parse, validate
+
+from backend.libs.api.limits import (
+    ConnectionLimiter,
+    CostLimit,
+    create_cost_limit_rule,
+)
+
+_SCHEMA = build_schema(
+    """
+    type User {
+      email: String!
+    }
+
+    type Query {
+      me: User!
+    }
+
+    type Mutation {
+      login(password: String!): String!
+    }
+    """
+)
+
+
+def test_cost_limit_rule_accepts_operation_within_limit() -> None:
+    rule = create_cost_limit_rule(max_cost=10, field_costs={"Mutation.login": 10})
+    document = parse('mutation { login(password: "secret") }')
+
+    errors = validate(_SCHEMA, document, [rule])
+
+    assert errors == []
+
+
+def test_cost_limit_rule_rejects_operation_exceeding_limit() -> None:
+    rule = create_cost_limit_rule(max_cost=10, field_costs={"Mutation.login": 10})
+    document = parse(
+        'mutation Login { a: login(password: "a") b: login(password: "b") }'
+    )
+
+    errors = validate(_SCHEMA, document, [rule])
+
+    assert [error.message for error in errors] == [
+        "Operation 'Login' has a cost of 20, which exceeds the maximum cost of 10"
+    ]
+
+
+def test_cost_limit_rule_uses_default_cost() -> None:
+    rule = create_cost_limit_rule(max_cost=2, field_costs={}, default_cost=2)
+    document = parse("query { me { email } }")
+
+    errors = validate(_SCHEMA, document, [rule])
+
+    assert [error.message for error in errors] == [
+        "Operation 'anonymous' has a cost of 4, which exceeds the maximum cost of 2"
+    ]
+
+
+def test_cost_limit_rule_includes_fragments() -> None:
+    rule = create_cost_limit_rule(max_cost=3, field_costs={})
+    document = parse(
+        """
+        query Me { me { ...Emails } }
+        fragment Emails on User { ...Email second: email }
+        fragment Email on User { email third: email }
+        """
+    )
+
+    errors = validate(_SCHEMA, document, [rule])
+
+    assert [error.message for error in errors] == [
+        "Operation 'Me' has a cost of 4, which exceeds the maximum cost of 3"
+    ]
+
+
+def test_cost_limit_rule_reports_every_operation_separately() -> None:
+    rule = create_cost_limit_rule(max_cost=1, field_costs={})
+    document = parse("query First { me { email } } query Second { me { email } }")
+
+    errors = validate(_SCHEMA, document, [rule])
+
+    assert len(errors) == 2
+
+
+def test_cost_limit_gets_cost_of_selected_operation() -> None:
+    cost_limit = CostLimit(max_cost=10, field_costs={"Mutation.login": 10})
+    document = parse(
+        'query Me { me { email } } mutation Login { login(password: "secret") }'
+    )
+
+    cost = cost_limit.get_cost(_SCHEMA, document, "Login")
+
+    assert cost == 10
+
+
+def test_cost_limit_gets_cost_of_every_operation_if_none_is_selected() -> None:
+    cost_limit = CostLimit(max_cost=10, field_costs={}, default_cost=2)
+    document = parse("query First { me { email } } query Second { me { email } }")
+
+    cost = cost_limit.get_cost(_SCHEMA, document, None)
+
+    assert cost == 8
+
+
+def test_connection_limiter_refuses_connections_over_the_limit() -> None:
+    limiter = ConnectionLimiter(max_connections=2)
+
+    acquired = [limiter.acquire() for _ in range(3)]
+
+    assert acquired == [True, True, False]
+    assert len(limiter) == 2
+
+
+def test_connection_limiter_accepts_connections_after_release() -> None:
+    limiter = ConnectionLimiter(max_connections=1)
+    limiter.acquire()
+
+    limiter.release()
+
+    assert limiter.acquire()
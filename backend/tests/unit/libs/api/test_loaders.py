@@ -0,0 +1,94 @@
+from collections.abc import Sequence
+
+import anyio
+import pytest
+
+from backend.libs.api.loaders import create_cached_loader, create_loader
+
+
+@pytest.mark.anyio()
+async def test_loader_batches_keys_into_single_read() -> None:
+    batches: list[Sequence[int]] = []
+
+    async def read_values(keys: Sequence[int]) -> list[str]:
+        batches.append(keys)
+        return [str(key) for key in keys]
+
+    loader = create_loader(read_values, key_getter=int)
+    results: dict[int, str | None] = {}
+
+    async def load(key: int) -> None:
+        results[key] = await loader.load(key)
+
+    async with anyio.create_task_group() as tg:
+        for key in (1, 2, 3):
+            tg.start_soon(load, key)
+
+    assert results == {1: "1", 2: "2", 3: "3"}
+    assert batches == [[1, 2, 3]]
+
+
+@pytest.mark.anyio()
+async def test_loader_returns_values_in_order_of_keys() -> None:
+    async def read_values(_: Sequence[int]) -> list[str]:
+        return ["3", "1"]
+
+    loader = create_loader(read_values, key_getter=int)
+
+    values = await loader.load_many([1, 2, 3])
+
+    assert values == ["1", None, "3"]
+
+
+@pytest.mark.anyio()
+async def test_loader_caches_loaded_values() -> None:
+    batches: list[Sequence[int]] = []
+
+    async def read_values(keys: Sequence[int]) -> list[str]:
+        batches.append(keys)
+        return [str(key) for key in keys]
+
+    loader = create_loader(read_values, key_getter=int)
+
+    await loader.load(1)
+    await loader.load(1)
+
+    assert batches == [[1]]
+
+
+@pytest.mark.anyio()
+async def test_cached_loader_reads_every_key_once() -> None:
+    keys: list[int] = []
+
+    async def read_value(key: int) -> str:
+        keys.append(key)
+        return str(key)
+
+    loader = create_cached_loader(read_value)
+
+    first_values = await loader.load_many([1, 2])
+    second_values = await loader.load_many([1, 2])
+
+    assert first_values == second_values == ["1", "2"]
+    assert keys == [1, 2]
+
+
+class _ReadError(Exception):
+    pass
+
+
+@pytest.mark.anyio()
+async def test_cached_loader_raises_cached_exception() -> None:
+    calls = 0
+
+    async def read_value(_: int) -> str:
+        nonlocal calls
+        calls += 1
+        raise _ReadError
+
+    loader = create_cached_loader(read_value)
+
+    for _ in range(2):
+        with pytest.raises(_ReadError):
+            await loader.load(1)
+    assert calls == 1
@@ -0,0 +1,122 @@
+import hashlib
+
+import pytest
+
+from backend.libs.api.persisted_queries import (
+    InvalidPersistedQueryError,
+    PersistedQueryNotAllowedError,
+    PersistedQueryNotFoundError,
+    PersistedQueryStore,
+    hash_query,
+    resolve_persisted_query,
+)
+
+_QUERY = "query { me { fullName } }"
+_QUERY_HASH = hashlib.sha256(_QUERY.encode()).hexdigest()
+
+
+def create_extensions(query_hash: str = _QUERY_HASH) -> dict[str, dict[str, object]]:
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+def test_hash_query_returns_sha256_hex_digest() -> None:
+    assert hash_query(_QUERY) == _QUERY_HASH
+
+
+@pytest.mark.anyio()
+async def test_store_evicts_least_recently_used_queries() -> None:
+    store = PersistedQueryStore(cache_size=2)
+    await store.add("first", "first query")
+    await store.add("second", "second query")
+    await store.get("first")
+
+    await store.add("third", "third query")
+
+    assert await store.get("first") == "first query"
+    assert await store.get("second") is None
+    assert await store.get("third") == "third query"
+
+
+@pytest.mark.anyio()
+async def test_resolve_persisted_query_returns_query_without_extension() -> None:
+    store = PersistedQueryStore()
+
+    query = await resolve_persisted_query(_QUERY, None, store)
+
+    assert query == _QUERY
+
+
+@pytest.mark.anyio()
+async def test_resolve_persisted_query_registers_query() -> None:
+    store = PersistedQueryStore()
+
+    query = await resolve_persisted_query(_QUERY, create_extensions(), store)
+
+    assert query == _QUERY
+    assert await store.get(_QUERY_HASH) == _QUERY
+
+
+@pytest.mark.anyio()
+async def test_resolve_persisted_query_returns_stored_query() -> None:
+    store = PersistedQueryStore()
+    await store.add(_QUERY_HASH, _QUERY)
+
+    query = await resolve_persisted_query(None, create_extensions(), store)
+
+    assert query == _QUERY
+
+
+@pytest.mark.anyio()
+async def test_resolve_persisted_query_raises_exception_if_query_is_not_found() -> (
+    None
+):
+    store = PersistedQueryStore()
+
+    with pytest.raises(PersistedQueryNotFoundError):
+        await resolve_persisted_query(None, create_extensions(), store)
+
+
+@pytest.mark.anyio()
+async def test_resolve_persisted_query_raises_exception_if_hash_does_not_match() -> (
+    None
+):
+    store = PersistedQueryStore()
+
+    with pytest.raises(InvalidPersistedQueryError):
+        await resolve_persisted_query(_QUERY, create_extensions("invalid"), store)
+
+
+@pytest.mark.anyio()
+async def test_resolve_persisted_query_raises_exception_if_version_is_unsupported() -> (
+    None
+):
+    store = PersistedQueryStore()
+    extensions = {"persistedQuery": {"version": 2, "sha256Hash": _QUERY_HASH}}
+
+    with pytest.raises(InvalidPersistedQueryError):
+        await resolve_persisted_query(_QUERY, extensions, store)
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize(
+    ("query", "extensions"),
+    [(_QUERY, None), (_QUERY, create_extensions()), (None, create_extensions())],
+)
+async def test_resolve_persisted_query_allows_only_registered_queries(
+    query: str | None, extensions: dict[str, dict[str, object]] | None
+) -> None:
+    store = PersistedQueryStore()
+
+    with pytest.raises(PersistedQueryNotAllowedError):
+        await resolve_persisted_query(query, extensions, store, allow_list_only=True)
+    assert await store.get(_QUERY_HASH) is None
+
+
+@pytest.mark.anyio()
+async def test_resolve_persisted_query_returns_allowed_query() -> None:
+    store = PersistedQueryStore()
+    await store.add(_QUERY_HASH, _QUERY)
+
+    query = await resolve_persisted_query(_QUERY, None, store, allow_list_only=True)
+
+    assert query == _QUERY
@@ -0,0 +1,86 @@
+from typing import Annotated, Any
+
+import strawberry
+from strawberry.types import Info
+
+from backend.libs.api.selection import get_selected_field_names
+
+
+@strawberry.interface
+class Node:
+    id: str
+
+
+@strawberry.type
+class Item(Node):
+    name: str
+    price: int
+
+
+@strawberry.type
+class Failure:
+    message: str
+
+
+ItemResponse = Annotated[Item | Failure, strawberry.union("ItemResponse")]
+
+
+def _execute(query: str) -> set[str]:
+    selected_field_names: set[str] = set()
+
+    def resolve_item(info: Info[Any, Any]) -> ItemResponse:
+        selected_field_names.update(get_selected_field_names(info, "Item"))
+        return Item(id="1", name="Item", price=1)
+
+    @strawberry.type
+    class Query:
+        item: ItemResponse = strawberry.field(resolver=resolve_item)
+
+    result = strawberry.Schema(query=Query, types=[Item]).execute_sync(query)
+    assert result.errors is None
+    return selected_field_names
+
+
+def test_get_selected_field_names_includes_fragments_on_type() -> None:
+    query = """
+      query {
+        item {
+          ... on Item { name }
+          ... on Failure { message }
+        }
+      }
+    """
+
+    assert _execute(query) == {"name"}
+
+
+def test_get_selected_field_names_includes_fragments_without_type_condition() -> None:
+    query = """
+      query {
+        item {
+          __typename
+          ... @include(if: true) {
+            ... on Item { price }
+          }
+        }
+      }
+    """
+
+    assert _execute(query) == {"__typename", "price"}
+
+
+def test_get_selected_field_names_includes_fragments_on_interfaces() -> None:
+    query = """
+      query {
+        item {
+          ...NodeId
+          ... on ItemResponse {
+            ... on Item { name }
+          }
+        }
+      }
+
+      fragment NodeId on Node { id }
+    """
+
+    assert _execute(query) == {"id", "name"}
@@ -0,0 +1,27 @@
+from backend.libs.api.tracing import Histogram, Histograms
+
+
+def test_histogram_counts_values_in_cumulative_buckets() -> None:
+    histogram = Histogram(buckets=(1, 5))
+
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value)
+
+    assert histogram.snapshot() == {
+        "buckets": {"1": 2, "5": 3, "+Inf": 4},
+        "count": 4,
+        "sum": 14.5,
+    }
+
+
+def test_histograms_create_histogram_for_every_name() -> None:
+    histograms = Histograms(buckets=(1,))
+
+    histograms.observe("second", 2)
+    histograms.observe("first", 1)
+    histograms.observe("first", 1)
+
+    assert histograms.snapshot() == {
+        "first": {"buckets": {"1": 2, "+Inf": 2}, "count": 2, "sum": 2},
+        "second": {"buckets": {"1": 0, "+Inf": 1}, "count": 1, "sum": 2},
+    }
@@ -0,0 +1,26 @@
+import time
+
+from backend.libs.db.identifiers import uuid7
+
+
+def test_uuid7_generates_version_7_uuid() -> None:
+    uuid = uuid7()
+
+    assert uuid.version == 7
+    assert uuid.variant == "specified in RFC 4122"
+
+
+def test_uuid7_embeds_current_timestamp() -> None:
+    before = time.time_ns() // 1_000_000
+
+    uuid = uuid7()
+
+    after = time.time_ns() // 1_000_000
+    assert before <= uuid.int >> 80 <= after
+
+
+def test_uuid7_generates_monotonic_uuids() -> None:
+    uuids = [uuid7() for _ in range(10_000)]
+
+    assert uuids == sorted(uuids)
+    assert len(set(uuids)) == len(uuids)
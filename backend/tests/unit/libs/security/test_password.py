@@ -2,6 +2,7 @@ import pytest
 
 from backend.libs.security.password import (
     async_hash_password,
+    async_hash_passwords,
     async_verify_and_update_password,
     hash_password,
     verify_and_update_password,
@@ -28,3 +29,17 @@ async def test_async_hashed_password_is_properly_verified() -> None:
     )
 
     assert verfied_password
+
+
+@pytest.mark.anyio()
+async def test_async_hashed_passwords_are_properly_verified() -> None:
+    plain_passwords = ["first_password", "second_password"]
+
+    hashed_passwords = await async_hash_passwords(plain_passwords, run_without_executor)
+
+    assert [
+        verify_and_update_password(plain_password, hashed_password)[0]
+        for plain_password, hashed_password in zip(
+            plain_passwords, hashed_passwords, strict=True
+        )
+    ] == [True, True]
@@ -1,5 +1,6 @@
 from collections.abc import Mapping
 from contextlib import suppress
+from datetime import datetime
 from typing import Any
 from uuid import UUID
 
@@ -17,18 +18,29 @@ from backend.services.user.exceptions import (
 from backend.services.user.operations.auth import (
     AuthTokensManager,
     PasswordManager,
+    get_confirmed_user_columns_from_headers,
     get_confirmed_user_from_headers,
     login,
     refresh_token,
 )
 from backend.services.user.schemas import CredentialsSchema
-from tests.unit.helpers.user import UserCRUD, create_confirmed_user, create_user
+from tests.unit.helpers.user import (
+    UserColumnsReader,
+    UserCRUD,
+    create_confirmed_user,
+    create_user,
+    create_user_record,
+)
 
 
 async def create_test_token(_: Mapping[str, Any]) -> str:
     return "test-token"
 
 
+def record_login(*_: Any) -> None:
+    pass
+
+
 @pytest.fixture(name="password_manager")
 def password_manager_fixture() -> PasswordManager:
     async def validate_password(*_: str) -> tuple[bool, None]:
@@ -65,7 +77,7 @@ async def test_login_creates_tokens(password_manager: PasswordManager) -> None:
     )
 
     access_token, refresh_token_ = await login(
-        credentials, password_manager, tokens_manager, crud
+        credentials, password_manager, tokens_manager, crud, record_login
     )
 
     assert access_token == "sub:6d9c79d6-9641-4746-92d9-2cc9ebdca941-type:access"
@@ -87,7 +99,7 @@ async def test_login_updates_password_hash_if_needed(
     )
     crud = UserCRUD(existing_user=user)
 
-    await login(credentials, password_manager, tokens_manager, crud)
+    await login(credentials, password_manager, tokens_manager, crud, record_login)
 
     assert user.hashed_password == "new_hashed_password"
 
@@ -107,22 +119,28 @@ async def test_login_does_not_update_password_hash_if_not_needed(
     )
     crud = UserCRUD(existing_user=user)
 
-    await login(credentials, password_manager, tokens_manager, crud)
+    await login(credentials, password_manager, tokens_manager, crud, record_login)
 
     assert user.hashed_password == "hashed_password"
 
 
 @pytest.mark.anyio()
-async def test_login_updates_user_last_login(
+async def test_login_records_user_last_login(
     password_manager: PasswordManager, tokens_manager: AuthTokensManager
 ) -> None:
     credentials = CredentialsSchema(email="test@email.com", password="plain_password")
-    user = create_confirmed_user(email="test@email.com", last_login=None)
+    user = create_confirmed_user(
+        id=UUID("6d9c79d6-9641-4746-92d9-2cc9ebdca941"), email="test@email.com"
+    )
     crud = UserCRUD(existing_user=user)
+    logins = {}
+
+    def record_user_login(user_id: UUID, last_login: datetime) -> None:
+        logins[user_id] = last_login
 
-    await login(credentials, password_manager, tokens_manager, crud)
+    await login(credentials, password_manager, tokens_manager, crud, record_user_login)
 
-    assert user.last_login
+    assert UUID("6d9c79d6-9641-4746-92d9-2cc9ebdca941") in logins
 
 
 @pytest.mark.anyio()
@@ -133,7 +151,7 @@ async def test_login_raises_exception_if_user_is_not_found(
     crud = UserCRUD()
 
     with pytest.raises(UserNotFoundError):
-        await login(credentials, password_manager, tokens_manager, crud)
+        await login(credentials, password_manager, tokens_manager, crud, record_login)
 
 
 @pytest.mark.anyio()
@@ -152,7 +170,7 @@ async def test_login_calls_password_hasher_if_user_is_not_found(
     crud = UserCRUD()
 
     with suppress(UserNotFoundError):
-        await login(credentials, password_manager, tokens_manager, crud)
+        await login(credentials, password_manager, tokens_manager, crud, record_login)
 
     assert hasher_called
 
@@ -172,7 +190,7 @@ async def test_login_does_not_call_password_hasher_if_user_is_found(
     password_manager.hasher = hash_password
     crud = UserCRUD(existing_user=create_confirmed_user(email="test@email.com"))
 
-    await login(credentials, password_manager, tokens_manager, crud)
+    await login(credentials, password_manager, tokens_manager, crud, record_login)
 
     assert not hasher_called
 
@@ -190,7 +208,7 @@ async def test_login_raises_exception_if_password_is_invalid(
     crud = UserCRUD(existing_user=create_confirmed_user(email="test@email.com"))
 
     with pytest.raises(InvalidPasswordError):
-        await login(credentials, password_manager, tokens_manager, crud)
+        await login(credentials, password_manager, tokens_manager, crud, record_login)
 
 
 @pytest.mark.anyio()
@@ -201,7 +219,7 @@ async def test_login_raises_exception_if_user_email_is_not_confirmed(
     crud = UserCRUD(existing_user=create_user(email="test@email.com"))
 
     with pytest.raises(UserEmailNotConfirmedError):
-        await login(credentials, password_manager, tokens_manager, crud)
+        await login(credentials, password_manager, tokens_manager, crud, record_login)
 
 
 @pytest.mark.anyio()
@@ -304,6 +322,73 @@ async def test_get_confirmed_user_from_headers_raises_exception_if_user_email_is
         await get_confirmed_user_from_headers(headers, read_token, crud)
 
 
+@pytest.mark.anyio()
+async def test_get_confirmed_user_columns_from_headers_retrieves_user_columns() -> None:
+    headers = {"Authorization": "Bearer test-token"}
+
+    async def read_token(_: str) -> dict[str, str]:
+        return {
+            "sub": "6d9c79d6-9641-4746-92d9-2cc9ebdca941",
+            "type": "access",
+        }
+
+    columns_reader = UserColumnsReader(
+        existing_record=create_user_record(
+            id=UUID("6d9c79d6-9641-4746-92d9-2cc9ebdca941"), email="test@email.com"
+        )
+    )
+
+    user_columns = await get_confirmed_user_columns_from_headers(
+        headers, read_token, columns_reader, ["email"]
+    )
+
+    assert user_columns == {
+        "id": UUID("6d9c79d6-9641-4746-92d9-2cc9ebdca941"),
+        "email": "test@email.com",
+        "confirmed_email": True,
+    }
+
+
+@pytest.mark.anyio()
+async def test_get_confirmed_user_columns_from_headers_raises_exception_if_user_is_not_found() -> None:
+    headers = {"Authorization": "Bearer test-token"}
+
+    async def read_token(_: str) -> dict[str, str]:
+        return {
+            "sub": "6d9c79d6-9641-4746-92d9-2cc9ebdca941",
+            "type": "access",
+        }
+
+    columns_reader = UserColumnsReader()
+
+    with pytest.raises(UserNotFoundError):
+        await get_confirmed_user_columns_from_headers(
+            headers, read_token, columns_reader, []
+        )
+
+
+@pytest.mark.anyio()
+async def test_get_confirmed_user_columns_from_headers_raises_exception_if_user_email_is_no_confirmed() -> None:
+    headers = {"Authorization": "Bearer test-token"}
+
+    async def read_token(_: str) -> dict[str, str]:
+        return {
+            "sub": "6d9c79d6-9641-4746-92d9-2cc9ebdca941",
+            "type": "access",
+        }
+
+    columns_reader = UserColumnsReader(
+        existing_record=create_user_record(
+            id=UUID("6d9c79d6-9641-4746-92d9-2cc9ebdca941"), confirmed_email=False
+        )
+    )
+
+    with pytest.raises(UserEmailNotConfirmedError):
+        await get_confirmed_user_columns_from_headers(
+            headers, read_token, columns_reader, []
+        )
+
+
 @pytest.mark.anyio()
 async def test_refresh_token_creates_access_token() -> None:
     token = "test-token"
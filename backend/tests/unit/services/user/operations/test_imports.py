@@ -0,0 +1,97 @@
+from collections.abc import Sequence
+
+import pytest
+
+from backend.services.user.crud import UserCreateData, UserRecord
+from backend.services.user.operations.imports import import_users
+from tests.unit.helpers.user import create_user_record
+
+
+async def hash_test_passwords(passwords: Sequence[str]) -> list[str]:
+    return [f"hashed_{password}" for password in passwords]
+
+
+class UsersInserterStub:
+    def __init__(self, registered_emails: Sequence[str] = ()):
+        self.registered_emails = set(registered_emails)
+        self.batches: list[list[UserCreateData]] = []
+
+    async def __call__(self, data: Sequence[UserCreateData]) -> list[UserRecord]:
+        self.batches.append(list(data))
+        created = [item for item in data if item.email not in self.registered_emails]
+        self.registered_emails.update(item.email for item in created)
+        return [
+            create_user_record(email=item.email, full_name=item.full_name)
+            for item in created
+        ]
+
+
+def create_row(email: str) -> dict[str, str]:
+    return {"email": email, "password": "plain_password", "full_name": "Test User"}
+
+
+@pytest.mark.anyio()
+async def test_import_users_inserts_users_in_batches() -> None:
+    rows = [create_row(f"user{number}@email.com") for number in range(3)]
+    inserter = UsersInserterStub()
+
+    report = await import_users(rows, hash_test_passwords, inserter, 2)
+
+    assert report.created == 3
+    assert [[item.email for item in batch] for batch in inserter.batches] == [
+        ["user0@email.com", "user1@email.com"],
+        ["user2@email.com"],
+    ]
+    assert inserter.batches[0][0] == UserCreateData(
+        email="user0@email.com",
+        hashed_password="hashed_plain_password",
+        full_name="Test User",
+    )
+
+
+@pytest.mark.anyio()
+async def test_import_users_skips_duplicated_users() -> None:
+    rows = [
+        create_row("registered@email.com"),
+        create_row("new@email.com"),
+        create_row("NEW@email.com"),
+    ]
+    inserter = UsersInserterStub(registered_emails=["registered@email.com"])
+
+    report = await import_users(rows, hash_test_passwords, inserter, 10)
+
+    assert report.created == 1
+    assert report.skipped == 2
+    assert [item.email for item in inserter.batches[0]] == [
+        "registered@email.com",
+        "new@email.com",
+    ]
+
+
+@pytest.mark.anyio()
+async def test_import_users_reports_invalid_rows() -> None:
+    rows: list[dict[str, str]] = [
+        create_row("valid@email.com"),
+        create_row("invalid"),
+        {},
+    ]
+    inserter = UsersInserterStub()
+
+    report = await import_users(rows, hash_test_passwords, inserter, 10)
+
+    assert report.created == 1
+    assert report.invalid.keys() == {2, 3}
+
+
+@pytest.mark.anyio()
+async def test_import_users_calls_success_callback_with_created_users() -> None:
+    rows = [create_row("registered@email.com"), create_row("new@email.com")]
+    inserter = UsersInserterStub(registered_emails=["registered@email.com"])
+    created_emails: list[str] = []
+
+    def callback(users: Sequence[UserRecord]) -> None:
+        created_emails.extend(user.email for user in users)
+
+    await import_users(rows, hash_test_passwords, inserter, 10, callback)
+
+    assert created_emails == ["new@email.com"]
@@ -1,12 +1,22 @@
+from collections.abc import Collection
 from contextlib import suppress
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID, uuid4
 
 import pytest
 
+from backend.services.user.crud import UserKey, UserUpdateData
 from backend.services.user.exceptions import (
     UserAlreadyExistsError,
 )
 from backend.services.user.models import User
-from backend.services.user.operations.user import create_user, delete_user, update_user
+from backend.services.user.operations.user import (
+    create_user,
+    delete_user,
+    purge_unconfirmed_users,
+    update_user,
+)
 from backend.services.user.schemas import UserCreateSchema, UserUpdateSchema
 from tests.unit.helpers.user import UserCRUD
 from tests.unit.helpers.user import create_user as create_user_helper
@@ -80,25 +90,62 @@ async def test_create_user_does_not_call_success_callback_if_user_already_exists
 
 
 @pytest.mark.anyio()
-async def test_update_user_updates_user() -> None:
-    user = create_user_helper(full_name="Test User")
+async def test_update_user_updates_user_and_returns_columns() -> None:
+    user_id = UUID("6d9c79d6-9641-4746-92d9-2cc9ebdca941")
     data = UserUpdateSchema(full_name="Updated User")
-    crud = UserCRUD()
+    updates: list[tuple[UUID, UserUpdateData, Collection[str]]] = []
+
+    async def update_columns(
+        user_id: UUID, data: UserUpdateData, columns: Collection[str]
+    ) -> dict[str, Any]:
+        updates.append((user_id, data, columns))
+        return {"id": user_id, "full_name": data.full_name}
 
-    await update_user(user, data, crud)
+    user_columns = await update_user(user_id, data, update_columns, ["full_name"])
 
-    assert user.full_name == "Updated User"
+    assert user_columns == {"id": user_id, "full_name": "Updated User"}
+    assert updates == [
+        (user_id, UserUpdateData(full_name="Updated User"), ["full_name"])
+    ]
 
 
 @pytest.mark.anyio()
 async def test_update_user_does_not_update_unset_fields() -> None:
-    user = create_user_helper(full_name="Test User")
+    user_id = UUID("6d9c79d6-9641-4746-92d9-2cc9ebdca941")
     data = UserUpdateSchema()
-    crud = UserCRUD()
+    updates: list[UserUpdateData] = []
 
-    await update_user(user, data, crud)
+    async def update_columns(
+        user_id: UUID, data: UserUpdateData, _: Collection[str]
+    ) -> dict[str, Any]:
+        updates.append(data)
+        return {"id": user_id}
 
-    assert user.full_name == "Test User"
+    await update_user(user_id, data, update_columns, [])
+
+    assert updates == [UserUpdateData()]
+
+
+@pytest.mark.anyio()
+@pytest.mark.parametrize(
+    ("data", "called"),
+    [(UserUpdateSchema(full_name="Updated User"), True), (UserUpdateSchema(), False)],
+)
+async def test_update_user_calls_success_callback_only_if_user_is_changed(
+    data: UserUpdateSchema, called: bool
+) -> None:
+    user_id = UUID("6d9c79d6-9641-4746-92d9-2cc9ebdca941")
+    updated_users: list[dict[str, Any]] = []
+
+    async def update_columns(user_id: UUID, *_: Any) -> dict[str, Any]:
+        return {"id": user_id}
+
+    async def success_callback(user_columns: dict[str, Any]) -> None:
+        updated_users.append(user_columns)
+
+    await update_user(user_id, data, update_columns, [], success_callback)
+
+    assert bool(updated_users) == called
 
 
 @pytest.mark.anyio()
@@ -107,3 +154,22 @@ async def test_delete_user_deletes_user() -> None:
     crud = UserCRUD()
 
     await delete_user(user, crud)
+
+
+@pytest.mark.anyio()
+async def test_purge_unconfirmed_users_deletes_users_in_batches() -> None:
+    created_before = datetime(2024, 1, 10, tzinfo=UTC)
+    keys = [UserKey(datetime(2024, 1, day, tzinfo=UTC), uuid4()) for day in (1, 2, 3)]
+    calls = []
+
+    async def delete_users(
+        created_before: datetime, limit: int, after: UserKey | None
+    ) -> list[UserKey]:
+        calls.append((created_before, limit, after))
+        start = keys.index(after) + 1 if after else 0
+        return keys[start : start + limit]
+
+    deleted = await purge_unconfirmed_users(created_before, delete_users, 2)
+
+    assert deleted == 3
+    assert calls == [(created_before, 2, None), (created_before, 2, keys[1])]
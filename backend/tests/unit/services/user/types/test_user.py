@@ -0,0 +1,26 @@
+from typing import Any
+from uuid import uuid4
+
+import strawberry
+from strawberry.types import Info
+
+from backend.services.user.types.user import User, get_user_type_from_columns
+
+
+def test_get_user_type_from_columns_sets_only_selected_fields() -> None:
+    users: list[User] = []
+
+    def resolve_user(info: Info[Any, Any]) -> User:
+        columns = {"id": uuid4(), "email": "test@email.com", "full_name": "Test User"}
+        users.append(get_user_type_from_columns(info, columns))
+        return users[-1]
+
+    @strawberry.type
+    class Query:
+        user: User = strawberry.field(resolver=resolve_user)
+
+    result = strawberry.Schema(query=Query).execute_sync("query { user { fullName } }")
+
+    assert result.data == {"user": {"fullName": "Test User"}}
+    assert users[0].full_name == "Test User"
+    assert users[0].email is strawberry.UNSET
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from backend.api.graphql import extensions
+from backend.api.graphql.operations import KNOWN_OPERATIONS
+from backend.api.graphql.router import get_router
+from backend.warm_up import WarmUpStep, get_warm_up_steps, warm_up
+
+
+@pytest.mark.anyio()
+async def test_warm_up_runs_all_steps() -> None:
+    warmed_up = []
+
+    def create_step(name: str) -> WarmUpStep:
+        async def run() -> None:
+            warmed_up.append(name)
+
+        return WarmUpStep(name=name, run=run)
+
+    steps = [create_step("step_1"), create_step("step_2")]
+
+    await warm_up(steps, timeout=timedelta(seconds=1))
+
+    assert sorted(warmed_up) == ["step_1", "step_2"]
+
+
+@pytest.mark.anyio()
+async def test_warm_up_continues_if_step_failed(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    warmed_up = []
+
+    async def failed_step() -> None:
+        msg = "Failed"
+        raise Exception(msg)  # noqa: TRY002
+
+    async def success_step() -> None:
+        warmed_up.append("success")
+
+    steps = [
+        WarmUpStep(name="failed", run=failed_step),
+        WarmUpStep(name="success", run=success_step),
+    ]
+
+    await warm_up(steps, timeout=timedelta(seconds=1))
+
+    assert warmed_up == ["success"]
+    assert "Warm-up of 'failed' failed" in caplog.text
+
+
+@pytest.mark.anyio()
+async def test_warm_up_cancels_steps_exceeding_timeout(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    async def slow_step() -> None:
+        await asyncio.sleep(10)
+
+    steps = [WarmUpStep(name="slow", run=slow_step)]
+
+    await warm_up(steps, timeout=timedelta(milliseconds=10))
+
+    assert "Warm-up of 'slow' timed out" in caplog.text
+
+
+@pytest.mark.anyio()
+async def test_warm_up_waits_for_cancelled_steps() -> None:
+    cleaned_up = []
+
+    async def slow_step() -> None:
+        try:
+            await asyncio.sleep(10)
+        finally:
+            await asyncio.sleep(0)
+            cleaned_up.append("slow")
+
+    steps = [WarmUpStep(name="slow", run=slow_step)]
+
+    await warm_up(steps, timeout=timedelta(milliseconds=10))
+
+    assert cleaned_up == ["slow"]
+
+
+@pytest.mark.anyio()
+async def test_warm_up_caches_documents_of_known_operations(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    schema = get_router().schema
+    steps = get_warm_up_steps(Mock(), schema, db_connections=0)
+    await next(step for step in steps if step.name == "schema").run()
+    monkeypatch.setattr(extensions, "parse_document", Mock(side_effect=AssertionError))
+    monkeypatch.setattr(
+        extensions, "validate_document", Mock(side_effect=AssertionError)
+    )
+    login = next(operation for operation in KNOWN_OPERATIONS if "Login" in operation)
+
+    # Fails only once executed, as the input is missing
+    result = await schema.execute(login, context_value=Mock())
+
+    assert result.errors
+    assert result.errors[0].message == (
+        "Variable '$input' of required type 'LoginInput!' was not provided."
+    )